@@ -0,0 +1,47 @@
+from typing import Callable, List, Optional
+import aiohttp
+from aiohttp import TCPConnector
+
+# 세션 생성 시 venue 별 TraceConfig 를 붙이는 훅 목록
+# - 각 훅은 venue -> TraceConfig | None (None 이면 부착하지 않음)
+_TRACE_FACTORIES: List[Callable[[str], Optional[aiohttp.TraceConfig]]] = []
+
+def register_trace_factory(factory: Callable[[str], Optional[aiohttp.TraceConfig]]) -> None:
+    if factory not in _TRACE_FACTORIES:
+        _TRACE_FACTORIES.append(factory)
+
+def unregister_trace_factory(factory: Callable[[str], Optional[aiohttp.TraceConfig]]) -> None:
+    if factory in _TRACE_FACTORIES:
+        _TRACE_FACTORIES.remove(factory)
+
+def _trace_configs(venue: str) -> List[aiohttp.TraceConfig]:
+    from mpdex.utils import metrics, ratelimit
+    out = []
+    # 순서: 레이트리밋 대기 후 계측 시작(대기 시간은 ratelimit 계열로 따로 기록)
+    for tc in (ratelimit.trace_config(venue), metrics.http_trace_config(venue)):
+        if tc is not None:
+            out.append(tc)
+    for f in _TRACE_FACTORIES:
+        try:
+            tc = f(venue)
+        except Exception:
+            tc = None
+        if tc is not None:
+            out.append(tc)
+    return out
+
+def new_session(venue: str, *, force_close: bool = False, **kwargs) -> aiohttp.ClientSession:
+    """
+    래퍼 공용 aiohttp 세션 생성기.
+    - force_close=True: 매 요청 후 소켓 닫기 + 종료 중 SSL 소켓 정리 (기존 _session() 동작)
+    - 레이트리밋(ratelimit) / 계측(metrics) / 등록된 TraceConfig 를 venue 라벨로 부착
+    """
+    if force_close and "connector" not in kwargs:
+        kwargs["connector"] = TCPConnector(
+            force_close=True,             # 매 요청 후 소켓 닫기 → 종료 시 잔여 소켓 최소화
+            enable_cleanup_closed=True,   # 종료 중인 SSL 소켓 정리 보조 (로그 억제)
+        )
+    traces = _trace_configs(venue)
+    if traces:
+        kwargs["trace_configs"] = list(kwargs.get("trace_configs") or []) + traces
+    return aiohttp.ClientSession(**kwargs)
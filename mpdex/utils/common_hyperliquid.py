@@ -1,5 +1,15 @@
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
 from decimal import Decimal, ROUND_HALF_UP, ROUND_UP, ROUND_DOWN
+import asyncio
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl  # POSIX 전용(프로세스 간 nonce 조정)
+except ImportError:  # Windows
+    fcntl = None
 
 def _strip_decimal_trailing_zeros(s: str) -> str:
     """
@@ -56,4 +66,163 @@ def format_size(amount: float, sz_dec: int) -> str:
         sz_d = Decimal(int(round(amount)))
     size_str = format(sz_d, "f")
     # [중요 수정] size도 정수부 0가 잘리지 않도록 소수부가 있을 때만 제거
-    return _strip_decimal_trailing_zeros(size_str)
\ No newline at end of file
+    return _strip_decimal_trailing_zeros(size_str)
+
+# [ADDED] HL 서명 nonce 발급기 ------------------------------------------------
+class NonceAllocator:
+    """
+    서명 주소(agent/EOA) 단위로 공유하는 단조 증가 nonce 발급기.
+    - next() = max(now_ms, last + 1): 같은 ms 에 동시 서명해도 충돌 없음(task/thread 안전)
+    - HL 허용 범위(T-2d, T+1d) 안에 머물도록 시계보다 max_ahead_ms 이상 앞서면 발급 보류
+      (sync next() 는 락 밖에서 잠깐 time.sleep, async anext() 는 asyncio.sleep 으로 대기)
+    - lock_path 지정 시 fcntl 파일락 + 파일에 마지막 nonce 기록 → 같은 키를 쓰는 프로세스 간 조정
+      (파일은 발급기당 1번 열어 두고 재사용)
+    """
+
+    def __init__(self, lock_path: Optional[str] = None, max_ahead_ms: int = 5_000):
+        self._lock = threading.Lock()
+        self._last = 0
+        self.lock_path = lock_path if (lock_path and fcntl is not None) else None
+        self.max_ahead_ms = int(max_ahead_ms)
+        self._fh = None
+        self._fh_path: Optional[str] = None
+
+    def _advance(self, last: int) -> Tuple[Optional[int], float]:
+        """(nonce, 0) 또는 시계보다 너무 앞서면 (None, 기다릴 초)"""
+        now = int(time.time() * 1000)
+        nonce = max(now, last + 1)
+        ahead = nonce - now
+        if ahead > self.max_ahead_ms:
+            return None, (ahead - self.max_ahead_ms) / 1000.0
+        return nonce, 0.0
+
+    def _lock_file(self):
+        # lock_path 가 나중에 지정/변경될 수 있으므로 경로가 바뀌었을 때만 다시 연다
+        if self._fh is None or self._fh_path != self.lock_path:
+            self.close()
+            self._fh = open(self.lock_path, "a+")
+            self._fh_path = self.lock_path
+        return self._fh
+
+    def close(self) -> None:
+        fh, self._fh, self._fh_path = self._fh, None, None
+        if fh is not None:
+            try:
+                fh.close()
+            except Exception:
+                pass
+
+    def try_next(self) -> Tuple[Optional[int], float]:
+        """락 안에서 1회 발급 시도. 반환: (nonce, 0) | (None, 기다릴 초)"""
+        with self._lock:
+            if self.lock_path is None:
+                nonce, wait = self._advance(self._last)
+                if nonce is not None:
+                    self._last = nonce
+                return nonce, wait
+            f = self._lock_file()
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    shared = int(f.read().strip() or 0)
+                except ValueError:
+                    shared = 0
+                nonce, wait = self._advance(max(self._last, shared))
+                if nonce is not None:
+                    self._last = nonce
+                    f.seek(0)
+                    f.truncate()
+                    f.write(str(self._last))
+                    f.flush()
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            return nonce, wait
+
+    def next(self) -> int:
+        # sync 경로: 너무 앞서면 락 밖에서 잠깐 대기(초고속 연속 서명 시에만, 최대 수 ms)
+        while True:
+            nonce, wait = self.try_next()
+            if nonce is not None:
+                return nonce
+            time.sleep(wait)
+
+    async def anext(self) -> int:
+        # async 경로: 루프를 막지 않고 시계가 따라올 때까지 대기
+        while True:
+            nonce, wait = self.try_next()
+            if nonce is not None:
+                return nonce
+            await asyncio.sleep(wait)
+
+_NONCE_ALLOCATORS: dict = {}
+_NONCE_ALLOCATORS_LOCK = threading.Lock()
+
+def get_nonce_allocator(signer_address: str, lock_dir: Optional[str] = None) -> NonceAllocator:
+    """
+    같은 서명 주소는 같은 발급기를 공유(인스턴스가 여러 개여도 충돌 없음).
+    lock_dir 지정 시 {lock_dir}/hl_nonce_{address}.lock 으로 프로세스 간 조정.
+    """
+    key = str(signer_address or "").lower()
+    with _NONCE_ALLOCATORS_LOCK:
+        alloc = _NONCE_ALLOCATORS.get(key)
+        if alloc is None:
+            lock_path = None
+            if lock_dir:
+                os.makedirs(lock_dir, exist_ok=True)
+                lock_path = os.path.join(lock_dir, f"hl_nonce_{key}.lock")
+            alloc = _NONCE_ALLOCATORS[key] = NonceAllocator(lock_path=lock_path)
+        elif lock_dir and alloc.lock_path is None and fcntl is not None:
+            os.makedirs(lock_dir, exist_ok=True)
+            alloc.lock_path = os.path.join(lock_dir, f"hl_nonce_{key}.lock")
+        return alloc
+
+# [ADDED] /info single-flight ---------------------------------------------------
+class SingleFlight:
+    """
+    같은 key 의 요청이 진행 중이면 새로 보내지 않고 그 결과(또는 예외)를 공유.
+    ttl > 0 이면 완료된 결과를 ttl 초 동안 재사용(micro-cache).
+    결과 객체는 호출자 간에 공유되므로 수정하지 말 것.
+    """
+
+    def __init__(self, max_cache: int = 1024):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        self.max_cache = int(max_cache)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]], ttl: float = 0.0) -> Any:
+        if ttl > 0:
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] > time.monotonic():
+                return hit[1]
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(factory())
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda f, k=key, t=ttl: self._done(k, f, t))
+        # 한 호출자가 취소돼도 공유 요청은 계속 진행
+        return await asyncio.shield(fut)
+
+    def _done(self, key: Hashable, fut: asyncio.Future, ttl: float) -> None:
+        if self._inflight.get(key) is fut:
+            self._inflight.pop(key, None)
+        if ttl > 0 and not fut.cancelled() and fut.exception() is None:
+            if len(self._cache) >= self.max_cache:
+                now = time.monotonic()
+                for k in [k for k, (exp, _) in self._cache.items() if exp <= now]:
+                    self._cache.pop(k, None)
+                if len(self._cache) >= self.max_cache:
+                    self._cache.clear()
+            self._cache[key] = (time.monotonic() + ttl, fut.result())
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+# HL/Superstack 인스턴스가 공유(같은 http_base + 같은 payload 면 인스턴스가 달라도 합쳐짐)
+INFO_FLIGHT = SingleFlight()
+
+def info_key(http_base: str, payload: dict) -> str:
+    return http_base + "|" + json.dumps(payload, sort_keys=True, separators=(",", ":"))
@@ -0,0 +1,62 @@
+import asyncio
+import inspect
+from typing import Any, Callable, List, Optional, Tuple
+
+# SignerClient 버전별 상수 차이 대비 기본값
+TX_TYPE_CREATE_ORDER = 14
+TX_TYPE_CANCEL_ORDER = 15
+CODE_OK = 200
+
+class LighterNonceManager:
+    """
+    (account_index, api_key_index) 단위 낙관적 nonce 관리자.
+    - 최초 1회 /nextNonce 로 동기화한 뒤 로컬에서 증가(take(n) 은 연속된 n 개를 한 번에 예약)
+    - 전송 실패(또는 nonce 오류) 시 resync() 로 서버 값에 다시 맞춤
+    """
+
+    def __init__(self, fetch_next: Callable[[], Any]):
+        self._fetch_next = fetch_next  # async () -> int (서버가 기대하는 다음 nonce)
+        self._next: Optional[int] = None
+        self._lock = asyncio.Lock()
+
+    async def take(self, n: int = 1) -> List[int]:
+        async with self._lock:
+            if self._next is None:
+                self._next = int(await self._fetch_next())
+            start = self._next
+            self._next += n
+            return list(range(start, start + n))
+
+    async def resync(self) -> None:
+        async with self._lock:
+            try:
+                self._next = int(await self._fetch_next())
+            except Exception:
+                self._next = None  # 다음 take 에서 재조회
+
+def call_signer(fn: Callable, *args, **kwargs) -> Tuple[Optional[int], Optional[str], Optional[str]]:
+    """
+    SignerClient.sign_* 호출 + 버전별 반환 형태 정규화.
+    - 신규: (tx_type, tx_info, tx_hash, error)
+    - 구버전: (tx_info, error)
+    지원하지 않는 키워드(nonce/api_key_index 등)가 있으면 TypeError(조용히 빼고 서명하면 nonce 가 어긋남).
+    반환: (tx_type|None, tx_info, error)
+    """
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        params = None
+    if params is not None and not any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params.values()):
+        unsupported = [k for k in kwargs if k not in params]
+        if unsupported:
+            raise TypeError(
+                f"{getattr(fn, '__qualname__', fn)} does not accept {unsupported} (lighter SDK too old?)"
+            )
+    res = fn(*args, **kwargs)
+    if isinstance(res, tuple) and len(res) == 4:
+        tx_type, tx_info, _tx_hash, err = res
+        return tx_type, tx_info, err
+    if isinstance(res, tuple) and len(res) == 2:
+        tx_info, err = res
+        return None, tx_info, err
+    return None, res, None
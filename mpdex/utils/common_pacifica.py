@@ -3,7 +3,7 @@ import base58
 import subprocess
 
 def sign_message(header, payload, keypair):
-    message = prepare_message(header, payload)
+    message = prepare_message_fast(header, payload)
     message_bytes = message.encode("utf-8")
     signature = keypair.sign_message(message_bytes)
     return (message, base58.b58encode(bytes(signature)).decode("ascii"))
@@ -68,4 +68,71 @@ def sort_json_keys(value):
     elif isinstance(value, list):
         return [sort_json_keys(item) for item in value]
     else:
-        return value
\ No newline at end of file
+        return value
+
+
+# [ADDED] 요청 타입별 고정 payload 형태에 대한 사전 컴파일된 직렬화기
+# - prepare_message 와 byte 단위로 동일한 compact JSON 을 생성
+# - header 는 {data, expiry_window, timestamp, type} 순서(정렬 결과)로 고정
+# - payload 키 집합이 등록된 형태와 다르면 None 을 반환하여 일반 경로로 fallback
+_encode_generic = json.JSONEncoder(separators=(",", ":"), sort_keys=True).encode
+_encode_str = json.encoder.encode_basestring_ascii
+
+
+def _encode_value(v):
+    # 주문 payload 에 자주 나오는 scalar 는 JSONEncoder 를 거치지 않고 바로 변환
+    t = type(v)
+    if t is str:
+        return _encode_str(v)
+    if t is bool:
+        return "true" if v else "false"
+    if t is int:
+        return int.__repr__(v)
+    if t is float and v - v == 0.0:  # nan/inf 는 JSONEncoder 규칙을 따름
+        return float.__repr__(v)
+    return _encode_generic(v)
+
+_PAYLOAD_KEYS = {
+    "create_market_order": ("amount", "client_order_id", "reduce_only", "side", "slippage_percent", "symbol"),
+    "create_order": ("amount", "client_order_id", "price", "reduce_only", "side", "symbol", "tif"),
+    "cancel_order": ("order_id", "symbol"),
+}
+
+
+def _compile_serializer(req_type, keys):
+    keys = tuple(sorted(keys))
+    key_set = frozenset(keys)
+    # '{"data":{"k1":' , ',"k2":' , ... 의 리터럴 조각을 미리 만들어 둔다
+    prefixes = tuple(
+        ('{"data":{' if i == 0 else ",") + _encode_value(k) + ":"
+        for i, k in enumerate(keys)
+    )
+    type_suffix = ',"type":' + _encode_value(req_type) + "}"
+    pairs = tuple(zip(prefixes, keys))
+
+    def serialize(header, payload):
+        if len(payload) != len(keys) or payload.keys() != key_set:
+            return None
+        parts = [prefix + _encode_value(payload[k]) for prefix, k in pairs]
+        parts.append('},"expiry_window":')
+        parts.append(_encode_value(header["expiry_window"]))
+        parts.append(',"timestamp":')
+        parts.append(_encode_value(header["timestamp"]))
+        parts.append(type_suffix)
+        return "".join(parts)
+
+    return serialize
+
+
+_SERIALIZERS = {t: _compile_serializer(t, k) for t, k in _PAYLOAD_KEYS.items()}
+
+
+def prepare_message_fast(header, payload):
+    # header 에 추가 키가 있거나 미등록 타입이면 일반 경로 사용
+    if len(header) == 3 and isinstance(payload, dict):
+        ser = _SERIALIZERS.get(header.get("type"))
+        if ser is not None and "timestamp" in header and "expiry_window" in header:
+            message = ser(header, payload)
+            if message is not None:
+                return message
+    return prepare_message(header, payload)
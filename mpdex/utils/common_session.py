@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import random
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+class SessionKeeper:
+    """
+    로그인 세션(쿠키/JWT) 백그라운드 유지.
+    - check(): 남은 유효시간(sec) 반환. 유효하지만 만료시각을 모르면 float('inf'), 무효면 None 또는 0 이하
+    - renew(): 재로그인(캐시 파일 저장까지 포함). 실패 시 예외
+    - 만료 margin 전에 미리 renew, 다음 점검까지 대기 시간에 jitter 적용(여러 프로세스 동시 갱신 방지)
+    주문 경로는 세션 상태만 읽고 로그인 왕복을 하지 않도록 하는 용도.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        check: Callable[[], Awaitable[Optional[float]]],
+        renew: Callable[[], Awaitable[None]],
+        *,
+        interval: float = 600.0,
+        margin: float = 300.0,
+        jitter: float = 0.2,
+        retry_delay: float = 30.0,
+    ):
+        self.name = name
+        self._check = check
+        self._renew = renew
+        self.interval = float(interval)
+        self.margin = float(margin)
+        self.jitter = float(jitter)
+        self.retry_delay = float(retry_delay)
+        self._task: Optional[asyncio.Task] = None
+
+    def _jittered(self, seconds: float) -> float:
+        return max(1.0, seconds * random.uniform(1.0 - self.jitter, 1.0))
+
+    async def tick(self) -> float:
+        """1회 점검(+필요 시 갱신). 다음 점검까지 대기 시간(sec) 반환."""
+        ttl = await self._check()
+        if ttl is not None and ttl > self.margin:
+            return self._jittered(min(self.interval, ttl - self.margin))
+        await self._renew()
+        ttl = await self._check()
+        if ttl is not None and ttl > self.margin:
+            return self._jittered(min(self.interval, ttl - self.margin))
+        return self._jittered(self.interval)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                wait = await self.tick()
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                logger.warning(f"[{self.name}] session refresh failed: {e}")
+                wait = self._jittered(self.retry_delay)
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                return
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"{self.name}-session-keeper")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
@@ -0,0 +1,336 @@
+"""
+opt-in 계측 레이어
+- MultiPerpDex 메서드 / HTTP(aiohttp, curl_cffi) / WS 수신을 venue·kind·name 라벨로 기록
+- HDR 스타일(log-linear) 지연 히스토그램 + 에러 수 + 바이트 수
+- 비활성 상태에서는 bool 1회 확인 외 비용 없음(enable 전에는 래핑/trace 자체가 붙지 않음)
+
+사용:
+    from mpdex.utils import metrics
+    metrics.enable()                                  # 거래소 생성 전에 호출 권장(세션 생성 시 trace 부착)
+    await metrics.PrometheusSink(port=9464).start()   # GET /metrics
+    await metrics.LogSink(interval=60).start()        # 주기적 로그 덤프
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("mpdex.metrics")
+
+_ENABLED = False
+
+# 지연 히스토그램: 마이크로초 정수를 2^k 구간마다 2^SUB_BITS 개의 선형 sub-bucket 으로 나눔 (상대오차 ~1/16)
+SUB_BITS = 4
+_SUB_COUNT = 1 << SUB_BITS
+_LINEAR_MAX = _SUB_COUNT << 1
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+def enable() -> None:
+    """계측 활성화: 이미 로드된 MultiPerpDex 하위 클래스를 래핑하고, 이후 생성되는 세션에 trace 를 부착."""
+    global _ENABLED
+    _ENABLED = True
+    from multi_perp_dex import MultiPerpDex
+    stack = list(MultiPerpDex.__subclasses__())
+    while stack:
+        cls = stack.pop()
+        instrument_class(cls)
+        stack.extend(cls.__subclasses__())
+
+def disable() -> None:
+    global _ENABLED
+    _ENABLED = False
+
+# ---------------------- 히스토그램/레지스트리 ----------------------
+
+def _bucket_index(v: int) -> int:
+    if v < _LINEAR_MAX:
+        return v if v > 0 else 0
+    shift = v.bit_length() - (SUB_BITS + 1)
+    return (shift << SUB_BITS) + (v >> shift)
+
+def _bucket_value(idx: int) -> int:
+    # 버킷 중앙값(마이크로초)
+    if idx < _LINEAR_MAX:
+        return idx
+    shift, mant = (idx >> SUB_BITS) - 1, _SUB_COUNT + (idx & (_SUB_COUNT - 1))
+    return (mant << shift) + ((1 << shift) >> 1)
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total_us", "min_us", "max_us")
+
+    def __init__(self) -> None:
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    def record(self, seconds: float) -> None:
+        us = int(seconds * 1_000_000)
+        idx = _bucket_index(us)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.total_us += us
+        if self.min_us is None or us < self.min_us:
+            self.min_us = us
+        if us > self.max_us:
+            self.max_us = us
+
+    def percentile(self, q: float) -> float:
+        """q(0~100) 분위 지연(초)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(round(self.count * q / 100.0)))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(_bucket_value(idx), self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+class Series:
+    __slots__ = ("hist", "errors", "bytes_in", "bytes_out")
+
+    def __init__(self) -> None:
+        self.hist = LatencyHistogram()
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+# (venue, kind, name) -> Series   kind: 'method' | 'http' | 'ws'
+_SERIES: Dict[Tuple[str, str, str], Series] = {}
+# (name, labels) -> value
+_GAUGES: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+
+def _series(venue: str, kind: str, name: str) -> Series:
+    key = (venue, kind, name)
+    s = _SERIES.get(key)
+    if s is None:
+        s = _SERIES[key] = Series()
+    return s
+
+def record(venue: str, kind: str, name: str, seconds: Optional[float] = None, *,
+           error: bool = False, bytes_in: int = 0, bytes_out: int = 0) -> None:
+    if not _ENABLED:
+        return
+    s = _series(venue, kind, name)
+    if seconds is not None:
+        s.hist.record(seconds)
+    if error:
+        s.errors += 1
+    s.bytes_in += bytes_in
+    s.bytes_out += bytes_out
+
+def set_gauge(name: str, value: float, **labels: Any) -> None:
+    if not _ENABLED:
+        return
+    _GAUGES[(name, tuple(sorted((k, str(v)) for k, v in labels.items())))] = float(value)
+
+def reset() -> None:
+    _SERIES.clear()
+    _GAUGES.clear()
+
+def snapshot() -> List[Dict[str, Any]]:
+    """사용자 정의 sink 용 요약 목록."""
+    out = []
+    for (venue, kind, name), s in sorted(_SERIES.items()):
+        h = s.hist
+        out.append({
+            "venue": venue, "kind": kind, "name": name,
+            "count": h.count, "errors": s.errors,
+            "bytes_in": s.bytes_in, "bytes_out": s.bytes_out,
+            "sum": h.total_us / 1_000_000,
+            "p50": h.percentile(50), "p90": h.percentile(90), "p99": h.percentile(99),
+            "max": h.max_us / 1_000_000,
+        })
+    return out
+
+# ---------------------- MultiPerpDex 메서드 래핑 ----------------------
+
+# 같은 객체의 같은 메서드가 super() 로 중첩 호출될 때 이중 기록 방지
+_ACTIVE: contextvars.ContextVar[frozenset] = contextvars.ContextVar("mpdex_metrics_active", default=frozenset())
+
+def venue_of(obj_or_cls: Any) -> str:
+    cls = obj_or_cls if isinstance(obj_or_cls, type) else type(obj_or_cls)
+    v = getattr(cls, "VENUE", None)
+    if v:
+        return str(v)
+    name = cls.__name__
+    if name.endswith("Exchange"):
+        name = name[: -len("Exchange")]
+    return name.lower()
+
+def _wrap_method(fn: Callable, name: str) -> Callable:
+    @functools.wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        if not _ENABLED:
+            return await fn(self, *args, **kwargs)
+        key = (id(self), name)
+        active = _ACTIVE.get()
+        if key in active:
+            return await fn(self, *args, **kwargs)
+        token = _ACTIVE.set(active | {key})
+        t0 = time.perf_counter()
+        err = False
+        try:
+            return await fn(self, *args, **kwargs)
+        except Exception:
+            err = True
+            raise
+        finally:
+            _ACTIVE.reset(token)
+            record(venue_of(self), "method", name, time.perf_counter() - t0, error=err)
+    wrapper.__mpdex_metrics__ = True
+    return wrapper
+
+def instrument_class(cls: type) -> None:
+    """cls 의 public coroutine 메서드를 래핑(이미 래핑된 것은 건너뜀)."""
+    for name in dir(cls):
+        if name.startswith("_"):
+            continue
+        try:
+            attr = inspect.getattr_static(cls, name)
+        except AttributeError:
+            continue
+        if isinstance(attr, (staticmethod, classmethod)):
+            continue
+        if not inspect.iscoroutinefunction(attr) or getattr(attr, "__mpdex_metrics__", False):
+            continue
+        setattr(cls, name, _wrap_method(attr, name))
+
+# ---------------------- HTTP (aiohttp trace) ----------------------
+
+def http_trace_config(venue: str):
+    """aiohttp TraceConfig: 요청별 지연/상태/바이트 기록. 비활성 시 None."""
+    if not _ENABLED:
+        return None
+    import aiohttp
+
+    async def on_start(session, ctx, params):
+        ctx.t0 = time.perf_counter()
+        ctx.sent = 0
+
+    async def on_chunk_sent(session, ctx, params):
+        ctx.sent += len(params.chunk or b"")
+
+    async def on_end(session, ctx, params):
+        # request_end 는 헤더 수신 시점 → 수신 바이트는 Content-Length 기준
+        resp = params.response
+        record(venue, "http", f"{params.method} {params.url.path}", time.perf_counter() - ctx.t0,
+               error=resp.status >= 400, bytes_in=resp.content_length or 0, bytes_out=ctx.sent)
+
+    async def on_exc(session, ctx, params):
+        record(venue, "http", f"{params.method} {params.url.path}", time.perf_counter() - ctx.t0,
+               error=True, bytes_out=ctx.sent)
+
+    tc = aiohttp.TraceConfig()
+    tc.on_request_start.append(on_start)
+    tc.on_request_chunk_sent.append(on_chunk_sent)
+    tc.on_request_end.append(on_end)
+    tc.on_request_exception.append(on_exc)
+    return tc
+
+# ---------------------- Sinks ----------------------
+
+def _esc(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def render_prometheus() -> str:
+    lines: List[str] = [
+        "# TYPE mpdex_latency_seconds summary",
+        "# TYPE mpdex_errors_total counter",
+        "# TYPE mpdex_bytes_total counter",
+    ]
+    for (venue, kind, name), s in sorted(_SERIES.items()):
+        lb = f'venue="{_esc(venue)}",kind="{_esc(kind)}",name="{_esc(name)}"'
+        h = s.hist
+        if h.count:
+            for q in (0.5, 0.9, 0.99, 0.999):
+                lines.append(f'mpdex_latency_seconds{{{lb},quantile="{q}"}} {h.percentile(q * 100):.6f}')
+            lines.append(f"mpdex_latency_seconds_sum{{{lb}}} {h.total_us / 1_000_000:.6f}")
+            lines.append(f"mpdex_latency_seconds_count{{{lb}}} {h.count}")
+        lines.append(f"mpdex_errors_total{{{lb}}} {s.errors}")
+        if s.bytes_in or s.bytes_out:
+            lines.append(f'mpdex_bytes_total{{{lb},direction="in"}} {s.bytes_in}')
+            lines.append(f'mpdex_bytes_total{{{lb},direction="out"}} {s.bytes_out}')
+    seen = set()
+    for (gname, labels), v in sorted(_GAUGES.items()):
+        if gname not in seen:
+            lines.append(f"# TYPE {gname} gauge")
+            seen.add(gname)
+        lb = ",".join(f'{k}="{_esc(x)}"' for k, x in labels)
+        lines.append(f"{gname}{{{lb}}} {v}")
+    return "\n".join(lines) + "\n"
+
+class PrometheusSink:
+    """의존성 없는 최소 HTTP 서버: 모든 GET 에 text exposition 응답."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9464) -> None:
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            await reader.readuntil(b"\r\n\r\n")
+            body = render_prometheus().encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except Exception:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> "PrometheusSink":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        return self
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+class LogSink:
+    """interval 초마다 snapshot() 을 로그로 덤프."""
+
+    def __init__(self, interval: float = 60.0, log: Optional[logging.Logger] = None) -> None:
+        self.interval = float(interval)
+        self.log = log or logger
+        self._task: Optional[asyncio.Task] = None
+
+    def dump(self) -> None:
+        for r in snapshot():
+            self.log.info(
+                "[metrics] %s %s %-32s n=%d err=%d p50=%.1fms p90=%.1fms p99=%.1fms max=%.1fms in=%dB out=%dB",
+                r["venue"], r["kind"], r["name"], r["count"], r["errors"],
+                r["p50"] * 1e3, r["p90"] * 1e3, r["p99"] * 1e3, r["max"] * 1e3,
+                r["bytes_in"], r["bytes_out"],
+            )
+
+    async def _loop(self) -> None:
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                self.dump()
+        except asyncio.CancelledError:
+            return
+
+    async def start(self) -> "LogSink":
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(), name="metrics-log-sink")
+        return self
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
@@ -0,0 +1,178 @@
+"""
+L2 오더북(가격 레벨 집계) 메모리 엔진
+- 가격 정렬 리스트(bisect) + 가격→수량 dict 로 보관 (레벨 삽입/삭제 O(log n) 탐색)
+- apply_snapshot: 전체 교체 (HL l2Book 처럼 매 push 가 상위 N 레벨 스냅샷인 경우)
+- apply_delta: 레벨 단위 증분 갱신 (size 0 이면 레벨 삭제)
+- impact_price: 주문 수량만큼 호가를 쓸었을 때의 최악가/평균가
+- impact_limit_price: 시장가 주문용 지정가(최악가 + buffer, ref 가격 ±max_slippage 로 상한)
+"""
+import bisect
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+BUY = "buy"
+SELL = "sell"
+
+def _level(lv: Any) -> Optional[Tuple[float, float]]:
+    """
+    레벨 정규화: (px, sz) / [px, sz] / {"px","sz"} / {"price","size"} → (float, float)
+    """
+    try:
+        if isinstance(lv, dict):
+            px = lv.get("px", lv.get("price"))
+            sz = lv.get("sz", lv.get("size", lv.get("qty")))
+        else:
+            px, sz = lv[0], lv[1]
+        return float(px), float(sz)
+    except Exception:
+        return None
+
+class L2Book:
+    """단일 심볼의 가격 레벨 오더북."""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self._bids: Dict[float, float] = {}
+        self._asks: Dict[float, float] = {}
+        self._bid_px: List[float] = []   # 오름차순(최우선 매수호가 = 마지막)
+        self._ask_px: List[float] = []   # 오름차순(최우선 매도호가 = 처음)
+        self.ts: Optional[int] = None    # 거래소 타임스탬프(ms)
+        self.updated_at: float = 0.0     # 로컬 수신 시각(time.time())
+
+    # ---------------------- 갱신 ----------------------
+
+    def apply_snapshot(self, bids: Iterable[Any], asks: Iterable[Any], ts: Optional[int] = None) -> None:
+        b = dict(x for x in (_level(lv) for lv in (bids or [])) if x and x[1] > 0)
+        a = dict(x for x in (_level(lv) for lv in (asks or [])) if x and x[1] > 0)
+        self._bids, self._asks = b, a
+        self._bid_px, self._ask_px = sorted(b), sorted(a)
+        self._touch(ts)
+
+    def apply_delta(self, side: str, px: float, sz: float, ts: Optional[int] = None) -> None:
+        is_bid = str(side).lower() in ("bid", "bids", BUY)
+        levels, prices = (self._bids, self._bid_px) if is_bid else (self._asks, self._ask_px)
+        px, sz = float(px), float(sz)
+        if sz <= 0:
+            if levels.pop(px, None) is not None:
+                i = bisect.bisect_left(prices, px)
+                if i < len(prices) and prices[i] == px:
+                    prices.pop(i)
+        else:
+            if px not in levels:
+                bisect.insort(prices, px)
+            levels[px] = sz
+        self._touch(ts)
+
+    def apply_deltas(self, bids: Iterable[Any], asks: Iterable[Any], ts: Optional[int] = None) -> None:
+        for lv in bids or []:
+            x = _level(lv)
+            if x:
+                self.apply_delta("bid", x[0], x[1])
+        for lv in asks or []:
+            x = _level(lv)
+            if x:
+                self.apply_delta("ask", x[0], x[1])
+        self._touch(ts)
+
+    def _touch(self, ts: Optional[int]) -> None:
+        if ts is not None:
+            try:
+                self.ts = int(ts)
+            except (TypeError, ValueError):
+                pass
+        self.updated_at = time.time()
+
+    # ---------------------- 조회 ----------------------
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._bid_px or self._ask_px)
+
+    def best_bid(self) -> Optional[Tuple[float, float]]:
+        if not self._bid_px:
+            return None
+        px = self._bid_px[-1]
+        return px, self._bids[px]
+
+    def best_ask(self) -> Optional[Tuple[float, float]]:
+        if not self._ask_px:
+            return None
+        px = self._ask_px[0]
+        return px, self._asks[px]
+
+    def mid(self) -> Optional[float]:
+        b, a = self.best_bid(), self.best_ask()
+        if not b or not a:
+            return None
+        return (b[0] + a[0]) / 2.0
+
+    def bids(self, depth: Optional[int] = None) -> List[Tuple[float, float]]:
+        prices = self._bid_px[::-1]
+        if depth is not None:
+            prices = prices[:max(0, int(depth))]
+        return [(p, self._bids[p]) for p in prices]
+
+    def asks(self, depth: Optional[int] = None) -> List[Tuple[float, float]]:
+        prices = self._ask_px if depth is None else self._ask_px[:max(0, int(depth))]
+        return [(p, self._asks[p]) for p in prices]
+
+    def snapshot(self, depth: Optional[int] = 20) -> Dict[str, Any]:
+        """{"symbol", "bids": [[px, sz], ...](높은 가격부터), "asks": [[px, sz], ...](낮은 가격부터), "ts"}"""
+        return {
+            "symbol": self.symbol,
+            "bids": [[p, s] for p, s in self.bids(depth)],
+            "asks": [[p, s] for p, s in self.asks(depth)],
+            "ts": self.ts,
+        }
+
+    def impact_price(self, side: str, size: float) -> Tuple[Optional[float], Optional[float], float]:
+        """
+        side 방향으로 size 만큼 시장가 체결 시
+        반환: (최악 체결가, 평균 체결가, 체결 가능 수량). 호가가 없으면 (None, None, 0.0)
+        buy 는 asks 를, sell 은 bids 를 쓸어감.
+        """
+        levels = self.asks() if str(side).lower() == BUY else self.bids()
+        remain = float(size)
+        filled = notional = 0.0
+        worst = None
+        for px, sz in levels:
+            if remain <= 0:
+                break
+            take = min(sz, remain)
+            filled += take
+            notional += take * px
+            remain -= take
+            worst = px
+        if filled <= 0:
+            return None, None, 0.0
+        return worst, notional / filled, filled
+
+def impact_limit_price(
+    book: Optional[L2Book],
+    side: str,
+    size: float,
+    *,
+    ref_px: Optional[float] = None,
+    max_slippage: float = 0.05,
+    buffer: float = 0.001,
+) -> Optional[float]:
+    """
+    시장가 주문용 지정가(IOC/FrontendMarket 에 넣을 가격) 계산.
+    - 호가를 size 만큼 쓸었을 때의 최악가에 buffer(비율)를 더함(매도는 뺌)
+    - ref_px(마크가 등)가 있으면 ref_px*(1±max_slippage) 를 넘지 않도록 상한
+    - 호가 깊이가 모자라면 ref_px 기준 상한가, ref_px 도 없으면 None (호출측에서 기존 방식으로 폴백)
+    - size <= 0 이면 None
+    """
+    if float(size) <= 0:
+        return None
+    is_buy = str(side).lower() == BUY
+    bound = None
+    if ref_px:
+        bound = float(ref_px) * (1.0 + max_slippage) if is_buy else float(ref_px) * (1.0 - max_slippage)
+    worst, _avg, filled = book.impact_price(side, size) if book is not None else (None, None, 0.0)
+    if worst is None or filled + 1e-12 < float(size):
+        return bound
+    px = worst * (1.0 + buffer) if is_buy else worst * (1.0 - buffer)
+    if bound is not None:
+        px = min(px, bound) if is_buy else max(px, bound)
+    return px
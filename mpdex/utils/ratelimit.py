@@ -0,0 +1,234 @@
+"""
+venue 별 클라이언트 측 레이트 리미터/스케줄러
+- token bucket(초당 rate, 최대 capacity) + 요청 weight
+- 우선순위 큐: cancel > order > read (같은 우선순위는 FIFO)
+- 한도 초과 시 실패시키지 않고 대기열에서 순서대로 내보냄
+- 429 응답을 받으면 Retry-After(없으면 1초) 동안 해당 venue 를 멈춤
+- 상태는 metrics 게이지(mpdex_ratelimit_tokens / mpdex_ratelimit_queue)로 노출
+- 기본 비활성(opt-in): ratelimit.enable() 이후 생성되는 세션부터 적용
+  (대기 시간도 aiohttp 요청 timeout 에 포함되므로 timeout 을 넉넉히 둘 것)
+
+aiohttp 세션은 common_http.new_session() 에서 trace 로 자동 적용된다.
+요청별 weight/priority 는 trace_request_ctx 로 지정:
+    s.post(url, json=..., trace_request_ctx={"priority": ratelimit.PRIORITY_CANCEL, "weight": 1})
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from mpdex.utils import metrics
+
+PRIORITY_CANCEL = 0
+PRIORITY_ORDER = 1
+PRIORITY_READ = 2
+_PRIORITY_NAMES = {PRIORITY_CANCEL: "cancel", PRIORITY_ORDER: "order", PRIORITY_READ: "read"}
+
+_ENABLED = False  # opt-in
+
+# venue -> (초당 rate, capacity). 공개 한도보다 약간 보수적으로 설정
+DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+    "hyperliquid": (20.0, 1200.0),   # 1200 weight / 분 (IP)
+    "superstack": (20.0, 1200.0),    # superstack 의 HL /info 조회(HL 한도)
+    "superstack_wallet": (10.0, 20.0),  # superstack 지갑 서비스(서명 API)
+    "treadfi_hl": (5.0, 10.0),
+    "variational": (5.0, 10.0),
+    "backpack": (10.0, 20.0),
+    "pacifica": (10.0, 20.0),
+    "edgex": (10.0, 20.0),
+    "lighter": (10.0, 20.0),
+}
+DEFAULT_LIMIT = (10.0, 20.0)
+
+def enable() -> None:
+    global _ENABLED
+    _ENABLED = True
+
+def disable() -> None:
+    """비활성화: 이후 생성되는 세션에는 적용되지 않고, 기존 세션은 대기 없이 통과."""
+    global _ENABLED
+    _ENABLED = False
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+# HL /info 요청 타입별 weight (그 외 타입은 20)
+_HL_INFO_WEIGHTS = {
+    "l2Book": 2,
+    "allMids": 2,
+    "clearinghouseState": 2,
+    "orderStatus": 2,
+    "spotClearinghouseState": 2,
+    "exchangeStatus": 2,
+    "userRole": 60,
+}
+
+def hl_info_weight(payload: Any) -> int:
+    """HL /info body 의 type 으로 weight 계산. 호출측에서 trace_request_ctx={"weight": ...} 로 전달"""
+    t = payload.get("type") if isinstance(payload, dict) else None
+    return _HL_INFO_WEIGHTS.get(t, 20)
+
+def hl_exchange_weight(n_actions: int = 1) -> int:
+    """HL /exchange weight: 1 + floor(batch 길이 / 40)"""
+    return 1 + max(0, int(n_actions)) // 40
+
+def _hl_weight(method: str, path: str) -> int:
+    # HL: /exchange 는 1, /info 는 body 를 모르면 보수적으로 20 (HL 래퍼는 hl_info_weight 로 타입별 weight 전달)
+    return 1 if path.endswith("/exchange") else 20
+
+# venue -> (method, path) -> weight
+_WEIGHT_RULES = {
+    "hyperliquid": _hl_weight,
+    "superstack": _hl_weight,
+}
+
+def infer_priority(method: str, path: str) -> int:
+    m = method.upper()
+    p = path.lower()
+    if m == "DELETE" or "cancel" in p:
+        return PRIORITY_CANCEL
+    if m == "GET" or p.endswith("/info"):
+        return PRIORITY_READ
+    return PRIORITY_ORDER
+
+class VenueScheduler:
+    """단일 venue 의 token bucket + 우선순위 대기열."""
+
+    def __init__(self, venue: str, rate: float, capacity: float) -> None:
+        self.venue = venue
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._heap: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._pump: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def _publish(self) -> None:
+        if metrics.is_enabled():
+            metrics.set_gauge("mpdex_ratelimit_tokens", self.tokens, venue=self.venue)
+            metrics.set_gauge("mpdex_ratelimit_queue", len(self._heap), venue=self.venue)
+
+    def pause(self, seconds: float) -> None:
+        """서버가 429 를 준 경우 등: seconds 동안 토큰을 내주지 않음."""
+        self._paused_until = max(self._paused_until, time.monotonic() + float(seconds))
+        self.tokens = min(self.tokens, 0.0)
+
+    async def acquire(self, weight: float = 1.0, priority: int = PRIORITY_READ) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # 다른 이벤트 루프(asyncio.run 재호출 등) → 대기열 초기화
+            self._loop, self._heap, self._pump = loop, [], None
+        weight = min(float(weight), self.capacity)
+        t0 = time.monotonic()
+        self._refill()
+        if not self._heap and t0 >= self._paused_until and self.tokens >= weight:
+            self.tokens -= weight
+            self._publish()
+            return
+        fut = loop.create_future()
+        heapq.heappush(self._heap, (int(priority), next(self._seq), weight, fut))
+        if self._pump is None or self._pump.done():
+            self._pump = loop.create_task(self._run(), name=f"ratelimit-{self.venue}")
+        self._publish()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # 대기 중 취소 → 큐에서 제거(펌프가 건너뜀)
+            if not fut.done():
+                fut.cancel()
+            raise
+        metrics.record(self.venue, "ratelimit", _PRIORITY_NAMES.get(int(priority), str(priority)),
+                       time.monotonic() - t0)
+
+    async def _run(self) -> None:
+        while self._heap:
+            prio, _, weight, fut = self._heap[0]
+            if fut.done():
+                heapq.heappop(self._heap)
+                continue
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._refill()
+            if self.tokens >= weight:
+                heapq.heappop(self._heap)
+                self.tokens -= weight
+                fut.set_result(None)
+                self._publish()
+                continue
+            await asyncio.sleep((weight - self.tokens) / self.rate)
+        self._publish()
+
+_SCHEDULERS: Dict[str, VenueScheduler] = {}
+
+def configure(venue: str, *, rate: Optional[float] = None, capacity: Optional[float] = None) -> VenueScheduler:
+    """venue 한도 변경(없으면 생성)."""
+    sch = get_scheduler(venue)
+    if rate is not None:
+        sch.rate = float(rate)
+    if capacity is not None:
+        sch.capacity = float(capacity)
+        sch.tokens = min(sch.tokens, sch.capacity)
+    return sch
+
+def get_scheduler(venue: str) -> VenueScheduler:
+    sch = _SCHEDULERS.get(venue)
+    if sch is None:
+        rate, cap = DEFAULT_LIMITS.get(venue, DEFAULT_LIMIT)
+        sch = _SCHEDULERS[venue] = VenueScheduler(venue, rate, cap)
+    return sch
+
+async def acquire(venue: str, *, weight: float = 1.0, priority: int = PRIORITY_READ) -> None:
+    """aiohttp 이외 경로(curl_cffi 등)에서 직접 호출."""
+    if not _ENABLED:
+        return
+    await get_scheduler(venue).acquire(weight, priority)
+
+def _retry_after(headers: Any) -> float:
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except Exception:
+        return 1.0
+
+def on_response_status(venue: str, status: int, headers: Any = None) -> None:
+    if _ENABLED and int(status) == 429:
+        get_scheduler(venue).pause(_retry_after(headers or {}))
+
+def trace_config(venue: str):
+    """aiohttp TraceConfig: 요청 시작 전에 토큰을 기다림. 비활성 시 None."""
+    if not _ENABLED:
+        return None
+    import aiohttp
+
+    weight_rule = _WEIGHT_RULES.get(venue)
+
+    async def on_start(session, ctx, params):
+        if not _ENABLED:
+            return
+        req = ctx.trace_request_ctx if isinstance(ctx.trace_request_ctx, dict) else {}
+        path = params.url.path
+        priority = req.get("priority")
+        if priority is None:
+            priority = infer_priority(params.method, path)
+        weight = req.get("weight")
+        if weight is None:
+            weight = weight_rule(params.method, path) if weight_rule else 1
+        await get_scheduler(venue).acquire(weight, priority)
+
+    async def on_end(session, ctx, params):
+        on_response_status(venue, params.response.status, params.response.headers)
+
+    tc = aiohttp.TraceConfig()
+    tc.on_request_start.append(on_start)
+    tc.on_request_end.append(on_end)
+    return tc
@@ -0,0 +1,210 @@
+"""
+래퍼 공통 반환 레코드(포지션/주문/담보/체결)
+- 필드는 __slots__ 속성(pos.size 는 일반 속성 접근, 인스턴스 __dict__ 없음)
+- MutableMapping 어댑터: pos["size"] / in / keys / items / dict(pos) / {**pos} / pos["x"] = v 등
+  기존 dict 반환 코드가 쓰던 방식 그대로 동작. json 직렬화는 json.dumps(pos.to_dict())
+- 공통 필드(_FIELDS)는 항상 같은 이름. 거래소별 기존 키(예: pacifica 'id', paradex 'amount')는
+  추가 키(_extra)로 함께 넣어 기존 호출 코드 호환 유지
+- raw: 원본 payload 는 속성으로만 참조 보관(복사 X, 키 아님 → 직렬화/비교/순회에서 제외)
+- _ALIASES: 다른 키 이름으로도 조회/대입 가능(o["oid"]). 조회 전용이며 키 목록/in 에는 포함 안 됨
+- _LEGACY: _ALIASES 중 예전 반환 dict 에 실제 있던 키 → 키 목록/in/to_dict 에도 포함
+- _OPTIONAL: 값이 None 이면 키를 넣지 않는 필드(거래소별 부가 정보)
+- side 는 거래소가 원래 주던 값 그대로('buy'/'ask', 'BUY'/'SELL' 등), 정규화 값은 direction('long'|'short'|'flat')
+"""
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+_SIDE_MAP = {
+    "long": "long", "buy": "long", "bid": "long", "b": "long",
+    "short": "short", "sell": "short", "ask": "short", "a": "short",
+    "flat": "flat",
+}
+
+def normalize_side(side: Any) -> Optional[str]:
+    """거래소별 side 표기 → 'long'|'short'|'flat' (알 수 없으면 소문자 그대로, 없으면 None)"""
+    if side is None:
+        return None
+    s = str(side).strip().lower()
+    if not s:
+        return None
+    return _SIDE_MAP.get(s, s)
+
+class Record(MutableMapping):
+    __slots__ = ("raw", "_extra")
+    _FIELDS: Tuple[str, ...] = ()
+    _ALIASES: Dict[str, str] = {}
+    _LEGACY: Tuple[str, ...] = ()
+    _OPTIONAL: frozenset = frozenset()
+    _FIELD_SET: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls._FIELDS)
+
+    def __init__(self, *, raw: Any = None, **values: Any):
+        self.raw = raw
+        self._extra = None
+        if "direction" in self._FIELD_SET and values.get("direction") is None:
+            values["direction"] = normalize_side(values.get("side"))
+        for name in self._FIELDS:
+            v = values.pop(name, None)
+            if v is None and name in self._OPTIONAL:
+                continue
+            object.__setattr__(self, name, v)
+        # 예전 키 이름으로 넘어온 값은 공통 필드로
+        for k in [k for k in values if k in self._ALIASES]:
+            v = values.pop(k)
+            if v is not None or self._ALIASES[k] not in self._OPTIONAL:
+                object.__setattr__(self, self._ALIASES[k], v)
+        # 거래소별 추가 키(호환용)
+        if values:
+            self._extra = values
+
+    def __getattr__(self, name: str) -> Any:
+        # 비어 있는 슬롯(옵션 필드) / 별칭 속성 접근
+        key = type(self)._ALIASES.get(name, name)
+        if key in type(self)._FIELD_SET:
+            if key != name:
+                return getattr(self, key)
+            return None
+        raise AttributeError(f"{type(self).__name__!s} has no attribute {name!r}")
+
+    # ---- Mapping 어댑터 ----
+    def _field(self, key: Any) -> Optional[str]:
+        try:
+            name = self._ALIASES.get(key, key)
+            return name if name in self._FIELD_SET else None
+        except TypeError:  # unhashable key
+            return None
+
+    def __getitem__(self, key: Any) -> Any:
+        name = self._field(key)
+        if name is not None:
+            try:
+                return object.__getattribute__(self, name)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        name = self._field(key)
+        if name is not None:
+            object.__setattr__(self, name, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        name = self._field(key)
+        if name is not None:
+            try:
+                object.__delattr__(self, name)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def _has(self, name: str) -> bool:
+        try:
+            object.__getattribute__(self, name)
+            return True
+        except AttributeError:
+            return False
+
+    def __contains__(self, key: Any) -> bool:
+        name = self._field(key)
+        if name is not None:
+            if name != key and key not in self._LEGACY:
+                return False
+            return self._has(name)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self._FIELDS:
+            if self._has(name):
+                yield name
+        for key in self._LEGACY:
+            if self._has(self._ALIASES[key]):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (_rebuild, (type(self), self._values(), self.raw))
+
+    def _values(self) -> Dict[str, Any]:
+        out = {name: object.__getattribute__(self, name) for name in self._FIELDS if self._has(name)}
+        if self._extra is not None:
+            out.update(self._extra)
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def copy(self) -> "Record":
+        return type(self)(raw=self.raw, **self._values())
+
+    def replace(self, **changes: Any) -> "Record":
+        return type(self)(raw=self.raw, **{**self._values(), **changes})
+
+def _rebuild(cls: type, values: Dict[str, Any], raw: Any) -> Record:
+    return cls(raw=raw, **values)
+
+class Position(Record):
+    """get_position 공통 스키마: entry_price / unrealized_pnl / side / size / direction(+부가 정보)"""
+    _FIELDS = (
+        "entry_price", "unrealized_pnl", "side", "size", "direction",
+        "symbol", "position_value", "liq_price", "margin_used", "roe", "lev_type", "leverage", "max_leverage",
+    )
+    __slots__ = _FIELDS
+    _OPTIONAL = frozenset({
+        "direction", "symbol", "position_value", "liq_price", "margin_used", "roe", "lev_type", "leverage", "max_leverage",
+    })
+
+class HLPosition(Position):
+    """HL WS 정규화 포지션: 예전 키(coin/entry_px/upnl/liq_px/lev_value)도 키 목록/in/to_dict 에 그대로 노출"""
+    __slots__ = ()
+    _ALIASES = {
+        "coin": "symbol",
+        "entry_px": "entry_price",
+        "upnl": "unrealized_pnl",
+        "liq_px": "liq_price",
+        "lev_value": "leverage",
+    }
+    _LEGACY = ("coin", "entry_px", "upnl", "liq_px", "lev_value")
+
+class Order(Record):
+    """미체결 주문 공통 스키마: order_id / symbol / side / price / size / direction (+client_id)"""
+    _FIELDS = ("order_id", "symbol", "side", "price", "size", "direction", "client_id")
+    __slots__ = _FIELDS
+    _ALIASES = {"oid": "order_id", "cloid": "client_id"}
+    _OPTIONAL = frozenset({"direction", "client_id"})
+
+class Collateral(Record):
+    """get_collateral 공통 스키마: available_collateral / total_collateral (+spot 스테이블 잔고)"""
+    _FIELDS = ("available_collateral", "total_collateral", "spot")
+    __slots__ = _FIELDS
+    _OPTIONAL = frozenset({"spot"})
+
+class Fill(Record):
+    """체결 공통 스키마"""
+    _FIELDS = ("symbol", "order_id", "side", "price", "size", "fee", "ts", "trade_id", "closed_pnl", "dir")
+    __slots__ = _FIELDS
+    _ALIASES = {"tid": "trade_id"}
@@ -1,6 +1,20 @@
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
+import asyncio
+import logging
+import sys
+import time
+
+logger = logging.getLogger(__name__)
 
 class MultiPerpDex(ABC):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # [ADDED] metrics.enable() 이후 import 된 래퍼도 계측 (비활성/미로드 시 비용 없음)
+        m = sys.modules.get("mpdex.utils.metrics")
+        if m is not None and m.is_enabled():
+            m.instrument_class(cls)
+
     @abstractmethod
     async def create_order(self, symbol, side, amount, price=None, order_type='market'):
         pass
@@ -41,4 +55,160 @@ class MultiPerpDexMixin:
         if is_reduce_only:
             return await self.create_order(symbol, side, size, price=None, order_type='market', is_reduce_only=True)
         else:
-            return await self.create_order(symbol, side, size, price=None, order_type='market')
\ No newline at end of file
+            return await self.create_order(symbol, side, size, price=None, order_type='market')
+
+    # [ADDED] 여러 심볼 마크가격: {symbol: price|None}
+    #  - 기본 구현은 get_mark_price 동시 호출(실패한 심볼은 None)
+    #  - 한 번에 전 종목 가격을 주는 엔드포인트가 있는 거래소는 override
+    async def get_mark_prices(self, symbols):
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        symbols = list(dict.fromkeys(symbols))
+        res = await asyncio.gather(*[self.get_mark_price(s) for s in symbols], return_exceptions=True)
+        return {s: (None if isinstance(p, BaseException) else p) for s, p in zip(symbols, res)}
+
+    # [ADDED] 주문/체결/포지션 변화 스트림: async for ev in ex.order_events([...])
+    #  - 기본 구현은 get_open_orders / get_position 을 적응형 주기로 폴링하며 diff
+    #  - 변화가 있으면 min_interval 로 빠르게, 조용하면 max_interval 까지 점진적으로 늦춤
+    #  - WS 스트림을 가진 거래소(HL 등)는 override 하여 네이티브로 제공
+    # event dict:
+    #  {"type": "order",    "status": "open"|"updated"|"closed", "symbol", "order_id", "side", "order", "ts", "source"}
+    #    (side 는 거래소 표기와 무관하게 'long'|'short', 원래 값은 order 안에 그대로)
+    #  {"type": "fill",     "symbol", "order_id", "side", "price", "size", "ts", "source", ...}
+    #  {"type": "position", "symbol", "side", "size", "prev_side", "prev_size", "ts", "source"}
+    #    (WS 구현은 "change": "opened"|"closed"|"resized"|"flipped" 추가)
+    #  {"type": "margin", "symbol": None, "dex", "account_value", "withdrawable", "prev_*", "changes", "ts", "source"}  (HL WS, symbols 미지정 시)
+    async def order_events(self, symbols, *, min_interval=0.25, max_interval=2.0, include_positions=True):
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        symbols = list(symbols or [])
+        if not symbols:
+            raise ValueError("order_events requires at least one symbol")
+
+        prev_orders = {}
+        prev_pos = {}
+        seen_errors = set()
+        primed = False
+        interval = min_interval
+        while True:
+            t0 = time.monotonic()
+            events = []
+            try:
+                for sym in symbols:
+                    cur = _index_orders(await self.get_open_orders(sym))
+                    if primed:
+                        events.extend(_diff_orders(sym, prev_orders.get(sym) or {}, cur))
+                    prev_orders[sym] = cur
+
+                    if include_positions:
+                        pos = await self.get_position(sym)
+                        sig = _position_sig(pos)
+                        if primed and sig != prev_pos.get(sym):
+                            old = prev_pos.get(sym) or (None, 0.0)
+                            events.append({
+                                "type": "position",
+                                "symbol": sym,
+                                "side": sig[0],
+                                "size": sig[1],
+                                "prev_side": old[0],
+                                "prev_size": old[1],
+                                "ts": int(time.time() * 1000),
+                                "source": "poll",
+                            })
+                        prev_pos[sym] = sig
+                primed = True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 일시 오류는 최대 주기로 재시도. 같은 오류는 처음 한 번만 warning(인증 실패/잘못된 심볼이 조용히 묻히지 않게)
+                err = f"{type(e).__name__}: {e}"
+                if err not in seen_errors:
+                    seen_errors.add(err)
+                    logger.warning(f"[order_events] {type(self).__name__} poll failed: {err}")
+                else:
+                    logger.debug(f"[order_events] {type(self).__name__} poll failed again: {err}")
+                interval = max_interval
+
+            for ev in events:
+                yield ev
+
+            if events:
+                interval = min_interval
+            else:
+                interval = min(max_interval, interval * 1.5)
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - t0)))
+
+
+_ORDER_ID_KEYS = ("order_id", "id", "oid", "orderId", "order_index", "client_order_id")
+
+
+def _order_id(o):
+    for k in _ORDER_ID_KEYS:
+        v = o.get(k)
+        if v is not None:
+            return str(v)
+    return None
+
+
+def _index_orders(orders):
+    # None / dict(Mapping, 예: records.Order) / list 모두 수용 → {order_id: order}
+    if not orders:
+        return {}
+    if isinstance(orders, Mapping):
+        orders = [orders]
+    out = {}
+    for o in orders:
+        if not isinstance(o, Mapping):
+            continue
+        oid = _order_id(o)
+        if oid is not None:
+            out[oid] = o
+    return out
+
+
+def _order_sig(o):
+    return (o.get("size") or o.get("quantity") or o.get("amount"), o.get("price"))
+
+
+def _normalize_side(side):
+    # mpdex 패키지가 이 모듈을 import 하므로 지연 import(순환 방지)
+    from mpdex.utils.records import normalize_side
+    return normalize_side(side)
+
+
+def _order_side(o):
+    # 거래소별 side 표기(buy/ask, BUY/SELL, bid/ask ...) → 'long'|'short'
+    return _normalize_side(o.get("direction") or o.get("side"))
+
+
+def _diff_orders(symbol, prev, cur):
+    now = int(time.time() * 1000)
+    events = []
+    for oid, o in cur.items():
+        old = prev.get(oid)
+        if old is None:
+            status = "open"
+        elif _order_sig(old) != _order_sig(o):
+            status = "updated"  # 부분 체결 등
+        else:
+            continue
+        events.append({"type": "order", "status": status, "symbol": symbol, "order_id": oid,
+                       "side": _order_side(o), "order": o, "ts": now, "source": "poll"})
+    for oid, o in prev.items():
+        if oid not in cur:
+            # 폴링만으로는 체결/취소 구분 불가 → closed
+            events.append({"type": "order", "status": "closed", "symbol": symbol, "order_id": oid,
+                           "side": _order_side(o), "order": o, "ts": now, "source": "poll"})
+    return events
+
+
+def _position_sig(pos):
+    if not pos or not isinstance(pos, Mapping):
+        return (None, 0.0)
+    try:
+        size = abs(float(pos.get("size") or 0.0))
+    except Exception:
+        size = 0.0
+    if size == 0.0:
+        return (None, 0.0)
+    return (_normalize_side(pos.get("direction") or pos.get("side")), size)
@@ -0,0 +1,78 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import base64
+import random
+import time
+import timeit
+import nacl.signing
+from wrappers.backpack import BackpackExchange
+
+# 키 없이 오프라인으로 실행 가능: 임의 키로 서명 결과 동일성 + 초당 서명 수 확인
+
+def legacy_signature(secret_key, instruction_type, params, timestamp, window="5000"):
+    # 변경 전 방식: 매 호출마다 b64decode + SigningKey 생성 + 문자열 조립
+    if params:
+        sorted_data = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        signing_string = f"instruction={instruction_type}&{sorted_data}&timestamp={timestamp}&window={window}"
+    else:
+        signing_string = f"instruction={instruction_type}&timestamp={timestamp}&window={window}"
+    signing_key = nacl.signing.SigningKey(base64.b64decode(secret_key))
+    return base64.b64encode(signing_key.sign(signing_string.encode()).signature).decode()
+
+CASES = [
+    ("positionQuery", None),
+    ("collateralQuery", None),
+    ("orderCancelAll", {"symbol": "BTC_USDC_PERP"}),
+    ("orderQueryAll", {"marketType": "PERP", "symbol": "ETH_USDC_PERP"}),
+    ("orderExecute", {"clientId": 123456, "orderType": "Limit", "quantity": "0.001",
+                      "side": "Bid", "symbol": "BTC_USDC_PERP", "price": "95000.5"}),
+]
+
+def check_unchanged(bp, secret_key, rounds=200):
+    for _ in range(rounds):
+        for instruction_type, params in CASES:
+            ts = str(int(time.time() * 1000) + random.randint(0, 10_000))
+            new_sig = bp._generate_signature(bp._signing_string(instruction_type, params, ts))
+            assert new_sig == legacy_signature(secret_key, instruction_type, params, ts)
+
+    # _signed_headers 도 같은 서명을 만드는지 확인
+    for instruction_type, params in CASES:
+        headers = bp._signed_headers(instruction_type, params, json_body=bool(params))
+        assert headers["X-API-KEY"] == bp.API_KEY
+        assert headers["X-WINDOW"] == "5000"
+        assert headers["X-SIGNATURE"] == legacy_signature(secret_key, instruction_type, params, headers["X-TIMESTAMP"])
+    print(f"[signature] unchanged ({rounds} rounds)")
+
+def bench(bp, secret_key, n=5000):
+    instruction_type, params = CASES[-1]
+    ts = str(int(time.time() * 1000))
+    t_old = timeit.timeit(lambda: legacy_signature(secret_key, instruction_type, params, ts), number=n)
+    t_new = timeit.timeit(lambda: bp._signed_headers(instruction_type, params, json_body=True), number=n)
+    print(f"[backpack] before {n/t_old:,.0f} req/s  after {n/t_new:,.0f} req/s  x{t_old/t_new:.2f}")
+
+def bench_pacifica(n=5000):
+    try:
+        from solders.keypair import Keypair
+        from mpdex.utils.common_pacifica import sign_message
+    except ImportError:
+        print("[pacifica] solders not installed, skip")
+        return
+    kp = Keypair()
+    b58 = str(kp)
+    header = {"timestamp": int(time.time() * 1000), "expiry_window": 5000, "type": "cancel_order"}
+    payload = {"symbol": "BTC", "order_id": 1}
+    t_old = timeit.timeit(lambda: sign_message(header, payload, Keypair.from_base58_string(b58)), number=n)
+    t_new = timeit.timeit(lambda: sign_message(header, payload, kp), number=n)
+    print(f"[pacifica] before {n/t_old:,.0f} req/s  after {n/t_new:,.0f} req/s  x{t_old/t_new:.2f}")
+
+def main():
+    secret_key = base64.b64encode(os.urandom(32)).decode()
+    api_key = base64.b64encode(bytes(nacl.signing.SigningKey(base64.b64decode(secret_key)).verify_key)).decode()
+    bp = BackpackExchange(api_key, secret_key)
+    check_unchanged(bp, secret_key)
+    bench(bp, secret_key)
+    bench_pacifica()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+from wrappers.hyperliquid_ws_client import HLWSClientRaw
+
+# 네트워크 없이 실행: WS 캐시 상태(미체결 주문 oid/cloid 인덱스, 포지션 증분 반영) 확인
+
+def make_client():
+    return HLWSClientRaw(ws_url="wss://example.invalid/ws", dex=None, address="0xabc", coins=[], http_base="https://example.invalid")
+
+def raw_order(oid, coin="BTC", side="B", px="100", sz="1", cloid=None):
+    o = {"coin": coin, "side": side, "limitPx": px, "sz": sz, "oid": oid, "timestamp": 1}
+    if cloid:
+        o["cloid"] = cloid
+    return o
+
+def test_order_index_add_remove():
+    c = make_client()
+    c._on_order_updates([
+        {"order": raw_order(1, cloid="0x01"), "status": "open"},
+        {"order": raw_order(2, coin="ETH", side="A"), "status": "open"},
+    ])
+    assert [o["order_id"] for o in c.get_open_orders("BTC")] == [1]
+    assert c.get_order("2")["side"] == "short"
+    assert c.get_order_by_cloid("0x01")["order_id"] == 1
+
+    # 부분 체결 등 같은 oid 갱신 → 교체, 인덱스 1개 유지
+    c._on_order_updates([{"order": raw_order(1, sz="0.4", cloid="0x01"), "status": "open"}])
+    assert len(c.get_open_orders("BTC")) == 1 and c.get_order(1)["size"] == 0.4
+
+    # 체결/취소 → 모든 인덱스에서 제거
+    c._on_order_updates([{"order": raw_order(1, cloid="0x01"), "status": "filled"}])
+    assert c.get_open_orders("BTC") == [] and c.get_order(1) is None
+    assert c.get_order_by_cloid("0x01") is None
+    assert "BTC" not in c._oids_by_symbol
+
+    # triggered 는 인덱스 유지
+    c._on_order_updates([{"order": raw_order(2, coin="ETH", side="A"), "status": "triggered"}])
+    assert c.get_order(2) is not None
+
+    # 스냅샷 전체 교체
+    c.open_orders = [c._normalize_open_order(raw_order(3, cloid="0x03"))]
+    assert [o["order_id"] for o in c.open_orders] == [3]
+    assert c.get_order(2) is None and c.get_order_by_cloid("0x03")["order_id"] == 3
+
+def test_cloid_reused_by_new_oid():
+    c = make_client()
+    c._on_order_updates([{"order": raw_order(10, cloid="0xaa"), "status": "open"}])
+    c._on_order_updates([{"order": raw_order(11, cloid="0xaa"), "status": "open"}])
+    # 이전 주문이 나중에 닫혀도 새 주문의 cloid 매핑은 유지
+    c._on_order_updates([{"order": raw_order(10, cloid="0xaa"), "status": "canceled"}])
+    assert c.get_order_by_cloid("0xaa")["order_id"] == 11
+
+def asset_pos(coin, szi, entry="100", upnl="0"):
+    return {"position": {"coin": coin, "szi": szi, "entryPx": entry, "unrealizedPnl": upnl,
+                         "leverage": {"type": "cross", "value": 5}}}
+
+async def positions_flow():
+    c = make_client()
+    q = c.add_event_listener()
+    c._apply_positions("hl", [asset_pos("BTC", "1")], now=1)   # 첫 스냅샷: 이벤트 없음
+    assert q.empty()
+    btc = c.positions_by_dex_norm["hl"]["BTC"]
+    assert btc["size"] == 1.0 and "entry_px" in btc and btc["coin"] == "BTC"
+
+    # 원본이 같으면 정규화 결과 재사용
+    c._apply_positions("hl", [asset_pos("BTC", "1")], now=2)
+    assert c.positions_by_dex_norm["hl"]["BTC"] is btc and q.empty()
+
+    # upnl 만 바뀌면 갱신하지만 이벤트 없음
+    c._apply_positions("hl", [asset_pos("BTC", "1", upnl="5")], now=3)
+    assert c.positions_by_dex_norm["hl"]["BTC"]["upnl"] == 5.0 and q.empty()
+
+    c._apply_positions("hl", [asset_pos("BTC", "-2"), asset_pos("ETH", "3")], now=4)
+    c._apply_positions("hl", [asset_pos("ETH", "3")], now=5)
+    evs = [q.get_nowait() for _ in range(q.qsize())]
+    changes = [(ev["symbol"], ev["change"]) for ev in evs]
+    assert changes == [("BTC", "flipped"), ("ETH", "opened"), ("BTC", "closed")]
+    assert "BTC" not in c.positions_by_dex_norm["hl"]
+
+def test_apply_positions_incremental():
+    asyncio.run(positions_flow())
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
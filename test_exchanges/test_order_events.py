@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import asyncio
+import logging
+from multi_perp_dex import MultiPerpDex, MultiPerpDexMixin
+from mpdex.utils.records import Order, Position
+
+# 네트워크/키 없이 실행: 레코드(Order/Position)를 반환하는 가짜 거래소로 폴링 order_events 확인
+
+class FakeExchange(MultiPerpDexMixin, MultiPerpDex):
+    def __init__(self):
+        self.orders = []
+        self.position = None
+
+    async def create_order(self, symbol, side, amount, price=None, order_type='market'):
+        return None
+
+    async def get_position(self, symbol):
+        return self.position
+
+    async def get_collateral(self):
+        return None
+
+    async def get_open_orders(self, symbol):
+        return list(self.orders)
+
+    async def cancel_orders(self, symbol, open_orders=None):
+        return []
+
+    async def get_mark_price(self, symbol):
+        return None
+
+async def main():
+    ex = FakeExchange()
+    events = []
+
+    async def consume():
+        async for ev in ex.order_events(["BTC"], min_interval=0.01, max_interval=0.02):
+            events.append(ev)
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0.05)  # 초기 스냅샷(primed)
+    # 거래소 원래 표기(pacifica 'buy'/'ask', paradex 'BUY') 그대로 → 이벤트 side 는 'long'|'short'
+    ex.orders = [Order(order_id=1, symbol="BTC", side="ask", price=100.0, size=1.0)]
+    ex.position = Position(entry_price=100.0, unrealized_pnl=0.0, side="buy", size=0.5)
+    await asyncio.sleep(0.1)
+    ex.orders = []
+    await asyncio.sleep(0.1)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+    kinds = [(ev["type"], ev.get("status") or ev.get("side")) for ev in events]
+    print(kinds)
+    assert ("order", "open") in kinds
+    assert ("order", "closed") in kinds
+    assert ("position", "long") in kinds
+    assert all(ev["side"] == "short" for ev in events if ev["type"] == "order")
+
+async def failing():
+    # 폴링 오류는 삼키되 같은 오류는 한 번만 warning
+    class Broken(FakeExchange):
+        async def get_open_orders(self, symbol):
+            raise RuntimeError("unauthorized")
+
+    ex = Broken()
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("multi_perp_dex")
+    logger.addHandler(handler)
+    try:
+        async def consume():
+            async for _ in ex.order_events(["BTC"], min_interval=0.01, max_interval=0.01):
+                pass
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    finally:
+        logger.removeHandler(handler)
+    warnings = [r for r in records if r.levelno >= logging.WARNING]
+    assert len(warnings) == 1 and "unauthorized" in warnings[0].getMessage()
+
+def test_order_events_with_records():
+    asyncio.run(main())
+
+def test_order_events_logs_poll_errors_once():
+    asyncio.run(failing())
+
+if __name__ == "__main__":
+    asyncio.run(main())
+    asyncio.run(failing())
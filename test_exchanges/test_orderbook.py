@@ -0,0 +1,61 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from mpdex.utils.orderbook import L2Book, impact_limit_price
+
+# 네트워크 없이 실행: L2Book 호가 쓸기 / impact_limit_price 결정적 계산 확인
+
+def make_book():
+    book = L2Book("BTC")
+    book.apply_snapshot(
+        bids=[[99.0, 1.0], {"px": "98", "sz": "2"}, (97.0, 3.0)],
+        asks=[[101.0, 1.0], {"price": 102.0, "size": 2.0}, (103.0, 3.0)],
+        ts=1,
+    )
+    return book
+
+def approx(a, b):
+    return a is not None and abs(a - b) < 1e-9
+
+def test_sweep_multiple_levels():
+    book = make_book()
+    worst, avg, filled = book.impact_price("buy", 2.5)
+    assert worst == 102.0 and filled == 2.5 and approx(avg, (101.0 + 1.5 * 102.0) / 2.5)
+    worst, avg, filled = book.impact_price("sell", 4.0)
+    assert worst == 97.0 and filled == 4.0 and approx(avg, (99.0 + 2 * 98.0 + 97.0) / 4.0)
+    # 최악가 + buffer, ref ± max_slippage 상한 안쪽
+    assert approx(impact_limit_price(book, "buy", 2.5, ref_px=100.0, buffer=0.001), 102.0 * 1.001)
+    assert approx(impact_limit_price(book, "sell", 4.0, ref_px=100.0, buffer=0.001), 97.0 * 0.999)
+    # 상한에 걸리는 경우
+    assert approx(impact_limit_price(book, "buy", 6.0, ref_px=100.0, max_slippage=0.02), 102.0)
+
+def test_book_too_thin():
+    book = make_book()
+    worst, avg, filled = book.impact_price("buy", 10.0)
+    assert worst == 103.0 and filled == 6.0
+    # 깊이 부족 → ref 기준 상한가, ref 도 없으면 None
+    assert approx(impact_limit_price(book, "buy", 10.0, ref_px=100.0, max_slippage=0.05), 105.0)
+    assert approx(impact_limit_price(book, "sell", 10.0, ref_px=100.0, max_slippage=0.05), 95.0)
+    assert impact_limit_price(book, "buy", 10.0) is None
+    assert impact_limit_price(None, "buy", 1.0) is None
+
+def test_zero_or_negative_size():
+    book = make_book()
+    assert book.impact_price("buy", 0) == (None, None, 0.0)
+    assert book.impact_price("sell", -1.0) == (None, None, 0.0)
+    assert impact_limit_price(book, "buy", 0, ref_px=100.0) is None
+    assert impact_limit_price(book, "sell", -1.0, ref_px=100.0) is None
+
+def test_deltas_update_levels():
+    book = make_book()
+    book.apply_delta("ask", 101.0, 0)       # 최우선 매도호가 삭제
+    book.apply_delta("bid", 99.5, 0.5)      # 새 최우선 매수호가
+    assert book.best_ask() == (102.0, 2.0)
+    assert book.best_bid() == (99.5, 0.5)
+    assert approx(book.mid(), (99.5 + 102.0) / 2)
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
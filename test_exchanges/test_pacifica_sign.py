@@ -0,0 +1,85 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import random
+import time
+import timeit
+import uuid
+import base58
+from solders.keypair import Keypair
+from mpdex.utils.common_pacifica import prepare_message, prepare_message_fast, sign_message
+
+# 키 없이 오프라인으로 실행 가능: 임의 keypair 로 서명 비용과 직렬화 동일성만 확인
+
+def _header(req_type):
+    return {
+        "timestamp": int(time.time() * 1_000),
+        "expiry_window": 5_000,
+        "type": req_type,
+    }
+
+def _random_payloads():
+    sym = random.choice(["BTC", "ETH", "SOL", "kPEPE", "한글"])
+    yield "create_market_order", {
+        "symbol": sym,
+        "reduce_only": random.choice([True, False]),
+        "amount": f"{random.random():.6f}",
+        "side": random.choice(["bid", "ask"]),
+        "client_order_id": str(uuid.uuid4()),
+        "slippage_percent": str(random.choice([0.1, 0.5, 1])),
+    }
+    yield "create_order", {
+        "symbol": sym,
+        "reduce_only": False,
+        "amount": random.random(),
+        "side": random.choice(["bid", "ask"]),
+        "client_order_id": str(uuid.uuid4()),
+        "price": str(random.randint(1, 100000)),
+        "tif": "GTC",
+    }
+    yield "cancel_order", {
+        "symbol": sym,
+        "order_id": random.randint(1, 2**40),
+    }
+    # 미등록 형태 -> fallback 경로
+    yield "create_order", {"symbol": sym, "amount": "1", "extra": {"b": [1, {"z": 1, "a": None}]}}
+    yield "set_leverage", {"symbol": sym, "leverage": 5}
+
+def check_equality(rounds=2000):
+    for _ in range(rounds):
+        for req_type, payload in _random_payloads():
+            header = _header(req_type)
+            slow = prepare_message(header, payload)
+            fast = prepare_message_fast(header, payload)
+            assert slow.encode("utf-8") == fast.encode("utf-8"), (slow, fast)
+    # 특수 float 값
+    for v in (float("nan"), float("inf"), -0.0, 1e300, 0.1 + 0.2):
+        header = _header("cancel_order")
+        payload = {"symbol": "BTC", "order_id": v}
+        assert prepare_message(header, payload) == prepare_message_fast(header, payload)
+    print(f"[equality] ok ({rounds} rounds)")
+
+def bench(n=20000):
+    keypair = Keypair()
+    header = _header("create_order")
+    payload = next(p for t, p in _random_payloads() if t == "create_order")
+
+    t_slow = timeit.timeit(lambda: prepare_message(header, payload), number=n) / n
+    t_fast = timeit.timeit(lambda: prepare_message_fast(header, payload), number=n) / n
+    print(f"[serialize] before {t_slow*1e6:.2f}us  after {t_fast*1e6:.2f}us  x{t_slow/t_fast:.2f}")
+
+    def slow_sign():
+        message = prepare_message(header, payload)
+        signature = keypair.sign_message(message.encode("utf-8"))
+        return (message, base58.b58encode(bytes(signature)).decode("ascii"))
+
+    t_slow = timeit.timeit(slow_sign, number=n) / n
+    t_fast = timeit.timeit(lambda: sign_message(header, payload, keypair), number=n) / n
+    print(f"[sign/order] before {t_slow*1e6:.2f}us  after {t_fast*1e6:.2f}us  x{t_slow/t_fast:.2f}")
+
+def main():
+    check_equality()
+    bench()
+
+if __name__ == "__main__":
+    main()
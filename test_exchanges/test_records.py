@@ -0,0 +1,65 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import json
+import pickle
+from mpdex.utils.records import HLPosition, Order, Position, normalize_side
+
+# 네트워크/키 없이 실행: 레코드의 Mapping 어댑터(조회/in/대입/직렬화/pickle) 확인
+
+def test_slots_and_attribute_access():
+    p = Position(entry_price=100.0, unrealized_pnl=1.5, side="long", size=0.5)
+    assert not hasattr(p, "__dict__")
+    assert p.size == 0.5 and p["size"] == 0.5
+    assert p.symbol is None and "symbol" not in p  # 비어 있는 옵션 필드
+    assert p.direction == "long"
+
+def test_alias_lookup_and_contains():
+    o = Order(order_id=7, symbol="BTC", side="long", price=1.0, size=2.0, client_id="0xabc")
+    assert o["oid"] == 7 and o.get("cloid") == "0xabc" and o.oid == 7
+    assert "order_id" in o and "oid" not in o  # 조회 전용 별칭은 키 목록에 없음
+    assert "raw" not in o and o.get("raw") is None
+    assert list(o) == ["order_id", "symbol", "side", "price", "size", "direction", "client_id"]
+
+def test_hl_legacy_keys():
+    p = HLPosition(symbol="ETH", size=1.0, side="short", entry_price=2000.0, unrealized_pnl=-3.0, leverage=5, raw={"coin": "ETH"})
+    for k in ("coin", "entry_px", "upnl", "lev_value"):
+        assert k in p
+    assert "liq_px" not in p  # 대상 필드가 비어 있으면 예전 키도 없음
+    assert p["entry_px"] == 2000.0 and p.get("upnl") == -3.0 and p["coin"] == "ETH"
+    d = json.loads(json.dumps(p.to_dict()))
+    assert d["entry_px"] == d["entry_price"] == 2000.0 and d["lev_value"] == 5
+    assert "raw" not in d
+
+def test_legacy_side_kept_with_direction():
+    o = Order(order_id="1", symbol="SOL", side="ask", price=10, size=1, id="1", quantity=1)
+    assert o["side"] == "ask" and o["direction"] == "short"
+    assert o["id"] == "1" and o["quantity"] == 1
+    assert normalize_side("BUY") == "long" and normalize_side("bid") == "long" and normalize_side(None) is None
+
+def test_item_assignment_and_dict_compat():
+    p = Position(entry_price=1.0, unrealized_pnl=0.0, side="long", size=1.0)
+    p["size"] = 2.0
+    p["note"] = "x"
+    assert p.size == 2.0 and p["note"] == "x"
+    del p["note"]
+    assert "note" not in p
+    assert p == dict(p) and dict(p) == p
+    assert {**p}["size"] == 2.0
+    assert p.to_dict() == {"entry_price": 1.0, "unrealized_pnl": 0.0, "side": "long", "size": 2.0, "direction": "long"}
+
+def test_pickle_and_copy():
+    raw = {"szi": "1"}
+    p = HLPosition(symbol="BTC", size=1.0, side="long", entry_price=1.0, unrealized_pnl=0.0, raw=raw)
+    q = pickle.loads(pickle.dumps(p))
+    assert type(q) is HLPosition and q == p and q.raw == raw
+    c = p.copy()
+    assert c == p and c is not p and c.raw is raw
+    r = p.replace(size=3.0)
+    assert r.size == 3.0 and p.size == 1.0
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
@@ -3,6 +3,8 @@ import time
 import uuid
 import nacl.signing
 import aiohttp
+from mpdex.utils.common_http import new_session
+from mpdex.utils.records import Collateral, Position
 from multi_perp_dex import MultiPerpDex, MultiPerpDexMixin
 
 class BackpackExchange(MultiPerpDexMixin, MultiPerpDex):
@@ -11,13 +13,45 @@ class BackpackExchange(MultiPerpDexMixin, MultiPerpDex):
         self.PRIVATE_KEY = secret_key #SECRET_TRADING
         self.BASE_URL = "https://api.backpack.exchange/api/v1"
         self.COLLATERAL_SYMBOL = 'USDC'
+        # [ADDED] 서명키는 인스턴스당 1회만 생성 (매 요청마다 b64decode + SigningKey 생성 방지)
+        self._signing_key = nacl.signing.SigningKey(base64.b64decode(secret_key))
+        # [ADDED] 서명 문자열/헤더의 고정 부분 사전 계산
+        self.WINDOW = "5000"
+        self._window_suffix = f"&window={self.WINDOW}"
+        self._instruction_prefix = {}  # instruction_type -> "instruction={type}&"
+        self._static_headers = {
+            "X-API-KEY": self.API_KEY,
+            "X-WINDOW": self.WINDOW,
+        }
 
     def _generate_signature(self, instruction):
-        private_key_bytes = base64.b64decode(self.PRIVATE_KEY)
-        signing_key = nacl.signing.SigningKey(private_key_bytes)
-        signature = signing_key.sign(instruction.encode())
+        signature = self._signing_key.sign(instruction.encode())
         return base64.b64encode(signature.signature).decode()
 
+    def _signing_string(self, instruction_type, params, timestamp):
+        prefix = self._instruction_prefix.get(instruction_type)
+        if prefix is None:
+            prefix = self._instruction_prefix[instruction_type] = f"instruction={instruction_type}&"
+        if params:
+            sorted_data = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+            return f"{prefix}{sorted_data}&timestamp={timestamp}{self._window_suffix}"
+        return f"{prefix}timestamp={timestamp}{self._window_suffix}"
+
+    def _signed_headers(self, instruction_type, params=None, json_body=False):
+        """
+        instruction={type}&{sorted k=v}&timestamp={ts}&window=5000 형식으로 서명한 헤더 반환
+        """
+        timestamp = str(int(time.time() * 1000))
+        signature = self._generate_signature(self._signing_string(instruction_type, params, timestamp))
+        headers = {
+            **self._static_headers,
+            "X-SIGNATURE": signature,
+            "X-TIMESTAMP": timestamp,
+        }
+        if json_body:
+            headers["Content-Type"] = "application/json; charset=utf-8"
+        return headers
+
     def _format_number(self, n):
         if isinstance(n, float):
             if n.is_integer():
@@ -47,11 +81,20 @@ class BackpackExchange(MultiPerpDexMixin, MultiPerpDex):
         ]
 
     async def get_mark_price(self,symbol):
-        async with aiohttp.ClientSession() as session:
+        async with new_session("backpack") as session:
             res = await self._get_mark_prices(session, symbol)
             price = res[0]['markPrice']
             return price
 
+    async def get_mark_prices(self, symbols):
+        # /markPrices 를 symbol 없이 호출하면 전 종목 반환 → 1회 요청
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        async with new_session("backpack") as session:
+            res = await self._get_mark_prices(session, None)
+        by_symbol = {it.get('symbol'): it.get('markPrice') for it in (res or []) if isinstance(it, dict)}
+        return {s: by_symbol.get(s) for s in symbols}
+
     async def create_order(self, symbol, side, amount, price=None, order_type='market'):
         if price != None:
             order_type = 'limit'
@@ -62,7 +105,7 @@ class BackpackExchange(MultiPerpDexMixin, MultiPerpDex):
         
         side = 'Bid' if side.lower() == 'buy' else 'Ask'
 
-        async with aiohttp.ClientSession() as session:
+        async with new_session("backpack") as session:
             market_info = await self._get_market_info(session, symbol)
             tick_size = float(market_info['filters']['price']['tickSize'])
             step_size = float(market_info['filters']['quantity']['stepSize'])
@@ -73,10 +116,6 @@ class BackpackExchange(MultiPerpDexMixin, MultiPerpDex):
             if order_type == "Limit":
                 price = round(round(float(price) / tick_size) * tick_size, len(str(tick_size).split('.')[-1]))
 
-            timestamp = str(int(time.time() * 1000))
-            window = "5000"
-            instruction_type = "orderExecute"
-
             order_data = {
                 "clientId": client_id,
                 "orderType": order_type,
@@ -87,36 +126,15 @@ class BackpackExchange(MultiPerpDexMixin, MultiPerpDex):
             if order_type == "Limit":
                 order_data["price"] = self._format_number(price)
 
-            sorted_data = "&".join(f"{k}={v}" for k, v in sorted(order_data.items()))
-            signing_string = f"instruction={instruction_type}&{sorted_data}&timestamp={timestamp}&window={window}"
-            signature = self._generate_signature(signing_string)
-
-            headers = {
-                "X-API-KEY": self.API_KEY,
-                "X-SIGNATURE": signature,
-                "X-TIMESTAMP": timestamp,
-                "X-WINDOW": window,
-                "Content-Type": "application/json; charset=utf-8"
-            }
+            headers = self._signed_headers("orderExecute", order_data, json_body=True)
 
             async with session.post(f"{self.BASE_URL}/order", json=order_data, headers=headers) as resp:
                 return self.parse_orders(await resp.json())
 
     async def get_position(self, symbol):
-        timestamp = str(int(time.time() * 1000))
-        window = "5000"
-        instruction_type = "positionQuery"
-        signing_string = f"instruction={instruction_type}&timestamp={timestamp}&window={window}"
-        signature = self._generate_signature(signing_string)
-
-        headers = {
-            "X-API-KEY": self.API_KEY,
-            "X-SIGNATURE": signature,
-            "X-TIMESTAMP": timestamp,
-            "X-WINDOW": window
-        }
+        headers = self._signed_headers("positionQuery")
 
-        async with aiohttp.ClientSession() as session:
+        async with new_session("backpack") as session:
             async with session.get(f"{self.BASE_URL}/position", headers=headers) as resp:
                 positions = await resp.json()
                 for pos in positions:
@@ -136,38 +154,27 @@ class BackpackExchange(MultiPerpDexMixin, MultiPerpDex):
         # # That quantity is the amount that's been extracted out of the position and settled into physical USDC.
         unrealized_pnl = position['pnlRealized'] # here is different from other exchanges
         
-        return {
-            "entry_price": entry_price,
-            "unrealized_pnl": unrealized_pnl,
-            "side": side,
-            "size": size
-        }
+        return Position(
+            entry_price=entry_price,
+            unrealized_pnl=unrealized_pnl,
+            side=side,
+            size=size,
+            raw=position,
+        )
         
     async def get_collateral(self):
-        timestamp = str(int(time.time() * 1000))
-        window = "5000"
-        instruction_type = "collateralQuery"
-        
-        signing_string = f"instruction={instruction_type}&timestamp={timestamp}&window={window}"
-        
-        signature = self._generate_signature(signing_string)
+        headers = self._signed_headers("collateralQuery")
 
-        headers = {
-            "X-API-KEY": self.API_KEY,
-            "X-SIGNATURE": signature,
-            "X-TIMESTAMP": timestamp,
-            "X-WINDOW": window
-        }
-
-        async with aiohttp.ClientSession() as session:
+        async with new_session("backpack") as session:
             async with session.get(f"{self.BASE_URL}/capital/collateral", headers=headers) as resp:
                 return self.parse_collateral(await resp.json())
                 
     def parse_collateral(self,collateral):
-        coll_return = {
-            'available_collateral':round(float(collateral['netEquityAvailable']),2),
-            'total_collateral':round(float(collateral['assetsValue']),2),
-        }
+        coll_return = Collateral(
+            available_collateral=round(float(collateral['netEquityAvailable']),2),
+            total_collateral=round(float(collateral['assetsValue']),2),
+            raw=collateral,
+        )
         return coll_return
 
     async def _get_mark_prices(self, session, symbol):
@@ -176,7 +183,7 @@ class BackpackExchange(MultiPerpDexMixin, MultiPerpDex):
         """
         url = f"{self.BASE_URL}/markPrices"
         headers = {"Content-Type": "application/json; charset=utf-8"}
-        params = {"symbol": symbol}
+        params = {"symbol": symbol} if symbol else None
         async with session.get(url, headers=headers, params=params) as resp:
             return await resp.json()
     
@@ -192,45 +199,21 @@ class BackpackExchange(MultiPerpDexMixin, MultiPerpDex):
     
     async def cancel_orders(self, symbol, positions=None):
         # do not use positions, just made it for pass the func
-        async with aiohttp.ClientSession() as session:
-            timestamp = str(int(time.time() * 1000))
-            window = "5000"
-            instruction_type = "orderCancelAll"
+        async with new_session("backpack") as session:
             order_data = {"symbol": symbol}
-            sorted_data = "&".join(f"{k}={v}" for k, v in sorted(order_data.items()))
-            signing_string = f"instruction={instruction_type}&{sorted_data}&timestamp={timestamp}&window={window}"
-            signature = self._generate_signature(signing_string)
-            headers = {
-                "X-API-KEY": self.API_KEY,
-                "X-SIGNATURE": signature,
-                "X-TIMESTAMP": timestamp,
-                "X-WINDOW": window,
-                "Content-Type": "application/json; charset=utf-8"
-            }
+            headers = self._signed_headers("orderCancelAll", order_data, json_body=True)
             async with session.delete(f"{self.BASE_URL}/orders", headers=headers, json=order_data) as response:
                 return self.parse_orders(await response.json())
     
     async def get_open_orders(self, symbol):
-        async with aiohttp.ClientSession() as session:
-            timestamp = str(int(time.time() * 1000))
-            window = "5000"
-            instruction_type = "orderQueryAll"
+        async with new_session("backpack") as session:
             market_type = "PERP"  # 🔹 중요: PERP 마켓 지정
 
             params = {
                 "marketType": market_type,
                 "symbol": symbol
             }
-            sorted_data = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
-            signing_string = f"instruction={instruction_type}&{sorted_data}&timestamp={timestamp}&window={window}"
-            signature = self._generate_signature(signing_string)
-
-            headers = {
-                "X-API-KEY": self.API_KEY,
-                "X-SIGNATURE": signature,
-                "X-TIMESTAMP": timestamp,
-                "X-WINDOW": window
-            }
+            headers = self._signed_headers("orderQueryAll", params)
 
             url = f"{self.BASE_URL}/orders"
 
@@ -1,6 +1,7 @@
 from multi_perp_dex import MultiPerpDex, MultiPerpDexMixin
 import time
 import aiohttp
+from mpdex.utils.common_http import new_session
 import uuid
 import hashlib
 from eth_hash.auto import keccak  # 꼭 이걸 써야 함
@@ -8,16 +9,21 @@ from starkware.crypto.signature.fast_pedersen_hash import pedersen_hash
 from starkware.crypto.signature.signature import sign, ec_mult, verify, ALPHA, FIELD_PRIME, EC_GEN
 from decimal import Decimal, ROUND_HALF_UP, ROUND_DOWN
 import asyncio
+from mpdex.utils.orderbook import L2Book, impact_limit_price
+from mpdex.utils.records import Collateral, Position
 
 class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
-    def __init__(self,account_id,private_key):
+    def __init__(self,account_id,private_key,*,book_pricing=False):
         self.base_url = 'https://pro.edgex.exchange'
         self.account_id = account_id
         self.private_key_hex = private_key.replace("0x", "")
                 
         self.K_MODULUS = int("0800000000000010ffffffffffffffffb781126dcae7b2321e66a241adc64d2f", 16)
         self.market_info = {}  # symbol → metadata
+        self._contract_id_to_symbol = {}  # [ADDED] str(contractId) → symbol (역방향 O(1) 조회)
         self.usdt_coin_id = '1000'
+        # [ADDED] 시장가 주문의 서명 가격을 오더북 impact 가격으로(oracle ×1.1/0.9 로 상한)
+        self.book_pricing = book_pricing
     
     async def init(self):
         await self.get_meta_data()
@@ -30,7 +36,7 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
     
     async def get_meta_data(self):
         url = f"{self.base_url}/api/v1/public/meta/getMetaData"
-        async with aiohttp.ClientSession() as session:
+        async with new_session("edgex") as session:
             async with session.get(url) as resp:
                 if resp.status != 200:
                     #print(f"[get_meta_data] HTTP {resp.status}")
@@ -40,11 +46,13 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
                 meta = data
                 contract_list = data.get("contractList", [])
 
+                # [CHANGED] 새 dict 에 만든 뒤 한 번에 교체 → 조회 중에도 정/역방향 인덱스가 항상 일치
+                market_info = {}
                 for contract in contract_list:
                     name = contract["contractName"]
                     if "TEMP" in name:
                         continue
-                    self.market_info[name] = {
+                    market_info[name] = {
                         "contract": contract,
                         "meta": meta,
                         "contractId": contract["contractId"],
@@ -54,6 +62,8 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
                         "maxOrderSize": contract["maxOrderSize"],
                         "defaultTakerFeeRate": contract["defaultTakerFeeRate"],
                     }
+                self.market_info = market_info
+                self._contract_id_to_symbol = {str(v["contractId"]): k for k, v in market_info.items()}
 
                 return contract_list
     
@@ -85,7 +95,7 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
         contract_info = self.market_info[symbol]
         contract_id = contract_info['contractId']
         oracle_url = f"{self.base_url}/api/v1/public/quote/getTicker"
-        async with aiohttp.ClientSession() as session:
+        async with new_session("edgex") as session:
             async with session.get(oracle_url, params={"contractId": contract_id}) as resp:
                 ticker_data = await resp.json()
                 last_price = Decimal(ticker_data["data"][0]["lastPrice"])
@@ -105,13 +115,21 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
 
         # Oracle price fetch
         oracle_url = f"{self.base_url}/api/v1/public/quote/getTicker"
-        async with aiohttp.ClientSession() as session:
+        async with new_session("edgex") as session:
             async with session.get(oracle_url, params={"contractId": contract_id}) as resp:
                 ticker_data = await resp.json()
                 oracle_price = Decimal(ticker_data["data"][0]["oraclePrice"])
 
         # Price calculation
-        if order_type.upper() == 'MARKET':
+        if order_type.upper() == 'MARKET' and self.book_pricing:
+            # [ADDED] 오더북을 amount 만큼 쓸었을 때 가격(+buffer) → 실패/깊이 부족 시 기존 ±10%
+            try:
+                book = await self._get_l2book(symbol)
+            except Exception:
+                book = None
+            px = impact_limit_price(book, side.lower(), float(amount), ref_px=float(oracle_price), max_slippage=0.1)
+            price = Decimal(str(px)).quantize(tick_size, rounding=ROUND_HALF_UP)
+        elif order_type.upper() == 'MARKET':
             if side.upper() == 'BUY':
                 price = oracle_price * Decimal("1.1")
                 price = price.quantize(tick_size, rounding=ROUND_HALF_UP)
@@ -187,7 +205,7 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
         path = "/api/v1/private/order/createOrder"
         signature, ts = self.generate_signature(method, path, body)
 
-        async with aiohttp.ClientSession() as session:
+        async with new_session("edgex") as session:
             async with session.post(
                 url=f"{self.base_url}{path}",
                 json=body,
@@ -200,6 +218,29 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
             ) as resp:
                 return await resp.json()
 
+    async def _get_l2book(self, symbol, level: int = 15):
+        # level: 15 또는 200
+        contract_id = self.market_info[symbol]['contractId']
+        url = f"{self.base_url}/api/v1/public/quote/getDepth"
+        async with new_session("edgex") as session:
+            async with session.get(url, params={"contractId": contract_id, "level": level}) as resp:
+                res = await resp.json()
+        data = res.get("data") or []
+        if not data:
+            return None
+        depth = data[0]
+        book = L2Book(symbol)
+        book.apply_snapshot(depth.get("bids") or [], depth.get("asks") or [])
+        return book
+
+    async def get_orderbook(self, symbol, depth: int = 15):
+        """{"symbol", "bids": [[px, sz], ...], "asks": [[px, sz], ...], "ts"} | None"""
+        try:
+            book = await self._get_l2book(symbol, 15 if depth <= 15 else 200)
+        except Exception:
+            return None
+        return book.snapshot(depth) if book is not None else None
+
     def parse_position(self, position_list,position_asset_list, symbol):
         contract_id = self.market_info[symbol]['contractId']
         
@@ -220,12 +261,12 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
         if size == 0:
             return None        
         
-        return {
-            "entry_price": float(entry_price),
-            "unrealized_pnl": round(float(unrealized_pnl),2),
-            "side": side,
-            "size": size
-        }
+        return Position(
+            entry_price=float(entry_price),
+            unrealized_pnl=round(float(unrealized_pnl),2),
+            side=side,
+            size=size,
+        )
         
     
     async def get_position(self, symbol):
@@ -248,7 +289,7 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
         else:
             url = f"{self.base_url}{path}"
         
-        async with aiohttp.ClientSession() as session:
+        async with new_session("edgex") as session:
             async with session.get(url, headers=headers) as resp:
                 if resp.status != 200:
                     print(f"[get_position] HTTP {resp.status}")
@@ -282,7 +323,7 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
         else:
             url = f"{self.base_url}{path}"
         
-        async with aiohttp.ClientSession() as session:
+        async with new_session("edgex") as session:
             async with session.get(url, headers=headers) as resp:
                 if resp.status != 200:
                     print(f"[get_position] HTTP {resp.status}")
@@ -297,7 +338,7 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
             if col['coinId'] == self.usdt_coin_id:
                 available_collateral = round(float(col['availableAmount']),2)
                 total_collateral = round(float(col['totalEquity']),2)
-                return {'available_collateral': available_collateral, 'total_collateral': total_collateral}
+                return Collateral(available_collateral=available_collateral, total_collateral=total_collateral, raw=col)
             
     async def get_open_orders(self, symbol):
         contract_id = self.market_info[symbol]['contractId']
@@ -319,7 +360,7 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
         query_str = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
         url = f"{self.base_url}{path}?{query_str}"
 
-        async with aiohttp.ClientSession() as session:
+        async with new_session("edgex") as session:
             async with session.get(url, headers=headers) as resp:
                 if resp.status != 200:
                     #print(f"[get_open_orders] HTTP {resp.status}")
@@ -348,10 +389,7 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
         ]
         
     def _get_symbol_from_contract_id(self, contract_id):
-        for symbol, info in self.market_info.items():
-            if info.get("contractId") == contract_id:
-                return symbol
-        return None  # 없을 경우 None 반환 (혹은 raise 예외)
+        return self._contract_id_to_symbol.get(str(contract_id))  # 없을 경우 None 반환
 
     async def cancel_orders(self, symbol, open_orders = None):
         if open_orders is None:
@@ -386,7 +424,7 @@ class EdgexExchange(MultiPerpDexMixin, MultiPerpDex):
             "orderIdList": order_ids
         }
 
-        async with aiohttp.ClientSession() as session:
+        async with new_session("edgex") as session:
             async with session.post(f"{self.base_url}{path}", json=body, headers=headers) as resp:
                 if resp.status != 200:
                     print(f"[cancel_orders] HTTP {resp.status}")
@@ -1,4 +1,5 @@
 from multi_perp_dex import MultiPerpDex, MultiPerpDexMixin
+from mpdex.utils.records import Collateral, Order, Position
 from pysdk.grvt_ccxt_pro import GrvtCcxtPro
 from pysdk.grvt_ccxt_env import GrvtEnv
 import logging
@@ -65,12 +66,13 @@ class GrvtExchange(MultiPerpDexMixin, MultiPerpDex):
         unrealized_pnl = pos['unrealized_pnl']
         side = 'short' if '-' in pos['size'] else 'long'
         size = pos['size'].replace('-','')
-        return {
-            "entry_price": entry_price,
-            "unrealized_pnl": unrealized_pnl,
-            "side": side,
-            "size": size
-        }
+        return Position(
+            entry_price=entry_price,
+            unrealized_pnl=unrealized_pnl,
+            side=side,
+            size=size,
+            raw=pos,
+        )
     
     async def get_position(self, symbol):
         try:
@@ -101,10 +103,10 @@ class GrvtExchange(MultiPerpDexMixin, MultiPerpDex):
             available_collateral = None
             total_collateral = None
             
-        return {
-            "available_collateral": available_collateral,
-            "total_collateral": total_collateral
-        }
+        return Collateral(
+            available_collateral=available_collateral,
+            total_collateral=total_collateral,
+        )
     
     async def close_position(self, symbol, position):
         return await super().close_position(symbol, position)
@@ -118,8 +120,18 @@ class GrvtExchange(MultiPerpDexMixin, MultiPerpDex):
         parsed = []
         for order in orders:
             order_id = order['order_id']
-            symbol = order['legs'][0]['instrument']
-            parsed.append({"order_id": order_id, "symbol": symbol})
+            leg = order['legs'][0]
+            symbol = leg['instrument']
+            is_buy = leg.get('is_buying_asset')
+            parsed.append(Order(
+                order_id=order_id,
+                symbol=symbol,
+                side=None if is_buy is None else ('long' if is_buy else 'short'),
+                price=leg.get('limit_price'),
+                size=leg.get('size'),
+                client_id=(order.get('metadata') or {}).get('client_order_id'),
+                raw=order,
+            ))
         return parsed
     
     async def get_open_orders(self, symbol):
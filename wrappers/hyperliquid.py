@@ -1,11 +1,17 @@
 from multi_perp_dex import MultiPerpDex, MultiPerpDexMixin
 from .hyperliquid_ws_client import HLWSClientRaw, WS_POOL
-from mpdex.utils.common_hyperliquid import parse_hip3_symbol, round_to_tick, format_price, format_size
+from mpdex.utils.common_hyperliquid import parse_hip3_symbol, round_to_tick, format_price, format_size, get_nonce_allocator, INFO_FLIGHT, info_key
 import json
 from typing import Dict, Optional, List, Dict, Tuple
 import aiohttp
 from aiohttp import TCPConnector
+from mpdex.utils.common_http import new_session
+from mpdex.utils.ratelimit import PRIORITY_CANCEL, hl_exchange_weight, hl_info_weight
+from mpdex.utils import metrics
+from mpdex.utils.orderbook import L2Book, impact_limit_price
+from mpdex.utils.records import Collateral, Order, Position
 import asyncio
+import logging
 import time
 from eth_account import Account
 from .hl_sign import sign_l1_action as hl_sign_l1_action
@@ -13,8 +19,12 @@ from .hl_sign import sign_l1_action as hl_sign_l1_action
 BASE_URL = "https://api.hyperliquid.xyz"
 BASE_WS = "wss://api.hyperliquid.xyz/ws"
 STABLES = ["USDC","USDT0","USDH"]
+CANCEL_CTX = {"priority": PRIORITY_CANCEL, "weight": 1}  # 취소는 조회보다 먼저 스케줄
 
 class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
+    # 서명만 다른 HL 계열(superstack 등)은 이 클래스를 상속해 _signed_payload 만 교체
+    VENUE = "hyperliquid"
+
     def __init__(self, 
               wallet_address = None,        # required
               wallet_private_key = None,    # optional, required when by_agent = False
@@ -27,6 +37,11 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
               *,
               fetch_by_ws = False, # fetch pos, balance, and price by ws client
               FrontendMarket = False,
+              nonce_lock_dir = None, # 같은 agent 키를 여러 프로세스에서 쓸 때 nonce 조정용 lock 파일 디렉터리
+              info_cache_ttl = 0.0, # /info 결과 재사용 시간(sec). 0이면 동시 요청 합치기만
+              book_pricing = False, # 시장가 주문 가격을 오더북 impact 가격으로 계산(마크 ± slippage 로 상한)
+              ws_max_age = None, # WS 캐시 허용 경과 시간(sec). 초과 시 REST 폴백. None이면 재연결 무효화만 적용
+              meta_refresh_s = None, # 메타(perp/spot/dex) 주기 재조회 간격(sec). 신규 상장을 재시작 없이 반영. None/0이면 끔
               # ws_client = None, # ws client가 외부에서 생성됐으면 그걸 사용, acquire 알고리즘으로 불필요
               # ws_client의 경우 WS_POOL 하나를 공유
               # signing_method = None, # special case: superstack, tread.fi, 분리?
@@ -68,6 +83,14 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         self.perp_asset_map: Dict[str, Tuple[int, int]] = {}
 
         self._http =  None
+        self.info_cache_ttl = float(info_cache_ttl or 0.0)
+        self.book_pricing = book_pricing
+        self.ws_max_age = ws_max_age
+
+        # [ADDED] 메타 주기 갱신(신규 상장 반영). 백그라운드 루프가 meta_refresh_s 마다 refresh_meta 호출
+        self.meta_refresh_s = float(meta_refresh_s or 0.0)
+        self._meta_refreshed_at: float = 0.0
+        self._meta_task: Optional[asyncio.Task] = None
 
         # WS 관련 내부 상태
         self.ws_client: Optional[HLWSClientRaw] = None  # WS_POOL에서
@@ -76,6 +99,11 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         self._ws_init_lock = asyncio.Lock()             # comment: create_ws_client 중복 호출 방지
         self.fetch_by_ws = fetch_by_ws
         self.FrontendMarket = FrontendMarket
+
+        # [ADDED] 서명 지갑/nonce 발급기 캐시 (nonce_lock_dir 지정 시 프로세스 간 nonce 조정)
+        self.nonce_lock_dir = nonce_lock_dir
+        self._signer_wallet = None
+        self._nonce_alloc = None
         #self.signing_method = signing_method
 
     def _get_builder_code(self, builder_code:str = None):
@@ -167,15 +195,32 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
     
     def _session(self) -> aiohttp.ClientSession:
         if self._http is None or self._http.closed:
-            self._http = aiohttp.ClientSession(
-                connector=TCPConnector(
-                    force_close=True,             # 매 요청 후 소켓 닫기 → 종료 시 잔여 소켓 최소화
-                    enable_cleanup_closed=True,   # 종료 중인 SSL 소켓 정리 보조 (로그 억제)
-                )
-            )
+            self._http = new_session(self.VENUE, force_close=True)
         return self._http
     
+    async def _post_info(self, payload: dict, *, ttl: Optional[float] = None):
+        """
+        POST {http_base}/info.
+        - 같은 payload 동시 요청은 1회로 합침(single-flight, 인스턴스 간 공유)
+        - ttl(기본 self.info_cache_ttl, 0=끔) 동안 결과 재사용
+        반환 객체는 호출자끼리 공유되므로 수정하지 말 것.
+        """
+        url = f"{self.http_base}/info"
+
+        async def _fetch():
+            s = self._session()
+            # 레이트리밋 weight: HL 요청 타입별 실제 weight(경량 타입 2, 그 외 20)
+            async with s.post(url, json=payload, headers={"Content-Type": "application/json"},
+                              trace_request_ctx={"weight": hl_info_weight(payload)}) as r:
+                return await r.json()
+
+        return await INFO_FLIGHT.do(
+            info_key(self.http_base, payload), _fetch,
+            ttl=self.info_cache_ttl if ttl is None else float(ttl),
+        )
+
     async def close(self):
+        await self.stop_meta_refresher()
         # HTTP 세션 종료 + WS 풀 release
         if self._http and not self._http.closed:
             await self._http.close()
@@ -218,7 +263,96 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         if self.fetch_by_ws:
             await self.create_ws_client()
 
+        self._meta_refreshed_at = time.time()
+        if self.meta_refresh_s > 0:
+            self.start_meta_refresher()
+
         return self
+
+    # ---------------------- 메타 주기 갱신 ----------------------
+
+    async def refresh_meta(self) -> Dict[str, list]:
+        """
+        spotMeta / perpDexs / allPerpMetas 를 다시 읽어 신규 상장을 반영(재시작 불필요).
+        - 조회 실패 항목은 기존 맵 유지
+        - WS_POOL 의 모든 클라이언트 라우팅 맵 교체 + 보류된 '@{pairIdx}' 가격 재적용
+        - 새 dex 는 allMids 추가 구독(선택 구독 모드 제외)
+        반환: {"perp": 새 perp 키, "spot": 새 스팟 페어, "dex": 새 dex}
+        """
+        old_perp = set(self.perp_asset_map)
+        old_pairs = set((self.spot_asset_index_to_pair or {}).values())
+        old_dex = list(self.dex_list or [])
+
+        try:
+            await self._init_spot_token_map(keep_on_error=True)
+        except Exception:
+            pass
+        try:
+            await self._get_dex_list()
+        except Exception:
+            pass
+        await self._init_perp_meta_cache(force=True)
+
+        self.spot_asset_pair_to_index = {
+            v: k for k, v in (self.spot_asset_index_to_pair or {}).items()
+        }
+        await WS_POOL.refresh_shared_meta(
+            dex_order=self.dex_list or ["hl"],
+            idx2name=self.spot_index_to_name or {},
+            name2idx=self.spot_name_to_index or {},
+            pair_by_index=self.spot_asset_index_to_pair or {},
+            bq_by_index=self.spot_asset_index_to_bq or {},
+        )
+
+        new_dex = [d for d in (self.dex_list or []) if d not in old_dex]
+        client = self.ws_client
+        if client is not None and not getattr(client, "selective", False):
+            for d in new_dex:
+                try:
+                    await client.ensure_allmids_for(d)
+                except Exception:
+                    pass
+
+        self._meta_refreshed_at = time.time()
+        return {
+            "perp": sorted(set(self.perp_asset_map) - old_perp),
+            "spot": sorted(set((self.spot_asset_index_to_pair or {}).values()) - old_pairs),
+            "dex": new_dex,
+        }
+
+    async def _meta_refresh_loop(self) -> None:
+        # 마지막 갱신 시각 기준으로 대기(수동 refresh_meta 호출도 주기에 반영)
+        while True:
+            try:
+                wait = self._meta_refreshed_at + self.meta_refresh_s - time.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                await self.refresh_meta()
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                logging.warning(f"[{self.VENUE}] meta refresh failed: {e}")
+                await asyncio.sleep(min(60.0, self.meta_refresh_s))
+
+    def start_meta_refresher(self) -> None:
+        if self.meta_refresh_s <= 0:
+            return
+        if self._meta_task is not None and not self._meta_task.done():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # 루프 밖에서는 시작하지 않음(init 에서 다시 호출)
+        self._meta_task = asyncio.create_task(self._meta_refresh_loop(), name=f"{self.VENUE}-meta-refresh")
+
+    async def stop_meta_refresher(self) -> None:
+        task, self._meta_task = self._meta_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
     
     async def _init_perp_meta_cache(self, force: bool = False) -> None:
         """
@@ -238,12 +372,16 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         except Exception:
             metas = []
 
+        # [CHANGED] 재조회(force) 실패 시 기존 맵 유지
+        if not (isinstance(metas, list) and metas) and self.perp_asset_map:
+            return
+
         # 원본 저장
-        self.perp_metas_raw = metas if isinstance(metas, list) else []
-        # 맵 재구축
-        self.perp_asset_map.clear()
+        metas = metas if isinstance(metas, list) else []
+        # 맵 재구축(새 dict 를 만든 뒤 교체 → 조회 중인 코루틴은 이전/새 맵 중 하나만 봄)
+        asset_map: Dict[str, Tuple[int, int]] = {}
 
-        for meta_idx, meta in enumerate(self.perp_metas_raw):
+        for meta_idx, meta in enumerate(metas):
             uni = (meta or {}).get("universe") or []
             for local_idx, a in enumerate(uni):
                 if not isinstance(a, dict):
@@ -265,8 +403,10 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
                     key = name                         # HIP-3: 'dex:COIN'
                     asset_id = 100000 + meta_idx * 10000 + local_idx
 
-                self.perp_asset_map[key] = (asset_id, szd)
+                asset_map[key] = (asset_id, szd)
 
+        self.perp_metas_raw = metas
+        self.perp_asset_map = asset_map
         self._perp_meta_inited = True
     
     # 캐시 조회로 변경
@@ -300,7 +440,17 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
             raise RuntimeError(f"asset index not found for {raw}")
         return int(asset_id)
 
-    def _sign_hl_action(self, action: dict) -> tuple[int, dict]:
+    async def _signed_payload(self, action: dict) -> dict:
+        """
+        /exchange 에 보낼 {"action","nonce","signature"} 생성(서명 전략).
+        기본은 로컬 키 서명. 원격 지갑 서비스 등으로 서명하는 venue 는 override.
+        """
+        self._hl_signer_wallet()
+        nonce = await self._nonce_alloc.anext()  # 시계보다 너무 앞서면 루프를 막지 않고 대기
+        nonce, sig = self._sign_hl_action(action, nonce)
+        return {"action": action, "nonce": nonce, "signature": sig}
+
+    def _hl_signer_wallet(self):
         if not self.wallet_address or not self.wallet_address.startswith("0x"):
             raise RuntimeError("wallet_address(0x...)가 필요합니다.")
         
@@ -312,13 +462,21 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
             if not self.wallet_private_key:
                 raise RuntimeError("wallet_private_key가 필요합니다(EOA 서명).")
             
-        nonce = int(time.time() * 1000)
-        if self.by_agent:
-            priv = self.agent_api_private_key[2:] if self.agent_api_private_key.startswith("0x") else self.agent_api_private_key
-        else:
-            priv = self.wallet_private_key[2:] if self.wallet_private_key.startswith("0x") else self.wallet_private_key
-            
-        wallet = Account.from_key(bytes.fromhex(priv))
+        # [CHANGED] 서명 지갑은 인스턴스당 1회 생성, nonce 는 서명 주소 단위 단조 증가 발급기 사용
+        wallet = self._signer_wallet
+        if wallet is None:
+            if self.by_agent:
+                priv = self.agent_api_private_key[2:] if self.agent_api_private_key.startswith("0x") else self.agent_api_private_key
+            else:
+                priv = self.wallet_private_key[2:] if self.wallet_private_key.startswith("0x") else self.wallet_private_key
+            wallet = self._signer_wallet = Account.from_key(bytes.fromhex(priv))
+            self._nonce_alloc = get_nonce_allocator(wallet.address, self.nonce_lock_dir)
+        return wallet
+
+    def _sign_hl_action(self, action: dict, nonce: Optional[int] = None) -> tuple[int, dict]:
+        wallet = self._hl_signer_wallet()
+        if nonce is None:
+            nonce = self._nonce_alloc.next()
         is_mainnet = True  # BASE_URL 고정 환경
         sig = hl_sign_l1_action(wallet, action, self.vault_address, nonce, None, is_mainnet)
         return nonce, sig
@@ -413,12 +571,13 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
                     order.append(k); seen.add(k)
         self.dex_list = order
 
-    async def _init_spot_token_map(self):
+    async def _init_spot_token_map(self, *, keep_on_error: bool = False):
         """
         REST info(spotMeta)를 통해
         - 토큰 인덱스 <-> 이름(USDC, PURR, ...) 맵
         - 스팟 페어 인덱스(spotInfo.index) <-> 'BASE/QUOTE' 및 (BASE, QUOTE) 맵
         을 1회 로드/갱신한다.
+        keep_on_error=True(주기 갱신): 응답이 비정상이면 기존 맵 유지
         """
 
         url = f"{self.http_base}/info"
@@ -431,6 +590,8 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
             try:
                 resp = await r.json()
             except aiohttp.ContentTypeError:
+                if keep_on_error:
+                    return
                 # 실패 시 빈 맵으로 초기화하고 반환
                 self.spot_index_to_name = {}
                 self.spot_name_to_index = {}
@@ -441,6 +602,8 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         
         # 안전 가드: dict 응답인지 확인
         if not isinstance(resp, dict):
+            if keep_on_error:
+                return
             self.spot_index_to_name = {}
             self.spot_name_to_index = {}
             self.spot_asset_index_to_pair = {}
@@ -450,6 +613,8 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         
         tokens = (resp or {}).get("tokens") or []
         universe = (resp or {}).get("universe") or (resp or {}).get("spotInfos") or []
+        if keep_on_error and not (tokens and universe):
+            return
 
         # 1) 토큰 맵(spotMeta.tokens[].index -> name)
         idx2name: Dict[int, str] = {}
@@ -588,16 +753,16 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
                 pair_by_index=self.spot_asset_index_to_pair or {},
                 bq_by_index=self.spot_asset_index_to_bq or {},
             )
-            # 추가 DEX 구독
+            # 추가 DEX 구독 (선택 구독 모드면 코인별로 필요할 때만)
             for dex in (self.dex_list or []):
-                if dex != "hl":
+                if dex != "hl" and not getattr(client, "selective", False):
                     await client.ensure_allmids_for(dex)
 
             self.ws_client = client
             self._ws_pool_key = (self.ws_base, (address or "").lower())
             return self.ws_client
 
-    async def create_order(
+    async def _prepare_order(
         self,
         symbol,
         side,
@@ -610,12 +775,10 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         tif: Optional[str] = None,
         client_id: Optional[str] = None,
         slippage: Optional[float] = 0.05
-    ):
+    ) -> Tuple[dict, Optional[int]]:
         """
-        HL REST 주문(Perp/Spot 겸용).
-        - price=None → 시장가(FrontendMarket), price 지정 → 지정가(Gtc 기본)
-        - HIP-3(dex:COIN) 자동 처리, Spot 주문 지원
-        반환: {"id": "<oid>", "info": <원문응답>}
+        주문 1건을 HL order wire({"a","b","p","s","r","t"[,"c"]})로 변환.
+        반환: (order_obj, builder fee(int|None))
         """
         # 0) 공통
         is_buy = str(side).lower() == "buy"
@@ -638,11 +801,10 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
             if price is None:
                 ord_type = "market"
                 tif_final = "FrontendMarket" if self.FrontendMarket else (tif or "Gtc")
-                base_px = await self.get_mark_price(pair, is_spot=True)
-                if base_px is None:
+                base_px, eff = await self._market_order_px(pair, is_buy, amount, slippage, is_spot=True)
+                if eff is None:
                     price_str = "0"
                 else:
-                    eff = float(base_px) * (1.0 + slippage) if is_buy else float(base_px) * (1.0 - slippage)
                     d_tick = round_to_tick(eff, tick_decimals, up=is_buy)
                     price_str = format_price(float(d_tick), tick_decimals)
                     if not price_str:
@@ -668,36 +830,8 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
             if client_id:
                 order_obj["c"] = str(client_id)
 
-            action_type = "order" # same as perp
-
-            # 빌더
-            if self.builder_code:
-                fee_int = self._pick_builder_fee_int(None, ord_type)   # spot은 공통/기본 룰
-                builder_payload = {"b": str(self.builder_code).lower()}
-                if isinstance(fee_int, int):
-                    builder_payload["f"] = int(fee_int)
-                action = {"type": action_type, "orders": [order_obj], "grouping": "na", "builder": builder_payload}
-            else:
-                action = {"type": action_type, "orders": [order_obj], "grouping": "na"}
-
-            
-            # 서명/전송
-            nonce, sig = self._sign_hl_action(action)
-            payload = {"action": action, "nonce": nonce, "signature": sig}
-            if self.vault_address:
-                payload["vaultAddress"] = self.vault_address
-
-            #print('debug',order_obj,payload)
-            url = f"{self.http_base}/exchange"
-            s = self._session()
-            
-            async with s.post(url, json=payload, headers={"Content-Type": "application/json"}) as r:
-                r.raise_for_status()
-                resp = await r.json()
-            try:
-                return self._extract_order_id(resp) # only id
-            except Exception as e:
-                return str(e)
+            # 빌더 fee: spot은 공통/기본 룰
+            return order_obj, self._pick_builder_fee_int(None, ord_type)
 
         # ---------- Perp 주문 ----------
         dex, coin_key = parse_hip3_symbol(raw)
@@ -709,11 +843,10 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         if price is None:
             ord_type = "market"
             tif_final = "FrontendMarket" if self.FrontendMarket else (tif or "Gtc")
-            base_px = await self.get_mark_price(coin_key, is_spot=False)
-            if base_px is None:
+            base_px, eff = await self._market_order_px(coin_key, is_buy, amount, slippage, is_spot=False)
+            if eff is None:
                 price_str = "0"
             else:
-                eff = float(base_px) * (1.0 + slippage) if is_buy else float(base_px) * (1.0 - slippage)
                 d_tick = round_to_tick(eff, tick_decimals, up=is_buy)
                 price_str = format_price(float(d_tick), tick_decimals)
                 if not price_str:
@@ -737,37 +870,163 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         if client_id:
             order_obj["c"] = str(client_id)
 
-        action = {"type": "order", "orders": [order_obj], "grouping": "na"}
+        return order_obj, self._pick_builder_fee_int(dex, ord_type)
 
+    async def _market_order_px(self, symbol, is_buy, amount, slippage, *, is_spot=False):
+        """
+        시장가 주문에 넣을 지정가. 반환: (마크가|None, 주문가|None)
+        - 기본: 마크 × (1 ± slippage)
+        - book_pricing: 오더북을 amount 만큼 쓸었을 때의 가격(+buffer), 마크 × (1 ± slippage) 로 상한
+          (오더북 조회 실패/깊이 부족 시 기본 방식)
+        """
+        if not self.book_pricing:
+            base_px = await self.get_mark_price(symbol, is_spot=is_spot)
+            if base_px is None:
+                return None, None
+            eff = float(base_px) * (1.0 + slippage) if is_buy else float(base_px) * (1.0 - slippage)
+            return base_px, eff
+
+        base_px, book = await asyncio.gather(
+            self.get_mark_price(symbol, is_spot=is_spot),
+            self._get_l2book(symbol, is_spot=is_spot),
+            return_exceptions=True,
+        )
+        base_px = None if isinstance(base_px, BaseException) else base_px
+        book = None if isinstance(book, BaseException) else book
+        eff = impact_limit_price(
+            book, "buy" if is_buy else "sell", float(amount),
+            ref_px=float(base_px) if base_px is not None else None,
+            max_slippage=slippage,
+        )
+        return base_px, eff
+
+    def _order_action(self, order_objs: List[dict], fees: List[Optional[int]]) -> dict:
+        action = {"type": "order", "orders": list(order_objs), "grouping": "na"}
         if self.builder_code:
-            fee_int = self._pick_builder_fee_int(dex, ord_type)
             builder_payload = {"b": str(self.builder_code).lower()}
-            if isinstance(fee_int, int):
-                builder_payload["f"] = int(fee_int)
+            # builder fee 는 action 단위 → 묶음 주문은 가장 큰 값 적용
+            fee_vals = [int(f) for f in fees if isinstance(f, int)]
+            if fee_vals:
+                builder_payload["f"] = max(fee_vals)
             action["builder"] = builder_payload
-        
-        nonce, sig = self._sign_hl_action(action)
-        payload = {"action": action, "nonce": nonce, "signature": sig}
-        if self.vault_address:
-            payload["vaultAddress"] = self.vault_address
+        return action
 
-        #print('debug',order_obj,payload)
+    async def _post_exchange(self, payload: dict, **kwargs):
         url = f"{self.http_base}/exchange"
         s = self._session()
-        
-        async with s.post(url, json=payload, headers={"Content-Type": "application/json"}) as r:
-            r.raise_for_status()
-            resp = await r.json()
+        # 레이트리밋 weight: 1 + floor(묶음 주문/취소 수 / 40)
+        action = payload.get("action") or {}
+        n = len(action.get("orders") or action.get("cancels") or action.get("modifies") or [])
+        ctx = dict(kwargs.pop("trace_request_ctx", None) or {})
+        ctx.setdefault("weight", hl_exchange_weight(n))
+        kwargs["trace_request_ctx"] = ctx
+        t0 = time.perf_counter()
+        ok = False
+        try:
+            async with s.post(url, json=payload, headers={"Content-Type": "application/json"}, **kwargs) as r:
+                r.raise_for_status()
+                resp = await r.json()
+            ok = True
+            return resp
+        finally:
+            metrics.record(self.VENUE, "hop", "exchange", time.perf_counter() - t0, error=not ok)
+
+    async def _submit_action(self, action: dict, **kwargs):
+        """서명(_signed_payload) → /exchange 전송. 두 구간 시간을 hop 메트릭(sign/exchange)으로 기록."""
+        t0 = time.perf_counter()
+        payload = None
+        try:
+            payload = await self._signed_payload(action)
+        finally:
+            metrics.record(self.VENUE, "hop", "sign", time.perf_counter() - t0, error=payload is None)
+        if self.vault_address:
+            payload["vaultAddress"] = self.vault_address
+        return await self._post_exchange(payload, **kwargs)
+
+    async def create_order(
+        self,
+        symbol,
+        side,
+        amount,
+        price=None,
+        order_type='market',
+        *,
+        is_reduce_only = False,
+        is_spot: bool = False,
+        tif: Optional[str] = None,
+        client_id: Optional[str] = None,
+        slippage: Optional[float] = 0.05
+    ):
+        """
+        HL REST 주문(Perp/Spot 겸용).
+        - price=None → 시장가(FrontendMarket), price 지정 → 지정가(Gtc 기본)
+        - HIP-3(dex:COIN) 자동 처리, Spot 주문 지원
+        반환: {"id": "<oid>", "info": <원문응답>}
+        """
+        order_obj, fee_int = await self._prepare_order(
+            symbol, side, amount, price, order_type,
+            is_reduce_only=is_reduce_only, is_spot=is_spot, tif=tif, client_id=client_id, slippage=slippage,
+        )
+        resp = await self._submit_action(self._order_action([order_obj], [fee_int]))
         try:
             return self._extract_order_id(resp) # only id
         except Exception as e:
             return str(e)
 
+    async def create_orders(self, orders: List[dict]) -> List[Optional[str]]:
+        """
+        여러 주문을 하나의 order action 으로 서명/전송(서명 1회 + /exchange 1회).
+        orders: [{"symbol","side","amount", "price"(opt), "order_type"(opt), "is_reduce_only"(opt), "is_spot"(opt),
+                  "tif"(opt), "client_id"(opt), "slippage"(opt)}, ...]
+        반환: 입력 순서대로 oid(str) 또는 오류 메시지(str)
+        """
+        if not orders:
+            return []
+        prepared = await asyncio.gather(*[
+            self._prepare_order(
+                o["symbol"], o["side"], o["amount"], o.get("price"), o.get("order_type", "market"),
+                is_reduce_only=o.get("is_reduce_only", False), is_spot=o.get("is_spot", False),
+                tif=o.get("tif"), client_id=o.get("client_id"), slippage=o.get("slippage", 0.05),
+            )
+            for o in orders
+        ])
+        action = self._order_action([p[0] for p in prepared], [p[1] for p in prepared])
+        resp = await self._submit_action(action)
+        return self._extract_order_ids(resp, len(orders))
+
+    def _extract_order_ids(self, raw, n: int) -> List[Optional[str]]:
+        # statuses[i] 별로 oid 또는 error 메시지
+        obj = raw[0] if isinstance(raw, list) and raw else raw
+        resp = (obj.get("response") or obj) if isinstance(obj, dict) else {}
+        data = (resp.get("data") or {}) if isinstance(resp, dict) else {}
+        statuses = data.get("statuses") if isinstance(data, dict) else None
+        if not isinstance(statuses, list):
+            # 액션 전체 실패(예: {"status":"err","response":"..."}) → 주문마다 같은 오류 메시지
+            try:
+                oid = self._extract_order_id(raw)
+            except Exception as e:
+                return [str(e)] * n
+            if oid is not None and n == 1:
+                return [oid]
+            if isinstance(obj, dict) and isinstance(obj.get("response"), str) and obj["response"].strip():
+                err = obj["response"].strip()
+            else:
+                err = f"no order statuses in response: {raw}"
+            return [err] * n
+        out: List[Optional[str]] = []
+        for st in statuses:
+            try:
+                out.append(self._extract_order_id({"response": {"data": {"statuses": [st]}}}))
+            except Exception as e:
+                out.append(str(e))
+        # statuses 가 주문 수보다 적으면 빠진 주문은 오류 메시지로 채움
+        return (out + ["missing order status in response"] * n)[:n]
+
     # 포지션 파싱 공통 헬퍼
-    def _parse_position_core(self, pos: dict) -> dict:
+    def _parse_position_core(self, pos: dict) -> Position:
         """
-        clearinghouseState.assetPositions[*].position 또는 WS 정규화 포맷을
-        표준 스키마로 변환합니다.
+        clearinghouseState.assetPositions[*].position 또는 WS 정규화 포맷(Position)을
+        표준 스키마(Position 레코드, dict 처럼 조회 가능)로 변환합니다.
         반환 스키마:
         {"entry_price": float|None, "unrealized_pnl": float|None, "side": "long"|"short"|"flat", "size": float}
         """
@@ -781,22 +1040,24 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         if "entry_px" in pos or "upnl" in pos or "size" in pos:
             size = fnum(pos.get("size"), 0.0) or 0.0
             side = pos.get("side") or ("long" if size > 0 else ("short" if size < 0 else "flat"))
-            return {
-                "entry_price": fnum(pos.get("entry_px")),
-                "unrealized_pnl": fnum(pos.get("upnl"), 0.0),
-                "side": side,
-                "size": abs(size),
-            }
+            return Position(
+                entry_price=fnum(pos.get("entry_px")),
+                unrealized_pnl=fnum(pos.get("upnl"), 0.0),
+                side=side,
+                size=abs(size),
+                raw=getattr(pos, "raw", pos),
+            )
 
         # REST 원본 포맷 대응
         size_signed = fnum(pos.get("szi"), 0.0) or 0.0
         side = "long" if size_signed > 0 else ("short" if size_signed < 0 else "flat")
-        return {
-            "entry_price": fnum(pos.get("entryPx")),
-            "unrealized_pnl": fnum(pos.get("unrealizedPnl"), 0.0),
-            "side": side,
-            "size": abs(size_signed),
-        }
+        return Position(
+            entry_price=fnum(pos.get("entryPx")),
+            unrealized_pnl=fnum(pos.get("unrealizedPnl"), 0.0),
+            side=side,
+            size=abs(size_signed),
+            raw=pos,
+        )
     
     async def get_position(self, symbol):
         """
@@ -813,10 +1074,11 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
                 pass
         return await self.get_position_rest(symbol)
     
-    async def get_position_ws(self, symbol: str, timeout: float = 2.0, dex: str | None = None) -> dict:
+    async def get_position_ws(self, symbol: str, timeout: float = 2.0, dex: str | None = None, *, max_age: float | None = None) -> dict:
         """
         webData3(WS 캐시)에서 조회. 스냅샷 미도착 시 timeout까지 짧게 대기합니다.
         dex를 지정하지 않으면 self.dex_list 순서대로 검색합니다.
+        스냅샷이 없거나 max_age(기본 ws_max_age)보다 오래됐으면 TimeoutError (get_position 은 REST 폴백)
         """
         address = self.vault_address or self.wallet_address
         if not address:
@@ -825,12 +1087,9 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         if not self.ws_client:
             await self.create_ws_client()
 
-        # 스냅샷 대기(간단 폴링)
-        deadline = time.monotonic() + float(timeout)
-        while time.monotonic() < deadline:
-            if getattr(self.ws_client, "positions_by_dex_norm", None):
-                break
-            await asyncio.sleep(0.05)
+        # [CHANGED] 스냅샷 대기(재연결 직후면 새 스냅샷까지) + 신선도 확인
+        await self.ws_client.wait_account_ready(timeout=timeout)
+        self._check_ws_fresh("clearinghouse", max_age=max_age)
 
         sym = str(symbol).strip().upper()
         # 현재 캐시에 있는 키 기반으로 순회
@@ -872,8 +1131,7 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         for d in dex_iter:
             payload = {"type": "clearinghouseState", "user": address, "dex": _dex_param(d)}
             try:
-                async with s.post(url, json=payload, headers=headers) as r:
-                    data = await r.json()
+                data = await self._post_info(payload)
             except aiohttp.ContentTypeError:
                 continue
             except Exception:
@@ -905,15 +1163,11 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         try:
             return await self.get_collateral_rest()
         except:
-            return {
-                "available_collateral":None,
-                "total_collateral": None,
-                "spot":{
-                    "USDH":None,
-                    "USDC":None,
-                    "USDT":None
-                }
-            }
+            return Collateral(
+                available_collateral=None,
+                total_collateral=None,
+                spot={"USDH": None, "USDC": None, "USDT": None},
+            )
     
     async def get_collateral_rest(self):
         """
@@ -931,11 +1185,11 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         """
         address = self.vault_address or self.wallet_address
         if not address:
-            return {
-                "available_collateral": None,
-                "total_collateral": None,
-                "spot": {"USDH": None, "USDC": None, "USDT": None},
-            }
+            return Collateral(
+                available_collateral=None,
+                total_collateral=None,
+                spot={"USDH": None, "USDC": None, "USDT": None},
+            )
 
         url = f"{self.http_base}/info"
         headers = {"Content-Type": "application/json"}
@@ -951,8 +1205,7 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         async def _fetch_ch(dex_name: str) -> tuple[float, float]:
             payload = {"type": "clearinghouseState", "user": address, "dex": _dex_param(dex_name)}
             try:
-                async with s.post(url, json=payload, headers=headers) as r:
-                    data = await r.json()
+                data = await self._post_info(payload)
             except aiohttp.ContentTypeError:
                 return (0.0, 0.0)
             except Exception:
@@ -980,8 +1233,7 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         spot_usdc = spot_usdh = spot_usdt = None
         try:
             payload_spot = {"type": "spotClearinghouseState", "user": address}
-            async with s.post(url, json=payload_spot, headers=headers) as r:
-                spot_resp = await r.json()
+            spot_resp = await self._post_info(payload_spot)
             balances_list = (spot_resp or {}).get("balances") or []
             balances = {}
             for b in balances_list:
@@ -1003,40 +1255,40 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         except Exception:
             pass
 
-        return {
-            "available_collateral": available_collateral,
-            "total_collateral": total_collateral,
-            "spot": {
+        return Collateral(
+            available_collateral=available_collateral,
+            total_collateral=total_collateral,
+            spot={
                 "USDH": spot_usdh,
                 "USDC": spot_usdc,
                 "USDT": spot_usdt,
             },
-        }
+        )
     
-    async def get_collateral_ws(self, timeout: float = 2.0):
+    async def get_collateral_ws(self, timeout: float = 2.0, *, max_age: float | None = None):
         """
         WS(webData3/spotState) 기반 담보 조회.
         - 주소가 설정되어 있어야 하며, 첫 스냅샷이 도착할 때까지 최대 timeout 초 대기.
+        - 스냅샷이 없거나 max_age(기본 ws_max_age)보다 오래됐으면 TimeoutError (get_collateral 은 REST 폴백)
         """
         address = self.vault_address or self.wallet_address
         if not address:
-            return {
-                "available_collateral": None,
-                "total_collateral": None,
-                "spot": {"USDH": None, "USDC": None, "USDT": None},
-            }
+            return Collateral(
+                available_collateral=None,
+                total_collateral=None,
+                spot={"USDH": None, "USDC": None, "USDT": None},
+            )
 
         if not self.ws_client:
             await self.create_ws_client()
 
-        # 1) webData3/spotState 첫 스냅샷을 짧게 폴링 대기
-        deadline = time.monotonic() + float(timeout)
-        while time.monotonic() < deadline:
-            has_margin = bool(getattr(self.ws_client, "margin_by_dex", {}))
-            has_bal = bool(getattr(self.ws_client, "balances", {}))
-            if has_margin and has_bal:
-                break
-            await asyncio.sleep(0.05)
+        # 1) clearinghouse/spotState 스냅샷 대기(재연결 직후면 새 스냅샷까지) + 신선도 확인
+        await asyncio.gather(
+            self.ws_client.wait_account_ready(timeout=timeout),
+            self.ws_client.wait_spot_ready(timeout=timeout),
+        )
+        self._check_ws_fresh("clearinghouse", max_age=max_age)
+        self._check_ws_fresh("spot", max_age=max_age)
 
         # 2) DEX별 합산
         av_sum = 0.0
@@ -1068,17 +1320,17 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         spot_usdh = float(balances.get("USDH", 0.0))
         spot_usdt = float(balances.get("USDT0", 0.0))
 
-        return {
-            "available_collateral": available_collateral,
-            "total_collateral": total_collateral,
-            "spot": {
+        return Collateral(
+            available_collateral=available_collateral,
+            total_collateral=total_collateral,
+            spot={
                 "USDH": spot_usdh,
                 "USDC": spot_usdc,
                 "USDT": spot_usdt,
             },
-        }
+        )
 
-    def _normalize_open_order_rest(self, o: dict) -> Optional[dict]:
+    def _normalize_open_order_rest(self, o: dict) -> Optional[Order]:
         if not isinstance(o, dict):
             return None
         coin_raw = str(o.get("coin") or "")
@@ -1101,21 +1353,23 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
             except Exception:
                 return default
 
-        out = {
-            "order_id": o.get("oid"),
-            "symbol": symbol,
-            "side": "short" if o.get("side") == 'A' else 'long',
-            "price": fnum(o.get("limitPx")),
-            "size": fnum(o.get("sz")),
-            #"timestamp": int(o.get("timestamp")) if o.get("timestamp") is not None else None,
-            #"raw": o,
-        }
-        return out if out["order_id"] is not None and out["symbol"] else None
-
-    async def get_open_orders_ws(self, symbol: str, timeout: float = 2.0) -> Optional[List[dict]]:
+        if o.get("oid") is None or not symbol:
+            return None
+        return Order(
+            order_id=o.get("oid"),
+            symbol=symbol,
+            side="short" if o.get("side") == 'A' else 'long',
+            price=fnum(o.get("limitPx")),
+            size=fnum(o.get("sz")),
+            client_id=str(o.get("cloid")) if o.get("cloid") else None,
+            raw=o,
+        )
+
+    async def get_open_orders_ws(self, symbol: str, timeout: float = 2.0, *, max_age: float | None = None) -> Optional[List[dict]]:
         """
         WS openOrders 캐시에서 주어진 심볼의 미체결 주문을 반환.
         - 구독이 없으면 subscribe를 보장하고, 초기 스냅샷을 timeout까지 대기(폴링).
+        - 스냅샷이 없거나 max_age(기본 ws_max_age)보다 오래됐으면 TimeoutError
         - 없으면 None.
         """
         address = self.vault_address or self.wallet_address
@@ -1125,28 +1379,11 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         if not self.ws_client:
             await self.create_ws_client()
 
-        if hasattr(self.ws_client, "wait_open_orders_ready"):
-            ok = await self.ws_client.wait_open_orders_ready(timeout=timeout)
-            if not ok:
-                # 이벤트가 없는 구현/타임아웃이면 폴링으로 후퇴
-                pass
-
-        # 폴링 대기(백업 경로)
-        deadline = time.monotonic() + float(timeout)
-        while time.monotonic() < deadline:
-            lst = getattr(self.ws_client, "open_orders", None)
-            if isinstance(lst, list):
-                break
-            await asyncio.sleep(0.05)
+        await self.ws_client.wait_open_orders_ready(timeout=timeout)
+        self._check_ws_fresh("open_orders", max_age=max_age)
 
-        orders = list(getattr(self.ws_client, "open_orders", []) or [])
-        
-        if not orders:
-            return None
-        
-        sym = str(symbol).upper().strip()
-        filtered = [o for o in orders if (o.get("symbol") or "").upper() == sym]
-        return filtered or None
+        # [CHANGED] 심볼 인덱스 조회(해당 심볼 주문 수 k 에 비례)
+        return self.ws_client.get_open_orders(str(symbol).upper().strip()) or None
     
     async def get_open_orders_rest(self, symbol: str, dex: str = "ALL_DEXS") -> Optional[List[dict]]:
         """
@@ -1161,10 +1398,8 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         headers = {"Content-Type": "application/json"}
         payload = {"type": "openOrders", "user": address, "dex": dex}
 
-        s = self._session()
         try:
-            async with s.post(url, json=payload, headers=headers) as r:
-                resp = await r.json()
+            resp = await self._post_info(payload)
         except aiohttp.ContentTypeError:
             return None
         except Exception:
@@ -1252,16 +1487,7 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
             cancels = [{"a": int(asset_id), "o": int(order_id)}]
             action = {"type": "cancel", "cancels": cancels}
 
-            nonce, sig = self._sign_hl_action(action)
-            payload = {"action": action, "nonce": nonce, "signature": sig}
-            if self.vault_address:
-                payload["vaultAddress"] = self.vault_address
-
-            url = f"{self.http_base}/exchange"
-            s = self._session()
-            async with s.post(url, json=payload, headers={"Content-Type": "application/json"}) as r:
-                r.raise_for_status()
-                resp = await r.json()
+            resp = await self._submit_action(action, trace_request_ctx=CANCEL_CTX)
 
             # 성공/실패 판정
             _ = self._extract_cancel_status(resp)
@@ -1309,16 +1535,7 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
 
         action = {"type": "cancel", "cancels": cancels}
         try:
-            nonce, sig = self._sign_hl_action(action)
-            payload = {"action": action, "nonce": nonce, "signature": sig}
-            if self.vault_address:
-                payload["vaultAddress"] = self.vault_address
-
-            url = f"{self.http_base}/exchange"
-            s = self._session()
-            async with s.post(url, json=payload, headers={"Content-Type": "application/json"}) as r:
-                r.raise_for_status()
-                resp = await r.json()
+            resp = await self._submit_action(action, trace_request_ctx=CANCEL_CTX)
 
             # 응답 판정
             # 성공이면 모두 ok=True로 업데이트
@@ -1335,6 +1552,36 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
                     r["error"] = str(e)
             return results
 
+    async def order_events(self, symbols=None, *, max_queue: int = 1000, **kwargs):
+        """
+        WS(orderUpdates / userFills / allDexsClearinghouseState) 기반 네이티브 이벤트 스트림.
+        - symbols=None 이면 전체, 아니면 대문자 심볼('BTC', 'XYZ:XYZ100', 'PURR/USDC') 기준 필터
+        - margin 변화 이벤트(type='margin')는 심볼이 없으므로 symbols=None 일 때만 전달
+        - 주소가 없으면 기본(폴링) 구현으로 후퇴
+        """
+        address = self.vault_address or self.wallet_address
+        if not address:
+            async for ev in super().order_events(symbols, **kwargs):
+                yield ev
+            return
+
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        wanted = {str(x).strip().upper() for x in symbols} if symbols else None
+
+        if not self.ws_client:
+            await self.create_ws_client()
+        client = self.ws_client
+        q = client.add_event_listener(maxsize=max_queue)
+        try:
+            await client.ensure_order_event_subs()
+            while True:
+                ev = await q.get()
+                if wanted is None or str(ev.get("symbol") or "").upper() in wanted:
+                    yield ev
+        finally:
+            client.remove_event_listener(q)
+
     # 내부 헬퍼: Spot 후보 페어 생성(우선순위 고정)
     def _spot_pair_candidates(self, raw_symbol: str) -> list[str]:
         """
@@ -1381,14 +1628,12 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
                 payload["dex"] = dex
         
         
-        s = self._session()
-        async with s.post(url, json=payload, headers=headers) as r:
-            status = r.status
-            try:
-                resp = await r.json()
-            except aiohttp.ContentTypeError:
-                # 비-JSON이면 폴백 불가 → None
-                return None
+        # [CHANGED] 동시 다발 get_mark_price 는 metaAndAssetCtxs 1회로 합쳐짐
+        try:
+            resp = await self._post_info(payload)
+        except aiohttp.ContentTypeError:
+            # 비-JSON이면 폴백 불가 → None
+            return None
 
         universe = resp[0].get("universe") if isinstance(resp, list) and len(resp) >= 2 and isinstance(resp[0], dict) else None
         meta = resp[1] if isinstance(resp, list) and len(resp) >= 2 else None
@@ -1420,13 +1665,167 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
         
         return None
     
-    async def get_mark_price_ws(self,symbol, *, is_spot=False, timeout: float = 3.0):
+    async def get_mark_prices(self, symbols, *, is_spot=False):
+        """
+        여러 심볼 마크가격: {symbol: float|None}
+        - fetch_by_ws: WS 캐시에 있는 값 우선(대기 없음), 없는 심볼만 REST
+        - REST: dex별 metaAndAssetCtxs / spotMetaAndAssetCtxs 를 1회씩만 조회해 name→index 맵으로 일괄 조회
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        out = {}
+        pending = []
+        for sym in dict.fromkeys(symbols):
+            spot = is_spot or "/" in str(sym)
+            px = None
+            if self.fetch_by_ws and self.ws_client is not None:
+                try:
+                    # [CHANGED] 오래된(재연결로 무효화/ws_max_age 초과) 값은 REST 로
+                    if spot:
+                        for pair in self._spot_pair_candidates(str(sym).strip().upper()):
+                            if self.ws_client.is_fresh("spot_pair", pair, self.ws_max_age):
+                                px = self.ws_client.get_spot_pair_px(pair)
+                            if px is not None:
+                                break
+                    elif self.ws_client.is_fresh("perp", str(sym).strip().upper(), self.ws_max_age):
+                        px = self.ws_client.get_price(str(sym).strip().upper())
+                except Exception:
+                    px = None
+            if px is not None:
+                out[sym] = float(px)
+            else:
+                pending.append((sym, spot))
+        # [ADDED] 선택 구독 모드: 이번엔 REST, 다음 호출부터 WS 캐시에서 나오도록 코인 구독
+        if pending and self.fetch_by_ws and self.ws_client is not None and self.ws_client.selective:
+            for sym, spot in pending:
+                try:
+                    if spot:
+                        for pair in self._spot_pair_candidates(str(sym).strip().upper()):
+                            await self.ws_client.ensure_price_sub(pair, kind="spot_pair")
+                    else:
+                        await self.ws_client.ensure_price_sub(str(sym).strip(), kind="perp")
+                except Exception:
+                    pass
+        if pending:
+            out.update(await self.get_mark_prices_rest(pending))
+        return {s: out.get(s) for s in symbols}
+
+    async def get_mark_prices_rest(self, items):
+        """items: [(symbol, is_spot)] → {symbol: float|None}"""
+        # 요청 단위로 묶기: spot 1개 + perp dex별 1개
+        groups = {}
+        for sym, spot in items:
+            if spot:
+                gk = ("spot", None)
+            else:
+                gk = ("perp", str(sym).split(":")[0].lower() if ":" in str(sym) else None)
+            groups.setdefault(gk, []).append(sym)
+
+        async def _fetch(gk):
+            kind, dex = gk
+            if kind == "spot":
+                payload = {"type": "spotMetaAndAssetCtxs"}
+            else:
+                payload = {"type": "metaAndAssetCtxs"}
+                if dex:
+                    payload["dex"] = dex
+            try:
+                return await self._post_info(payload)
+            except Exception:
+                return None
+
+        keys = list(groups.keys())
+        resps = await asyncio.gather(*[_fetch(k) for k in keys])
+
+        def _px(ctx):
+            try:
+                return float(ctx.get("markPx"))
+            except Exception:
+                return None
+
+        out = {}
+        for (kind, _dex), resp in zip(keys, resps):
+            syms = groups[(kind, _dex)]
+            ok = isinstance(resp, list) and len(resp) >= 2 and isinstance(resp[0], dict)
+            universe = resp[0].get("universe") if ok else None
+            ctxs = resp[1] if ok else None
+            if universe is None or ctxs is None:
+                out.update({s: None for s in syms})
+                continue
+            if kind == "spot":
+                for sym in syms:
+                    out[sym] = None
+                    for pair in self._spot_pair_candidates(str(sym).upper()):
+                        idx = self.spot_asset_pair_to_index.get(pair)
+                        if idx is None:
+                            idx = self.spot_asset_pair_to_index.get(f"U{pair}")
+                        try:
+                            out[sym] = _px(ctxs[idx])
+                            break
+                        except Exception:
+                            continue
+            else:
+                name_to_idx = {str(u.get("name") or "").upper(): i for i, u in enumerate(universe)}
+                for sym in syms:
+                    idx = name_to_idx.get(str(sym).upper())
+                    out[sym] = _px(ctxs[idx]) if idx is not None and idx < len(ctxs) else None
+        return out
+
+    def _book_coin(self, symbol, *, is_spot=False) -> Optional[str]:
+        """심볼 → l2Book coin 이름('BTC' / 'xyz:XYZ100' / 'PURR/USDC' / '@{pairIdx}')"""
+        raw = str(symbol).strip()
+        if not (is_spot or "/" in raw):
+            return parse_hip3_symbol(raw)[1]
+        for pair in self._spot_pair_candidates(raw.upper()):
+            idx = (self.spot_asset_pair_to_index or {}).get(pair)
+            if idx is not None:
+                return pair if pair == "PURR/USDC" else f"@{idx}"
+        return None
+
+    async def _get_l2book(self, symbol, *, is_spot=False, timeout: float = 2.0) -> Optional[L2Book]:
+        """fetch_by_ws 면 WS l2Book(최초 구독 시 첫 스냅샷까지 대기), 아니면/실패 시 REST l2Book."""
+        coin = self._book_coin(symbol, is_spot=is_spot)
+        if coin is None:
+            return None
+        if self.fetch_by_ws:
+            try:
+                if not self.ws_client:
+                    await self.create_ws_client()
+                await self.ws_client.ensure_book_sub(coin)
+                if await self.ws_client.wait_book_ready(coin, timeout=timeout):
+                    return self.ws_client.get_book(coin)
+            except Exception:
+                pass
+        resp = await self._post_info({"type": "l2Book", "coin": coin})
+        levels = resp.get("levels") if isinstance(resp, dict) else None
+        if not isinstance(levels, list) or len(levels) < 2:
+            return None
+        book = L2Book(coin)
+        book.apply_snapshot(levels[0], levels[1], resp.get("time"))
+        return book
+
+    async def get_orderbook(self, symbol, depth: int = 20, *, is_spot=False):
+        """
+        L2 오더북: {"symbol", "bids": [[px, sz], ...](높은 가격부터), "asks": [[px, sz], ...](낮은 가격부터), "ts"} | None
+        - HL 은 상위 20 레벨까지 제공
+        """
+        try:
+            book = await self._get_l2book(symbol, is_spot=is_spot)
+        except Exception:
+            return None
+        if book is None:
+            return None
+        snap = book.snapshot(depth)
+        snap["symbol"] = symbol
+        return snap
+
+    async def get_mark_price_ws(self,symbol, *, is_spot=False, timeout: float = 3.0, max_age: float | None = None):
         """
         WS 캐시 기반 마크 프라이스 조회.
         - is_spot=True 이면 'BASE/QUOTE' 페어 가격을 조회
         - is_spot=False 이면 perp(예: 'BTC') 가격을 조회
         - 첫 틱이 아직 도착하지 않은 경우 wait_price_ready가 있으면 timeout까지 대기
-        - 값을 얻지 못하면 예외를 던져 상위(get_mark_price)에서 REST 폴백하게 한다.
+        - 값을 얻지 못하거나 max_age(기본 ws_max_age)보다 오래된 값이면 예외를 던져 상위(get_mark_price)에서 REST 폴백하게 한다.
         """
         if not self.ws_client:
             await self.create_ws_client()
@@ -1437,6 +1836,8 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
 
         if is_spot:
             for pair in self._spot_pair_candidates(raw.upper()):
+                # [ADDED] 선택 구독 모드면 해당 페어만 구독(allMids 미사용)
+                await self.ws_client.ensure_price_sub(pair, kind="spot_pair")
                 # spot_pair로 명시
                 if hasattr(self.ws_client, "wait_price_ready"):
                     try:
@@ -1450,7 +1851,7 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
                         continue
                 
                 px = self.ws_client.get_spot_pair_px(pair)
-                if px is not None:
+                if px is not None and self._ws_fresh("spot_pair", pair, max_age):
                     return float(px)
 
             # 모든 후보 실패
@@ -1458,16 +1859,34 @@ class HyperliquidExchange(MultiPerpDexMixin, MultiPerpDex):
 
         # Perp 경로
         key = raw.upper()
+        # [ADDED] 선택 구독 모드: 코인 1개만 구독, 못 받으면 그 dex 의 allMids 로 폴백
+        selective = await self.ws_client.ensure_price_sub(raw, kind="perp")
         # perp로 명시
         try:
-            await asyncio.wait_for(
+            ready = await asyncio.wait_for(
                 self.ws_client.wait_price_ready(key, timeout=timeout, kind="perp"),
                 timeout=timeout
             )
         except Exception:
-            pass
+            ready = False
+        if not ready and selective:
+            await self.ws_client.ensure_allmids_for(raw.split(":")[0].lower() if ":" in raw else None)
+            try:
+                await self.ws_client.wait_price_ready(key, timeout=timeout, kind="perp")
+            except Exception:
+                pass
 
         px = self.ws_client.get_price(key)
         if px is None:
             raise TimeoutError(f"WS perp price not ready for {key}")
-        return float(px)
\ No newline at end of file
+        self._check_ws_fresh("perp", key, max_age=max_age)
+        return float(px)
+
+    def _ws_fresh(self, kind, key=None, max_age=None) -> bool:
+        return self.ws_client.is_fresh(kind, key, self.ws_max_age if max_age is None else max_age)
+
+    def _check_ws_fresh(self, kind, key=None, *, max_age=None) -> None:
+        """WS 캐시가 없거나(재연결로 무효화 포함) max_age 초과면 TimeoutError → 호출측 REST 폴백"""
+        if not self._ws_fresh(kind, key, max_age):
+            age = self.ws_client.data_age(kind, key)
+            raise TimeoutError(f"WS {kind}{'/' + key if key else ''} stale or not ready (age={age})")
\ No newline at end of file
@@ -7,7 +7,7 @@ import re
 import signal
 import sys
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib import request as urllib_request
 from urllib.error import URLError, HTTPError
 import json
@@ -15,6 +15,9 @@ import websockets  # type: ignore
 from websockets.exceptions import ConnectionClosed, ConnectionClosedOK  # type: ignore
 import logging
 from logging.handlers import RotatingFileHandler
+from mpdex.utils import metrics
+from mpdex.utils.orderbook import L2Book
+from mpdex.utils.records import Fill, HLPosition, Order
 
 ws_logger = logging.getLogger("ws")
 def _ensure_ws_logger():
@@ -180,7 +183,10 @@ class HLWSClientRaw:
         self.perp_meta: Dict[str, Dict[str, Any]] = {}           # coin -> {'szDecimals': int, 'maxLeverage': int|None, 'onlyIsolated': bool}
         self.asset_ctxs: Dict[str, Dict[str, Any]] = {}          # coin -> assetCtx(dict)
         self.positions: Dict[str, Dict[str, Any]] = {}           # coin -> position(dict)
-        self.open_orders: List[Dict[str, Any]] = []              # raw list
+        # [CHANGED] 미체결 주문 인덱스(open_orders 는 호환용 property)
+        self._orders_by_oid: Dict[int, Dict[str, Any]] = {}           # oid -> 정규화 주문
+        self._oids_by_symbol: Dict[str, Dict[int, None]] = {}         # 심볼 -> {oid: None} (삽입 순서 유지 set)
+        self._oid_by_cloid: Dict[str, int] = {}                       # cloid -> oid
         self.balances: Dict[str, float] = {}                          # token -> total
         #self.spot_pair_ctxs: Dict[str, Dict[str, Any]] = {}      # 'BASE/QUOTE' -> ctx(dict)
         #self.spot_base_px: Dict[str, float] = {}                 # BASE -> px (QUOTE=USDC일 때)
@@ -195,9 +201,26 @@ class HLWSClientRaw:
         self.positions_by_dex_norm: Dict[str, Dict[str, Dict[str, Any]]] = {}  # dex -> {coin -> norm pos}
         self.positions_by_dex_raw: Dict[str, List[Dict[str, Any]]] = {}         # dex -> raw assetPositions[*].position 목록
         self.asset_ctxs_by_dex: Dict[str, List[Dict[str, Any]]] = {}            # dex -> assetCtxs(raw list)
+        self._pos_raw_by_dex: Dict[str, Dict[str, Dict[str, Any]]] = {}        # [ADDED] dex -> {coin 원문 -> 직전 원본 position} (증분 비교용)
         self.total_account_value: float = 0.0
         self._open_orders_ready = asyncio.Event()
 
+        # [ADDED] 선택 구독 모드: allMids 전체 대신 요청된 코인만 activeAssetCtx/bbo 로 구독
+        self.selective: bool = False
+        self.bbo: Dict[str, Tuple[Optional[float], Optional[float]]] = {}  # coin → (bid, ask)
+        # [ADDED] 캐시 신선도: 마지막 수신 시각(time.time()) + 재연결 시 무효화 기준 시각
+        #   _price_ts: 'perp|BTC' / 'spot_pair|PURR/USDC' / 'spot_base|PURR' → ts
+        #   _user_ts:  'clearinghouse' / 'spot' / 'open_orders' → ts
+        #   *_stale_before 이전에 받은 값은 (재수신 전까지) 무효로 간주
+        self._price_ts: Dict[str, float] = {}
+        self._user_ts: Dict[str, float] = {}
+        self._price_stale_before: float = 0.0
+        self._user_stale_before: float = 0.0
+        self._account_ready = asyncio.Event()   # allDexsClearinghouseState 수신
+        self._spot_ready = asyncio.Event()      # spotState 수신
+        # [ADDED] l2Book 구독 코인별 오더북(coin 대문자 키: 'BTC', 'XYZ:XYZ100', '@107')
+        self.books: Dict[str, L2Book] = {}
+
         self._send_lock = asyncio.Lock()
         self._active_subs: set[str] = set()  # 이미 보낸 구독의 키 집합
 
@@ -205,6 +228,120 @@ class HLWSClientRaw:
         #   예) "perp|BTC", "spot_base|PURR", "spot_pair|PURR/USDC"
         self._price_events: Dict[str, asyncio.Event] = {}  # comment: {'perp|BTC': Event(), ...}
 
+        # [ADDED] order_events 리스너 큐(주문/체결/포지션 이벤트 push)
+        self._event_queues: set[asyncio.Queue] = set()
+
+    # ---------------------- 이벤트 스트림(order_events) ----------------------
+
+    def add_event_listener(self, maxsize: int = 1000) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._event_queues.add(q)
+        return q
+
+    def remove_event_listener(self, q: asyncio.Queue) -> None:
+        self._event_queues.discard(q)
+
+    def _emit(self, ev: Dict[str, Any]) -> None:
+        """모든 리스너 큐에 이벤트 전달. 가득 찬 큐는 가장 오래된 이벤트를 버린다."""
+        for q in list(self._event_queues):
+            try:
+                q.put_nowait(ev)
+            except asyncio.QueueFull:
+                try:
+                    q.get_nowait()
+                    q.put_nowait(ev)
+                except Exception:
+                    pass
+
+    async def ensure_order_event_subs(self) -> None:
+        """
+        orderUpdates / userFills 구독을 보장(주소가 있을 때만).
+        재연결 시에도 유지되도록 _subscriptions 에도 추가한다.
+        """
+        if not self.address:
+            return
+        for sub in (
+            {"type": "orderUpdates", "user": self.address},
+            {"type": "userFills", "user": self.address},
+        ):
+            if all(_sub_key(x) != _sub_key(sub) for x in self._subscriptions):
+                self._subscriptions.append(sub)
+            if self.conn:
+                await self._send_subscribe(sub)
+
+    def _coin_to_symbol(self, coin_raw: str) -> Optional[str]:
+        # '@{pairIdx}' → 'BASE/QUOTE', 그 외는 대문자 심볼 (_normalize_open_order 와 동일 규칙)
+        coin_raw = str(coin_raw or "")
+        if coin_raw.startswith("@"):
+            try:
+                pair = self.spot_asset_index_to_pair.get(int(coin_raw[1:]))
+            except Exception:
+                return None
+            return str(pair).upper() if pair else None
+        return coin_raw.upper() or None
+
+    @staticmethod
+    def _order_status(status: str) -> str:
+        st = str(status or "").lower()
+        if st.endswith("canceled") or st.endswith("cancelled"):
+            return "canceled"
+        return st  # open / filled / triggered / rejected ...
+
+    def _on_order_updates(self, data: Any) -> None:
+        # data: [{'order': {coin, side, limitPx, sz, oid, timestamp, origSz, cloid?}, 'status': 'open'|'filled'|'canceled'|..., 'statusTimestamp': ms}]
+        if not isinstance(data, list):
+            return
+        for u in data:
+            o = (u or {}).get("order") or {}
+            symbol = self._coin_to_symbol(o.get("coin"))
+            if not symbol:
+                continue
+            order = self._normalize_open_order(o) or {}
+            # [ADDED] 미체결 인덱스 증분 반영(다음 openOrders 스냅샷 전에도 최신 유지)
+            status = self._order_status(u.get("status"))
+            if status == "open" and order:
+                self._index_order(order)
+            elif status != "triggered":
+                self._unindex_order(o.get("oid"))
+            if not self._event_queues:
+                continue
+            self._emit({
+                "type": "order",
+                "status": self._order_status(u.get("status")),
+                "symbol": symbol,
+                "order_id": o.get("oid"),
+                "side": "short" if o.get("side") == "A" else "long",
+                "order": order,
+                "ts": u.get("statusTimestamp") or o.get("timestamp"),
+                "source": "ws",
+            })
+
+    def _on_user_fills(self, data: Dict[str, Any]) -> None:
+        # data: {'isSnapshot': bool?, 'user': ..., 'fills': [{coin, px, sz, side, time, oid, fee, tid, dir, closedPnl, ...}]}
+        if not self._event_queues or not isinstance(data, dict) or data.get("isSnapshot"):
+            return
+        for f in data.get("fills") or []:
+            symbol = self._coin_to_symbol((f or {}).get("coin"))
+            if not symbol:
+                continue
+            try:
+                fill = Fill(
+                    symbol=symbol,
+                    order_id=f.get("oid"),
+                    side="short" if f.get("side") == "A" else "long",
+                    price=float(f.get("px")),
+                    size=float(f.get("sz")),
+                    fee=f.get("fee"),
+                    ts=f.get("time"),
+                    trade_id=f.get("tid"),
+                    closed_pnl=f.get("closedPnl"),
+                    dir=f.get("dir"),
+                    raw=f,
+                )
+            except Exception:
+                continue
+            self._emit({"type": "fill", **fill, "tid": fill.trade_id, "source": "ws"})
+
     def _normalize_open_order(self, o: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         원본 open order o를 표준 dict로 변환.
@@ -238,16 +375,17 @@ class HLWSClientRaw:
                 except Exception:
                     return default
 
-            out = {
-                "order_id": o.get("oid"),
-                "symbol": symbol,
-                "side": "short" if o.get("side") == 'A' else 'long',
-                "price": fnum(o.get("limitPx")),
-                "size": fnum(o.get("sz")),
-                #"timestamp": int(o.get("timestamp")) if o.get("timestamp") is not None else None,
-                #"raw": o,
-            }
-            return out if out["order_id"] is not None and out["symbol"] else None
+            if o.get("oid") is None or not symbol:
+                return None
+            return Order(
+                order_id=o.get("oid"),
+                symbol=symbol,
+                side="short" if o.get("side") == 'A' else 'long',
+                price=fnum(o.get("limitPx")),
+                size=fnum(o.get("sz")),
+                client_id=str(o.get("cloid")) if o.get("cloid") else None,
+                raw=o,
+            )
         except Exception:
             return None
 
@@ -276,16 +414,49 @@ class HLWSClientRaw:
         bq_by_index: Dict[int, tuple[str, str]],
     ) -> None:
         # 내부에서 그대로 참조해도 되지만, 방어적으로 복사
-        self.spot_index_to_name = dict(idx2name or {})
-        self.spot_name_to_index = {str(k).upper(): int(v) for k, v in (name2idx or {}).items()}
-        self.spot_asset_index_to_pair = dict(pair_by_index or {})
-        self.spot_asset_index_to_bq = dict(bq_by_index or {})
+        # [CHANGED] 새 dict 를 먼저 만든 뒤 한 번에 교체(중간에 await 없음 → 디스패치는 이전/새 맵 중 하나만 봄)
+        i2n = dict(idx2name or {})
+        n2i = {str(k).upper(): int(v) for k, v in (name2idx or {}).items()}
+        pairs = dict(pair_by_index or {})
+        bqs = dict(bq_by_index or {})
+        self.spot_index_to_name, self.spot_name_to_index = i2n, n2i
+        self.spot_asset_index_to_pair, self.spot_asset_index_to_bq = pairs, bqs
+        # [ADDED] 매핑 전에 받아둔 '@{pairIdx}' 가격 재적용
+        self._replay_pending_spot_mids()
+
+    def _apply_spot_index_mid(self, pair_idx: int, px: float) -> bool:
+        """'@{pairIdx}' 가격 반영. 페어 맵에 없으면(신규 상장 등) 보류 큐에 최신값만 남기고 False."""
+        pair = self.spot_asset_index_to_pair.get(pair_idx)   # 'BASE/QUOTE'
+        bq = self.spot_asset_index_to_bq.get(pair_idx)       # (BASE, QUOTE)
+        if not pair or not bq:
+            self._pending_spot_pair_mids[pair_idx] = px
+            return False
+        self.spot_pair_prices[pair] = px
+        self._notify_spot_pair(pair)
+        # 쿼트가 USDC인 경우 base 단일 가격도 채움
+        if bq[1] == "USDC":
+            self.spot_prices[bq[0]] = px
+            self._notify_spot_base(bq[0])
+        return True
+
+    def _replay_pending_spot_mids(self) -> int:
+        """보류 중인 '@{pairIdx}' 가격 중 이제 매핑 가능한 것만 반영. 반환: 반영 개수"""
+        pending = self._pending_spot_pair_mids
+        if not pending:
+            return 0
+        self._pending_spot_pair_mids = {}
+        n = 0
+        for idx, px in pending.items():
+            if self._apply_spot_index_mid(idx, px):
+                n += 1
+        return n
 
     def _event_key(self, kind: str, key: str) -> str:
         return f"{kind}|{str(key).upper().strip()}"
     
     def _notify_perp(self, coin: str) -> None:
         try:
+            self._price_ts[self._event_key("perp", coin)] = time.time()
             ev = self._price_events.get(self._event_key("perp", coin))
             if ev and not ev.is_set():
                 ev.set()
@@ -294,6 +465,7 @@ class HLWSClientRaw:
 
     def _notify_spot_base(self, base: str) -> None:
         try:
+            self._price_ts[self._event_key("spot_base", base)] = time.time()
             ev = self._price_events.get(self._event_key("spot_base", base))
             if ev and not ev.is_set():
                 ev.set()
@@ -302,12 +474,74 @@ class HLWSClientRaw:
 
     def _notify_spot_pair(self, pair: str) -> None:
         try:
+            self._price_ts[self._event_key("spot_pair", pair)] = time.time()
             ev = self._price_events.get(self._event_key("spot_pair", pair))
             if ev and not ev.is_set():
                 ev.set()
         except Exception:
             pass
 
+    # ---------------------- 캐시 신선도 ----------------------
+
+    def _touch_user(self, kind: str, ev: Optional[asyncio.Event] = None) -> None:
+        self._user_ts[kind] = time.time()
+        if ev is not None and not ev.is_set():
+            ev.set()
+
+    def _price_stale_mark(self) -> float:
+        return self._price_stale_before
+
+    def data_age(self, kind: str, key: Optional[str] = None) -> Optional[float]:
+        """
+        캐시 경과 시간(sec). 수신 이력이 없거나 재연결로 무효화된 뒤 아직 다시 받지 못했으면 None.
+        - kind='perp'|'spot_base'|'spot_pair' (key=심볼)
+        - kind='clearinghouse'|'spot'|'open_orders'
+        """
+        if kind in ("perp", "spot_base", "spot_pair"):
+            ts = self._price_ts.get(self._event_key(kind, key or ""))
+            since = self._price_stale_mark()
+        else:
+            ts = self._user_ts.get(kind)
+            since = self._user_stale_before
+        if ts is None or ts < since:
+            return None
+        return max(0.0, time.time() - ts)
+
+    def is_fresh(self, kind: str, key: Optional[str] = None, max_age: Optional[float] = None) -> bool:
+        age = self.data_age(kind, key)
+        return age is not None and (max_age is None or age <= float(max_age))
+
+    def _invalidate_user(self) -> None:
+        self._user_stale_before = time.time()
+        for ev in (self._open_orders_ready, self._account_ready, self._spot_ready):
+            ev.clear()
+
+    def _invalidate_prices(self) -> None:
+        self._price_stale_before = time.time()
+        self._pending_spot_pair_mids.clear()  # 이전 연결에서 보류된 가격은 재적용하지 않음
+        for ev in self._price_events.values():
+            ev.clear()
+
+    def _invalidate(self) -> None:
+        """연결 끊김: 기존 캐시를 '오래된 값'으로 표시하고 준비 이벤트 해제(재수신 시 다시 set)."""
+        self._invalidate_user()
+        self._invalidate_prices()
+
+    async def wait_account_ready(self, timeout: float = 2.0) -> bool:
+        """clearinghouse 스냅샷(재연결 후라면 새 스냅샷)까지 대기."""
+        try:
+            await asyncio.wait_for(self._account_ready.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def wait_spot_ready(self, timeout: float = 2.0) -> bool:
+        try:
+            await asyncio.wait_for(self._spot_ready.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
     async def wait_open_orders_ready(self, timeout: float = 2.0) -> bool:
         try:
             if self._open_orders_ready.is_set():
@@ -344,7 +578,8 @@ class HLWSClientRaw:
         else:
             raise ValueError(f"wait_price_ready: invalid kind={kind!r}")
 
-        if has_val:
+        # [CHANGED] 재연결로 무효화된 값은 새 틱을 받을 때까지 준비 안 된 것으로 취급
+        if has_val and self.data_age(k, s) is not None:
             return True
 
         # 2) 이벤트 생성 후 대기
@@ -381,15 +616,151 @@ class HLWSClientRaw:
         key = None
         if dex is None or str(dex).lower() == "hl":
             sub = {"type": "allMids"}
-            key = _sub_key(sub)
-            if key not in self._active_subs:
-                await self._send_subscribe(sub)
         else:
             d = str(dex).lower().strip()
             sub = {"type": "allMids", "dex": d}
-            key = _sub_key(sub)
-            if key not in self._active_subs:
+        key = _sub_key(sub)
+        self._remember_sub(sub)  # [CHANGED] 재연결 시에도 유지
+        if key not in self._active_subs and self.conn:
+            await self._send_subscribe(sub)
+
+    def _remember_sub(self, sub: Dict[str, Any]) -> None:
+        if all(_sub_key(x) != _sub_key(sub) for x in self._subscriptions):
+            self._subscriptions.append(sub)
+
+    def _price_sub_coin(self, symbol: str, kind: str) -> Optional[str]:
+        """
+        가격 조회 심볼 → HL 구독 coin 이름
+        - perp: 'BTC' / HIP-3 'xyz:XYZ100'(dex 소문자)
+        - spot: 'PURR/USDC' 는 그대로, 그 외 페어는 '@{pairIdx}'
+        """
+        s = str(symbol).strip()
+        if kind == "perp":
+            if ":" in s:
+                d, n = s.split(":", 1)
+                return f"{d.lower()}:{n.upper()}"
+            return s.upper() or None
+        pair = s.upper() if kind == "spot_pair" else f"{s.upper()}/USDC"
+        if pair == "PURR/USDC":
+            return pair
+        for idx, p in self.spot_asset_index_to_pair.items():
+            if p == pair:
+                return f"@{idx}"
+        return None
+
+    async def ensure_price_sub(self, symbol: str, *, kind: str = "perp", bbo: bool = False) -> bool:
+        """
+        선택 구독 모드에서 코인 1개의 가격 스트림(activeAssetCtx, 옵션 bbo)을 구독.
+        selective 가 아니면(allMids 사용) 아무것도 하지 않음. 반환: 구독 대상 여부
+        """
+        if not self.selective:
+            return False
+        coin = self._price_sub_coin(symbol, kind)
+        if not coin:
+            return False
+        subs = [{"type": "activeAssetCtx", "coin": coin}]
+        if bbo:
+            subs.append({"type": "bbo", "coin": coin})
+        for sub in subs:
+            self._remember_sub(sub)
+            if self.conn:
                 await self._send_subscribe(sub)
+        return True
+
+    def _set_coin_px(self, coin: str, px: float) -> None:
+        """구독 coin 이름('BTC' / 'xyz:XYZ' / '@107' / 'PURR/USDC') 기준 가격 캐시 갱신."""
+        if coin.startswith("@"):
+            try:
+                idx = int(coin[1:])
+            except ValueError:
+                return
+            self._apply_spot_index_mid(idx, px)
+            return
+        base = _clean_spot_key_from_pair(coin)
+        if base:
+            pair = coin.strip().upper()
+            self.spot_pair_prices[pair] = px
+            self._notify_spot_pair(pair)
+            if pair.endswith("/USDC"):
+                self.spot_prices[base] = px
+                self._notify_spot_base(base)
+            return
+        key = _clean_coin_key_for_perp(coin)
+        if key:
+            self.prices[key] = px
+            self._notify_perp(key)
+
+    def _on_active_asset_ctx(self, data: Dict[str, Any]) -> None:
+        # {'coin': 'BTC', 'ctx': {'markPx': '..', 'midPx': '..', 'oraclePx': '..', ...}}
+        coin = str(data.get("coin") or "")
+        ctx = data.get("ctx") or {}
+        if not coin or not isinstance(ctx, dict):
+            return
+        try:
+            # allMids 와 같은 의미(mid)를 유지, mid 가 없으면 mark
+            px = float(ctx.get("midPx") or ctx.get("markPx"))
+        except (TypeError, ValueError):
+            return
+        self._set_coin_px(coin, px)
+        if not coin.startswith("@") and "/" not in coin:
+            self.asset_ctxs[coin.upper()] = ctx
+
+    def _on_bbo(self, data: Dict[str, Any]) -> None:
+        # {'coin': 'BTC', 'time': ms, 'bbo': [{'px','sz','n'} | None, {...} | None]}
+        coin = str(data.get("coin") or "")
+        levels = data.get("bbo") or []
+        if not coin or len(levels) < 2:
+            return
+        def _px(lv):
+            try:
+                return float(lv.get("px"))
+            except Exception:
+                return None
+        self.bbo[coin.upper()] = (_px(levels[0] or {}), _px(levels[1] or {}))
+
+    def get_bbo(self, coin: str) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        return self.bbo.get(str(coin).strip().upper())
+
+    # ---------------------- L2 오더북 ----------------------
+
+    async def ensure_book_sub(self, coin: str) -> None:
+        """coin: HL 구독 이름('BTC' / 'xyz:XYZ100' / '@107'). 재연결 시에도 유지."""
+        sub = {"type": "l2Book", "coin": coin}
+        self._remember_sub(sub)
+        if self.conn:
+            await self._send_subscribe(sub)
+
+    def get_book(self, coin: str) -> Optional[L2Book]:
+        return self.books.get(str(coin).strip().upper())
+
+    async def wait_book_ready(self, coin: str, timeout: float = 2.0) -> bool:
+        book = self.get_book(coin)
+        if book is not None and book.ready and book.updated_at >= self._price_stale_mark():
+            return True
+        ek = self._event_key("book", coin)
+        ev = self._price_events.get(ek)
+        if ev is None:
+            ev = self._price_events[ek] = asyncio.Event()
+        try:
+            await asyncio.wait_for(ev.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _on_l2_book(self, data: Dict[str, Any]) -> None:
+        # {'coin': 'BTC', 'time': ms, 'levels': [[{'px','sz','n'}, ...bids], [...asks]]} — 매 push 가 상위 레벨 스냅샷
+        coin = str(data.get("coin") or "")
+        levels = data.get("levels") or []
+        if not coin or len(levels) < 2:
+            return
+        key = coin.upper()
+        book = self.books.get(key)
+        if book is None:
+            book = self.books[key] = L2Book(coin)
+        book.apply_snapshot(levels[0], levels[1], data.get("time"))
+        ev = self._price_events.get(self._event_key("book", key))
+        if ev and not ev.is_set():
+            ev.set()
 
     async def _send_subscribe(self, sub: dict) -> None:
         """subscribe 메시지 전송(중복 방지)."""
@@ -409,8 +780,10 @@ class HLWSClientRaw:
         - allMids: 가격(이 스코프 문맥)
         - webData3/spotState: 주소가 있을 때만
         """
-        # 1) 가격(스코프별)
-        if self.dex:
+        # 1) 가격(스코프별) — 선택 구독 모드면 코인별 구독(ensure_price_sub)에 맡김
+        if self.selective:
+            pass
+        elif self.dex:
             await self._send_subscribe({"type": "allMids", "dex": self.dex})
         else:
             await self._send_subscribe({"type": "allMids"})
@@ -513,10 +886,11 @@ class HLWSClientRaw:
         data: {"user": "...", "clearinghouseStates": [ [dex, chState], ... ] }
         dex == "" → 'hl' 로 매핑
         chState 구조는 clearinghouseState와 동일
+        [CHANGED] 증분 갱신: 이전 원본과 같은 포지션은 재정규화하지 않고, 바뀐 코인/마진만 교체 + 변화 이벤트
         """
         try:
             ch_states = (data or {}).get("clearinghouseStates") or []
-            total_av = 0.0
+            now = int(time.time() * 1000)
 
             # 초기화(존재하는 키만 갱신할 경우 덮어쓰기)
             # self.margin_by_dex, self.positions_by_dex_norm 등은 부분 갱신 허용
@@ -545,34 +919,113 @@ class HLWSClientRaw:
                     "withdrawable": fnum(ch.get("withdrawable")),
                     "time": ch.get("time"),
                 }
-                self.margin_by_dex[dex_key] = margin
-                total_av += margin["accountValue"]
+                self._apply_margin(dex_key, margin, now)
+                self._apply_positions(dex_key, ch.get("assetPositions") or [], now)
 
-                # 포지션 정규화
-                norm_map: Dict[str, Dict[str, Any]] = {}
-                raw_list: List[Dict[str, Any]] = []
-                for ap in ch.get("assetPositions") or []:
-                    pos = (ap or {}).get("position") or {}
-                    if not pos:
-                        continue
-                    raw_list.append(pos)
-                    coin_raw = str(pos.get("coin") or "")
-                    coin_upper = coin_raw.upper()
-                    try:
-                        norm = self._normalize_position(pos)
-                        norm_map[coin_upper] = norm
-                        if ":" in coin_raw:
-                            norm_map[coin_raw] = norm
-                    except Exception:
-                        continue
-                self.positions_by_dex_raw[dex_key] = raw_list
-                self.positions_by_dex_norm[dex_key] = norm_map
-
-            self.total_account_value = total_av
+            self.total_account_value = sum(float(m.get("accountValue") or 0.0) for m in self.margin_by_dex.values())
+            self._touch_user("clearinghouse", self._account_ready)
 
         except Exception as e:
             ws_logger.debug(f"[allDexsClearinghouseState] update error: {e}", exc_info=True)
 
+    def _apply_margin(self, dex_key: str, margin: Dict[str, Any], now: int) -> None:
+        prev = self.margin_by_dex.get(dex_key)
+        changes = {
+            k: (prev.get(k) if prev else None, v)
+            for k, v in margin.items()
+            if k != "time" and (prev is None or prev.get(k) != v)
+        }
+        if prev is not None and not changes:
+            prev["time"] = margin.get("time")
+            return
+        self.margin_by_dex[dex_key] = margin
+        if self._event_queues and prev is not None:
+            self._emit({
+                "type": "margin",
+                "symbol": None,
+                "dex": dex_key,
+                "account_value": margin["accountValue"],
+                "withdrawable": margin["withdrawable"],
+                "prev_account_value": prev.get("accountValue"),
+                "prev_withdrawable": prev.get("withdrawable"),
+                "changes": changes,   # {key: (이전, 현재)}
+                "ts": now,
+                "source": "ws",
+            })
+
+    def _apply_positions(self, dex_key: str, asset_positions: List[Dict[str, Any]], now: int) -> None:
+        """
+        dex 1개의 assetPositions 를 이전 원본과 코인 단위로 비교해 반영.
+        - 원본이 같으면 기존 정규화 결과 유지(_normalize_position 생략)
+        - 바뀐/새 코인만 정규화, 사라진 코인은 제거
+        - 포지션 이벤트: opened / closed / resized / flipped (리스너가 있을 때만)
+        """
+        prev_raw = self._pos_raw_by_dex.get(dex_key)
+        first = prev_raw is None
+        prev_raw = prev_raw or {}
+        norm_map = self.positions_by_dex_norm.setdefault(dex_key, {})
+
+        cur_raw: Dict[str, Dict[str, Any]] = {}
+        changed = first
+        for ap in asset_positions:
+            pos = (ap or {}).get("position") or {}
+            if not pos:
+                continue
+            coin_raw = str(pos.get("coin") or "")
+            cur_raw[coin_raw] = pos
+            old_pos = prev_raw.get(coin_raw)
+            if old_pos == pos and coin_raw.upper() in norm_map:
+                continue
+            changed = True
+            try:
+                norm = self._normalize_position(pos)
+            except Exception:
+                continue
+            old_norm = norm_map.get(coin_raw.upper())
+            norm_map[coin_raw.upper()] = norm
+            if ":" in coin_raw:
+                norm_map[coin_raw] = norm
+            if not first:
+                self._emit_position_change(coin_raw.upper(), old_norm, norm, now)
+
+        for coin_raw in set(prev_raw) - set(cur_raw):
+            changed = True
+            old_norm = norm_map.pop(coin_raw.upper(), None)
+            norm_map.pop(coin_raw, None)
+            if not first:
+                self._emit_position_change(coin_raw.upper(), old_norm, None, now)
+
+        self._pos_raw_by_dex[dex_key] = cur_raw
+        if changed:
+            self.positions_by_dex_raw[dex_key] = list(cur_raw.values())
+
+    def _emit_position_change(self, coin: str, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]], now: int) -> None:
+        if not self._event_queues:
+            return
+        o_sig = (old.get("side"), old.get("size") or 0.0) if old and old.get("size") else (None, 0.0)
+        n_sig = (new.get("side"), new.get("size") or 0.0) if new and new.get("size") else (None, 0.0)
+        if o_sig == n_sig:
+            return  # 크기/방향 변화 없음(upnl/청산가 등만 변경)
+        if o_sig[0] is None:
+            change = "opened"
+        elif n_sig[0] is None:
+            change = "closed"
+        elif o_sig[0] != n_sig[0]:
+            change = "flipped"
+        else:
+            change = "resized"
+        self._emit({
+            "type": "position",
+            "change": change,
+            "symbol": coin,
+            "side": n_sig[0],
+            "size": n_sig[1],
+            "prev_side": o_sig[0],
+            "prev_size": o_sig[1],
+            "ts": now,
+            "source": "ws",
+        })
+
     def _update_from_webData3(self, data: Dict[str, Any]) -> None:
         """
         webData3 포맷을 DEX별로 분리 파싱해 내부 캐시에 반영.
@@ -652,14 +1105,15 @@ class HLWSClientRaw:
         except Exception as e:
             ws_logger.debug(f"[webData3] update error: {e}", exc_info=True)
 
-    def _normalize_position(self, pos: Dict[str, Any]) -> Dict[str, Any]:
+    def _normalize_position(self, pos: Dict[str, Any]) -> HLPosition:
         """
-        webData3.clearinghouseState.assetPositions[*].position → 표준화 dict
-        반환 키:
-        - coin: str
-        - size: float(절대값), side: 'long'|'short'
-        - entry_px, position_value, upnl, roe, liq_px, margin_used: float|None
-        - lev_type: 'cross'|'isolated'|..., lev_value: int|None, max_leverage: int|None
+        webData3.clearinghouseState.assetPositions[*].position → HLPosition 레코드(mpdex.utils.records)
+        필드:
+        - symbol: str (예전 키 'coin')
+        - size: float(절대값), side: 'long'|'short'|'flat'
+        - entry_price, position_value, unrealized_pnl, roe, liq_price, margin_used: float|None
+        - lev_type: 'cross'|'isolated'|..., leverage: int|None, max_leverage: int|None
+        - 예전 키(coin/entry_px/upnl/liq_px/lev_value)도 키 목록/in/to_dict 에 그대로 포함, 원본은 .raw
         """
         def f(x, default=None):
             try:
@@ -675,21 +1129,21 @@ class HLWSClientRaw:
             lev_value = int(float(lev.get("value"))) if lev.get("value") is not None else None
         except Exception:
             lev_value = None
-        return {
-            "coin": coin,
-            "size": abs(float(szi)),
-            "side": side,
-            "entry_px": f(pos.get("entryPx"), None),
-            "position_value": f(pos.get("positionValue"), None),
-            "upnl": f(pos.get("unrealizedPnl"), None),
-            "roe": f(pos.get("returnOnEquity"), None),
-            "liq_px": f(pos.get("liquidationPx"), None),
-            "margin_used": f(pos.get("marginUsed"), None),
-            "lev_type": lev_type,
-            "lev_value": lev_value,
-            "max_leverage": (int(float(pos.get("maxLeverage"))) if pos.get("maxLeverage") is not None else None),
-            "raw": pos,  # 원본도 보관(디버깅/확장용)
-        }
+        return HLPosition(
+            symbol=coin,
+            size=abs(float(szi)),
+            side=side,
+            entry_price=f(pos.get("entryPx"), None),
+            position_value=f(pos.get("positionValue"), None),
+            unrealized_pnl=f(pos.get("unrealizedPnl"), None),
+            roe=f(pos.get("returnOnEquity"), None),
+            liq_price=f(pos.get("liquidationPx"), None),
+            margin_used=f(pos.get("marginUsed"), None),
+            lev_type=lev_type,
+            leverage=lev_value,
+            max_leverage=(int(float(pos.get("maxLeverage"))) if pos.get("maxLeverage") is not None else None),
+            raw=pos,  # 원본은 참조만 보관(디버깅/확장용)
+        )
 
     # [추가] 정규화 포지션 전체 반환(사본)
     def get_positions(self) -> Dict[str, Dict[str, Any]]:
@@ -787,8 +1241,60 @@ class HLWSClientRaw:
     #def get_spot_px_base(self, base: str) -> Optional[float]:
     #    return self.spot_base_px.get(base.upper())
 
-    def get_open_orders(self) -> List[Dict[str, Any]]:
-        return list(self.open_orders)
+    # ---------------------- 미체결 주문 인덱스 ----------------------
+
+    @property
+    def open_orders(self) -> List[Dict[str, Any]]:
+        """전체 미체결 주문(사본 리스트). 심볼별 조회는 get_open_orders(symbol) 사용."""
+        return list(self._orders_by_oid.values())
+
+    @open_orders.setter
+    def open_orders(self, orders: List[Dict[str, Any]]) -> None:
+        # 스냅샷 전체 교체
+        self._orders_by_oid, self._oids_by_symbol, self._oid_by_cloid = {}, {}, {}
+        for o in orders or []:
+            self._index_order(o)
+
+    def _index_order(self, o: Dict[str, Any]) -> None:
+        oid = o.get("order_id")
+        prev = self._orders_by_oid.get(oid)
+        if prev is not None and (prev.get("symbol") != o.get("symbol") or prev.get("client_id") != o.get("client_id")):
+            self._unindex_order(oid)
+        self._orders_by_oid[oid] = o
+        self._oids_by_symbol.setdefault(o["symbol"], {})[oid] = None
+        if o.get("client_id"):
+            self._oid_by_cloid[o["client_id"]] = oid
+
+    def _unindex_order(self, oid: Any) -> Optional[Dict[str, Any]]:
+        o = self._orders_by_oid.pop(oid, None)
+        if o is None:
+            return None
+        oids = self._oids_by_symbol.get(o["symbol"])
+        if oids is not None:
+            oids.pop(oid, None)
+            if not oids:
+                self._oids_by_symbol.pop(o["symbol"], None)
+        # 같은 cloid 가 다른 oid 로 재사용된 경우 그 매핑은 유지
+        if o.get("client_id") and self._oid_by_cloid.get(o["client_id"]) == oid:
+            self._oid_by_cloid.pop(o["client_id"], None)
+        return o
+
+    def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """symbol 지정 시 해당 심볼 주문만(O(k)), 없으면 전체."""
+        if symbol is None:
+            return self.open_orders
+        oids = self._oids_by_symbol.get(str(symbol).strip().upper()) or {}
+        return [self._orders_by_oid[oid] for oid in oids]
+
+    def get_order(self, oid: Any) -> Optional[Dict[str, Any]]:
+        try:
+            return self._orders_by_oid.get(int(oid))
+        except (TypeError, ValueError):
+            return None
+
+    def get_order_by_cloid(self, cloid: str) -> Optional[Dict[str, Any]]:
+        oid = self._oid_by_cloid.get(str(cloid))
+        return self._orders_by_oid.get(oid) if oid is not None else None
 
     async def connect(self) -> None:
         ws_logger.info(f"WS connect: {self.ws_url}")
@@ -813,8 +1319,10 @@ class HLWSClientRaw:
 
     def build_subscriptions(self) -> List[Dict[str, Any]]:
         subs: list[dict] = []
-        # 1) scope별 allMids
-        if self.dex:
+        # 1) scope별 allMids (선택 구독 모드면 생략)
+        if self.selective:
+            pass
+        elif self.dex:
             subs.append({"type":"allMids","dex": self.dex})
         else:
             subs.append({"type":"allMids"})  # HL(메인)
@@ -852,7 +1360,9 @@ class HLWSClientRaw:
             raise RuntimeError("WebSocket is not connected")
 
         subs = self.build_subscriptions()
-        self._subscriptions = subs  # 재연결 시 재사용
+        # 재연결 시 재사용([CHANGED] 연결 전에 등록된 코인/추가 구독도 유지)
+        self._subscriptions = subs + [x for x in self._subscriptions if all(_sub_key(x) != _sub_key(y) for y in subs)]
+        subs = self._subscriptions
 
         for sub in subs:
             await self._send_subscribe(sub)
@@ -916,6 +1426,20 @@ class HLWSClientRaw:
                 ws_logger.debug(f"non-json message: {str(raw)[:200]}")
                 continue
 
+            if metrics.is_enabled():
+                # [ADDED] 채널별 수신 바이트 + 파싱/디스패치 처리 시간
+                t0 = time.perf_counter()
+                err = False
+                try:
+                    self._dispatch(msg)
+                except Exception:
+                    err = True
+                    ws_logger.exception("dispatch error")
+                ch = str(msg.get("channel") or msg.get("type") or "") if isinstance(msg, dict) else ""
+                metrics.record("hyperliquid", "ws", ch or "unknown", time.perf_counter() - t0,
+                               error=err, bytes_in=len(raw))
+                continue
+
             try:
                 self._dispatch(msg)
             except Exception:
@@ -954,8 +1478,7 @@ class HLWSClientRaw:
                 if no:
                     normalized.append(no)
             self.open_orders = normalized
-            if self._open_orders_ready and not self._open_orders_ready.is_set():
-                self._open_orders_ready.set()
+            self._touch_user("open_orders", self._open_orders_ready)
             return
 
         if ch == "allMids":
@@ -974,25 +1497,9 @@ class HLWSClientRaw:
                         except Exception:
                             continue
 
-                        pair_name = self.spot_asset_index_to_pair.get(pair_idx)   # 'BASE/QUOTE'
-                        bq_tuple  = self.spot_asset_index_to_bq.get(pair_idx)     # (BASE, QUOTE)
-
-                        if not pair_name or not bq_tuple:
-                            # 페어 맵 미준비 → 보류
-                            continue
-
-                        base, quote = bq_tuple
-
-                        # 1-1) 페어 가격 캐시
-                        self.spot_pair_prices[pair_name] = px
-                        self._notify_spot_pair(pair_name)
-                        
-                        # 1-2) 쿼트가 USDC인 경우 base 단일 가격도 채움
-                        if quote == "USDC":
-                            self.spot_prices[base] = px
-                            self._notify_spot_base(base)
-                        
-                        n_pair += 1
+                        # 페어 가격 캐시(+USDC 쿼트면 base 가격). 페어 맵 미준비/신규 상장 → 보류 큐(메타 갱신 시 재적용)
+                        if self._apply_spot_index_mid(pair_idx, px):
+                            n_pair += 1
                         continue
 
                     # 2) 텍스트 페어 'AAA/USDC' → pair 캐시, USDC 쿼트면 base 캐시
@@ -1035,9 +1542,32 @@ class HLWSClientRaw:
             spot = data_body.get("spotState") or {}
             balances_list = spot.get("balances") or []
             self._update_spot_balances(balances_list)
+            self._touch_user("spot", self._spot_ready)
 
             return
         
+        # [ADDED] 선택 구독 모드 가격(코인별)
+        if ch in ("activeAssetCtx", "activeSpotAssetCtx"):
+            self._on_active_asset_ctx(msg.get("data") or {})
+            return
+
+        if ch == "bbo":
+            self._on_bbo(msg.get("data") or {})
+            return
+
+        if ch == "l2Book":
+            self._on_l2_book(msg.get("data") or {})
+            return
+
+        # [ADDED] 주문 상태 변화 / 체결 (order_events 용)
+        if ch == "orderUpdates":
+            self._on_order_updates(msg.get("data"))
+            return
+
+        if ch == "userFills":
+            self._on_user_fills(msg.get("data") or {})
+            return
+
         # 통합 Perp 계정 상태
         if ch == "allDexsClearinghouseState":
             data_body = msg.get("data") or {}
@@ -1050,6 +1580,7 @@ class HLWSClientRaw:
         #    self._update_from_webData3(data_body)
 
     async def _handle_disconnect(self) -> None:
+        self._invalidate()  # [ADDED] 재연결 동안 이전 값을 최신으로 내주지 않도록
         await self._safe_close_only()
         await self._reconnect_with_backoff()
 
@@ -1118,6 +1649,184 @@ class HLWSClientRaw:
         return float(total)
 
 
+# [ADDED] 샤딩 모드 ------------------------------------------------------------
+# 시장 데이터(allMids/bbo 등, 유저 무관) 구독은 공유 커넥션 1개로,
+# 유저 채널은 여러 주소를 소수의 mux 커넥션에 묶어서 전송한다.
+_MARKET_SUB_TYPES = {"allMids", "bbo", "l2Book", "trades", "activeAssetCtx", "candle"}
+
+class HLWSUserMux(HLWSClientRaw):
+    """
+    여러 주소의 유저 채널을 하나의 WS 커넥션에 묶고, 메시지를 data.user 로 주소별 view 에 라우팅.
+    - orderUpdates 는 메시지에 user 가 없어 라우팅 불가 → 커넥션당 1개 주소만 허용
+    """
+
+    def __init__(self, ws_url: str, http_base: str, max_subs: int):
+        super().__init__(ws_url=ws_url, dex=None, address=None, coins=[], http_base=http_base)
+        self.max_subs = int(max_subs)
+        self._routes: Dict[str, "HLWSUserView"] = {}
+        self._subs_by_addr: Dict[str, List[Dict[str, Any]]] = {}
+        self.order_updates_owner: Optional[str] = None
+
+    def has_room(self, n: int) -> bool:
+        return len(self._subscriptions) + int(n) <= self.max_subs
+
+    @property
+    def empty(self) -> bool:
+        return not self._routes
+
+    def attach(self, view: "HLWSUserView") -> None:
+        self._routes[view.address.lower()] = view
+        self._subs_by_addr.setdefault(view.address, [])
+
+    async def add_sub(self, view: "HLWSUserView", sub: Dict[str, Any]) -> None:
+        if sub.get("type") == "orderUpdates":
+            if self.order_updates_owner not in (None, view.address):
+                raise RuntimeError("orderUpdates already owned by another address on this connection")
+            self.order_updates_owner = view.address
+        k = _sub_key(sub)
+        if all(_sub_key(x) != k for x in self._subscriptions):
+            self._subscriptions.append(sub)
+            self._subs_by_addr.setdefault(view.address, []).append(sub)
+        if self.conn:
+            await self._send_subscribe(sub)
+
+    async def detach(self, view: "HLWSUserView") -> None:
+        self._routes.pop(view.address.lower(), None)
+        subs = self._subs_by_addr.pop(view.address, [])
+        keys = {_sub_key(x) for x in subs}
+        self._subscriptions = [x for x in self._subscriptions if _sub_key(x) not in keys]
+        if self.order_updates_owner == view.address:
+            self.order_updates_owner = None
+        if not self.conn:
+            self._active_subs -= keys
+            return
+        for sub in subs:
+            k = _sub_key(sub)
+            if k not in self._active_subs:
+                continue
+            try:
+                async with self._send_lock:
+                    await self.conn.send(json.dumps({"method": "unsubscribe", "subscription": sub}, separators=(",", ":")))
+            except Exception:
+                pass
+            self._active_subs.discard(k)
+
+    def build_subscriptions(self) -> List[Dict[str, Any]]:
+        return list(self._subscriptions)
+
+    def _invalidate(self) -> None:
+        # mux 끊김 → 묶인 주소들의 유저 캐시 무효화(가격은 market 커넥션 소관)
+        for view in list(self._routes.values()):
+            view._invalidate_user()
+
+    async def subscribe(self) -> None:
+        if not self.conn:
+            raise RuntimeError("WebSocket is not connected")
+        for sub in list(self._subscriptions):
+            await self._send_subscribe(sub)
+
+    async def ensure_connected_and_subscribed(self) -> None:
+        if not self.connected:
+            await self.connect()
+        await self.subscribe()
+
+    def _dispatch(self, msg: Dict[str, Any]) -> None:
+        ch = str(msg.get("channel") or msg.get("type") or "")
+        if ch in ("error", "pong", "subscriptionResponse") or not ch:
+            return super()._dispatch(msg)
+        if ch == "orderUpdates":
+            view = self._routes.get((self.order_updates_owner or "").lower())
+        else:
+            data = msg.get("data")
+            user = str(data.get("user") or "").lower() if isinstance(data, dict) else ""
+            view = self._routes.get(user)
+        if view is not None:
+            view._dispatch(msg)
+        else:
+            ws_logger.debug(f"[mux] unroutable {ch}")
+
+class HLWSUserView(HLWSClientRaw):
+    """
+    샤딩 모드의 주소별 상태 객체(HLWSClientRaw 와 같은 캐시/조회 API).
+    - 소켓을 직접 갖지 않음: 유저 구독은 mux 로, 시장 구독은 공유 market 커넥션으로 위임
+    - 가격 캐시/이벤트는 market 클라이언트의 dict 를 그대로 공유(참조)
+    """
+
+    def __init__(
+        self,
+        market: HLWSClientRaw,
+        mux: HLWSUserMux,
+        address: str,
+        http_base: str,
+        order_mux_factory: Optional[Callable[[], Awaitable[HLWSUserMux]]] = None,
+    ):
+        super().__init__(ws_url=market.ws_url, dex=None, address=address, coins=[], http_base=http_base)
+        self.market = market
+        self.mux = mux
+        # mux 의 orderUpdates 자리가 이미 차 있으면 주문 이벤트 전용 mux 를 따로 받음
+        self.order_mux: Optional[HLWSUserMux] = None
+        self._order_mux_factory = order_mux_factory
+        self.prices = market.prices
+        self.spot_prices = market.spot_prices
+        self.spot_pair_prices = market.spot_pair_prices
+        self._price_events = market._price_events
+        self.bbo = market.bbo
+        self.books = market.books
+        self._price_ts = market._price_ts
+        self.selective = market.selective
+
+    @property
+    def connected(self) -> bool:
+        return self.mux.connected
+
+    def _price_stale_mark(self) -> float:
+        return self.market._price_stale_before
+
+    async def _send_subscribe(self, sub: dict) -> None:
+        if sub.get("type") in _MARKET_SUB_TYPES and not sub.get("user"):
+            await self.market._send_subscribe(sub)
+            return
+        if all(_sub_key(x) != _sub_key(sub) for x in self._subscriptions):
+            self._subscriptions.append(sub)
+        await self.mux.add_sub(self, sub)
+
+    async def ensure_allmids_for(self, dex: Optional[str]) -> None:
+        await self.market.ensure_allmids_for(dex)
+
+    async def ensure_price_sub(self, symbol: str, *, kind: str = "perp", bbo: bool = False) -> bool:
+        return await self.market.ensure_price_sub(symbol, kind=kind, bbo=bbo)
+
+    async def ensure_book_sub(self, coin: str) -> None:
+        await self.market.ensure_book_sub(coin)
+
+    async def ensure_order_event_subs(self) -> None:
+        target = self.order_mux or self.mux
+        if target.order_updates_owner not in (None, self.address):
+            if self._order_mux_factory is None:
+                raise RuntimeError("orderUpdates slot is taken on this connection")
+            target = self.order_mux = await self._order_mux_factory()
+            target.attach(self)
+        for sub in (
+            {"type": "orderUpdates", "user": self.address},
+            {"type": "userFills", "user": self.address},
+        ):
+            if all(_sub_key(x) != _sub_key(sub) for x in self._subscriptions):
+                self._subscriptions.append(sub)
+            await target.add_sub(self, sub)
+        if not target.connected:
+            await target.ensure_connected_and_subscribed()
+
+    async def ensure_connected_and_subscribed(self) -> None:
+        for sub in self.build_subscriptions():
+            await self._send_subscribe(sub)
+        if not self.mux.connected:
+            await self.mux.ensure_connected_and_subscribed()
+
+    async def close(self) -> None:
+        await self.mux.detach(self)
+        if self.order_mux is not None:
+            await self.order_mux.detach(self)
+
 class HLWSClientPool:
     """
     (ws_url, address) 단위로 HLWSClientRaw를 1개만 생성/공유하는 풀.
@@ -1136,6 +1845,85 @@ class HLWSClientPool:
         self._shared_spot_name2idx: Dict[str, int] = {}
         self._shared_spot_pair_by_index: Dict[int, str] = {}
         self._shared_spot_bq_by_index: Dict[int, tuple[str, str]] = {}
+        # [ADDED] 샤딩 모드(기본 off): market 커넥션 1개 + 유저 채널 mux 커넥션 N개
+        self.sharded: bool = False
+        self.max_user_subs_per_conn: int = 64
+        self._muxes: dict[str, List[HLWSUserMux]] = {}   # ws_url → mux 목록
+        self._mux_lock = asyncio.Lock()
+        # [ADDED] 선택 구독 모드(기본 off): allMids 대신 요청된 코인만 구독
+        self.selective_market_data: bool = False
+
+    def configure(
+        self,
+        *,
+        sharded: Optional[bool] = None,
+        max_user_subs_per_conn: Optional[int] = None,
+        selective_market_data: Optional[bool] = None,
+    ) -> None:
+        """
+        sharded=True: 주소별 커넥션 대신
+          - allMids 등 시장 데이터는 공유 커넥션 1개(주소 없음)
+          - 유저 채널(clearinghouse/spotState/openOrders/userFills...)은 주소 여러 개를 한 커넥션에 묶음
+            (커넥션당 구독 수 max_user_subs_per_conn 이하)
+        selective_market_data=True: allMids 전체 구독 대신 get_mark_price_ws 로 요청된 코인만
+          activeAssetCtx(옵션 bbo)로 구독. 코인 구독으로 가격을 못 받으면 호출측에서 allMids 로 폴백.
+        이미 생성된 클라이언트에는 적용되지 않으므로 acquire 전에 호출할 것.
+        """
+        if sharded is not None:
+            self.sharded = bool(sharded)
+        if max_user_subs_per_conn is not None:
+            self.max_user_subs_per_conn = max(4, int(max_user_subs_per_conn))
+        if selective_market_data is not None:
+            self.selective_market_data = bool(selective_market_data)
+
+    async def _pick_mux(self, ws_url: str, http_base: str, n_subs: int, *, for_orders: bool = False) -> HLWSUserMux:
+        async with self._mux_lock:
+            lst = self._muxes.setdefault(ws_url, [])
+            if for_orders:
+                # orderUpdates 에는 user 필드가 없어 커넥션당 1주소만 라우팅 가능
+                for m in lst:
+                    if m.has_room(n_subs) and m.order_updates_owner is None:
+                        return m
+                m = HLWSUserMux(ws_url, http_base, self.max_user_subs_per_conn)
+                lst.append(m)
+                return m
+            for m in lst:
+                # orderUpdates 는 커넥션당 1주소 → 주문 이벤트용 여유가 있는 mux 우선
+                if m.has_room(n_subs + 2) and m.order_updates_owner is None:
+                    return m
+            for m in lst:
+                if m.has_room(n_subs):
+                    return m
+            m = HLWSUserMux(ws_url, http_base, self.max_user_subs_per_conn)
+            lst.append(m)
+            return m
+
+    async def _create_view(self, *, ws_url: str, http_base: str, address: str, dex: Optional[str]) -> "HLWSUserView":
+        market = await self.acquire(ws_url=ws_url, http_base=http_base, address=None, dex=dex)
+        n_subs = 3  # allDexsClearinghouseState / spotState / openOrders
+        wss = http_to_wss(ws_url)
+        mux = await self._pick_mux(wss, http_base, n_subs)
+        view = HLWSUserView(
+            market, mux, address, http_base,
+            order_mux_factory=lambda: self._pick_mux(wss, http_base, 2, for_orders=True),
+        )
+        mux.attach(view)
+        async with self._shared_lock:
+            self._apply_shared_to_client_unlocked(view)
+        return view
+
+    async def _close_view(self, view: "HLWSUserView", ws_url: str) -> None:
+        await view.close()
+        async with self._mux_lock:
+            lst = self._muxes.get(http_to_wss(ws_url), [])
+            for m in (view.mux, view.order_mux):
+                if m is not None and m in lst and m.empty:
+                    lst.remove(m)
+                    try:
+                        await m.close()
+                    except Exception:
+                        pass
+        await self.release(ws_url=ws_url, address=None)
 
                 
     # 초기 1회만 공유 메타를 주입(이미 primed면 무시)
@@ -1163,6 +1951,68 @@ class HLWSClientPool:
             self._shared_spot_pair_by_index = dict(pair_by_index or {})
             self._shared_spot_bq_by_index = dict(bq_by_index or {})
             self._shared_primed = True  # comment: 이후 호출은 무시
+            # [ADDED] 메타 없이 먼저 생성된 클라이언트(예: TreadFi)에도 반영
+            for c in self._clients.values():
+                self._apply_shared_to_client_unlocked(c)
+
+    # [ADDED] 신규 상장(HIP-3 dex / 스팟 페어) 반영용 메타 재주입(프라임 여부와 무관하게 항상 적용)
+    async def refresh_shared_meta(
+        self,
+        *,
+        dex_order: Optional[List[str]] = None,
+        idx2name: Optional[Dict[int, str]] = None,
+        name2idx: Optional[Dict[str, int]] = None,
+        pair_by_index: Optional[Dict[int, str]] = None,
+        bq_by_index: Optional[Dict[int, Tuple[str, str]]] = None,
+    ) -> Dict[str, List[Any]]:
+        """
+        공유 메타를 교체하고 풀의 모든 클라이언트(주소별/market/샤딩 view·mux)에 다시 주입.
+        - None 으로 넘긴 항목은 기존 값 유지
+        - 각 클라이언트는 새 맵으로 한 번에 교체 후, 매핑 전이라 보류됐던 '@{pairIdx}' 가격을 재적용
+        반환: {"dex": 새 DEX 키 목록, "spot": 새 페어 인덱스 목록}
+        """
+        async with self._shared_lock:
+            new_dex: List[Any] = []
+            new_spot: List[Any] = []
+            if dex_order is not None:
+                ks, seen = [], set()
+                for k in dex_order:
+                    kk = str(k).lower().strip()
+                    if kk and kk not in seen:
+                        ks.append(kk); seen.add(kk)
+                if ks:
+                    new_dex = [k for k in ks if k not in self._shared_dex_order]
+                    self._shared_dex_order = ks
+            if idx2name is not None:
+                self._shared_spot_idx2name = dict(idx2name)
+            if name2idx is not None:
+                self._shared_spot_name2idx = {str(k).upper(): int(v) for k, v in name2idx.items()}
+            if pair_by_index is not None:
+                new_spot = sorted(set(pair_by_index) - set(self._shared_spot_pair_by_index))
+                self._shared_spot_pair_by_index = dict(pair_by_index)
+            if bq_by_index is not None:
+                self._shared_spot_bq_by_index = dict(bq_by_index)
+            self._shared_primed = True
+            for c in self._all_clients_unlocked():
+                try:
+                    self._apply_shared_to_client_unlocked(c)
+                except Exception:
+                    pass
+            return {"dex": new_dex, "spot": new_spot}
+
+    def _all_clients_unlocked(self) -> List[HLWSClientRaw]:
+        # 주소별 클라이언트/view + market(주소 없음, _clients 에 포함) + 샤딩 mux (중복 제거)
+        out: List[HLWSClientRaw] = []
+        seen = set()
+        for c in list(self._clients.values()) + [m for lst in self._muxes.values() for m in lst]:
+            if id(c) not in seen:
+                seen.add(id(c))
+                out.append(c)
+        return out
+
+    @property
+    def shared_primed(self) -> bool:
+        return self._shared_primed
 
     def _apply_shared_to_client_unlocked(self, c: HLWSClientRaw) -> None:
         # [INTERNAL] _shared_lock 보유 상태에서만 호출
@@ -1206,19 +2056,27 @@ class HLWSClientPool:
         이후 요청된 dex의 allMids를 추가 구독.
         """
         # per-key 락 전에 공유 스냅샷을 1회 주입 시도(데드락 회피)
-        await self.prime_shared_meta(
-            dex_order=dex_order,
-            idx2name=idx2name,
-            name2idx=name2idx,
-            pair_by_index=pair_by_index,
-            bq_by_index=bq_by_index,
-        )
+        # [CHANGED] 메타를 넘기지 않은 호출은 prime 하지 않음(이후 HL 인스턴스의 메타가 반영되도록)
+        if any(x is not None for x in (dex_order, idx2name, name2idx, pair_by_index, bq_by_index)):
+            await self.prime_shared_meta(
+                dex_order=dex_order,
+                idx2name=idx2name,
+                name2idx=name2idx,
+                pair_by_index=pair_by_index,
+                bq_by_index=bq_by_index,
+            )
 
         key = self._key(ws_url, address)
         lock = self._get_lock(key)
         async with lock:
             client = self._clients.get(key)
-            if client is None:
+            if client is None and self.sharded and address:
+                # [ADDED] 샤딩 모드: 주소별 view(소켓 없음) + 공유 market/mux 커넥션
+                client = await self._create_view(ws_url=ws_url, http_base=http_base, address=address, dex=dex)
+                await client.ensure_connected_and_subscribed()
+                self._clients[key] = client
+                self._refcnt[key] = 0
+            elif client is None:
                 # [ADDED] 최초 생성: dex=None로 만들어 HL 메인 allMids만 기본 구독
                 client = HLWSClientRaw(
                     ws_url=http_to_wss(ws_url),
@@ -1227,6 +2085,7 @@ class HLWSClientPool:
                     coins=[],
                     http_base=http_base,
                 )
+                client.selective = self.selective_market_data
                 async with self._shared_lock:
                     self._apply_shared_to_client_unlocked(client)
                 await client.ensure_connected_and_subscribed()
@@ -1236,8 +2095,9 @@ class HLWSClientPool:
             # 참조 카운트 증가
             self._refcnt[key] += 1
 
-        # 락 밖에서 dex allMids 추가 구독(중복 방지 로직 보유)
-        await client.ensure_allmids_for(dex)
+        # 락 밖에서 dex allMids 추가 구독(중복 방지 로직 보유) — 선택 구독 모드는 필요 시에만
+        if not client.selective:
+            await client.ensure_allmids_for(dex)
         return client
 
     async def release(self, *, ws_url: str, address: Optional[str]) -> None:
@@ -1251,7 +2111,10 @@ class HLWSClientPool:
                 client = self._clients.pop(key)
                 self._refcnt.pop(key, None)
                 try:
-                    await client.close()
+                    if isinstance(client, HLWSUserView):
+                        await self._close_view(client, ws_url)
+                    else:
+                        await client.close()
                 except Exception:
                     pass
                 # 락은 재사용 가능하므로 남겨둠
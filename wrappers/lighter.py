@@ -2,10 +2,17 @@ from multi_perp_dex import MultiPerpDex, MultiPerpDexMixin
 from lighter.signer_client import SignerClient
 from lighter.api.account_api import AccountApi
 from lighter.api.order_api import OrderApi
+from lighter.api.transaction_api import TransactionApi
 import aiohttp
+from mpdex.utils.common_http import new_session
+from mpdex.utils.common_lighter import LighterNonceManager, call_signer, TX_TYPE_CREATE_ORDER, TX_TYPE_CANCEL_ORDER, CODE_OK
+from mpdex.utils.records import Collateral, Position
 import time
 import json
 import logging
+import asyncio
+import inspect
+from typing import Optional
 
 class LighterExchange(MultiPerpDexMixin, MultiPerpDex):
     def __init__(self, account_id, private_key, api_key_id, l1_address):
@@ -16,34 +23,107 @@ class LighterExchange(MultiPerpDexMixin, MultiPerpDex):
         #self.apiAccount = AccountApi(self.client.api_client)
         self.apiOrder = OrderApi(self.client.api_client)
         self.market_info = {}
+        self._market_id_to_symbol = {}  # [ADDED] market_id → symbol (역방향 O(1) 조회)
         self._cached_auth_token = None
-        self._auth_expiry_ts = 0
+        self._auth_expiry_ts = 0            # [CHANGED] 토큰 만료 wall-clock(unix sec)
+        self.auth_ttl_sec = 600             # 발급 토큰 유효기간(SDK 기본 10분)
+        self.auth_refresh_margin_sec = 60   # 만료 이 시간 전에 미리 재발급
+        self._auth_task: Optional[asyncio.Task] = None
         self.l1_address = l1_address
+        # [ADDED] 낙관적 nonce + 배치 전송 큐
+        self.api_key_id = api_key_id
+        self.max_batch_size = 50
+        self._nonces = LighterNonceManager(self._fetch_next_nonce)
+        self._tx_queue = []
+        self._tx_flusher: Optional[asyncio.Task] = None
 
-    def get_auth(self, expiry_sec=600):
+    def _sign_auth_token(self, expiry_sec):
+        """
+        SDK 버전에 따라 deadline 의미가 다름:
+        - 신규(timestamp 인자 있음): 현재 시각 기준 '기간(sec)'
+        - 구버전: 절대 만료 시각(unix sec)
+        반환: (token, 만료 unix sec)
+        """
         now = int(time.time())
-        if self._cached_auth_token is None or now >= self._auth_expiry_ts:
-            self._auth_expiry_ts = int(expiry_sec/60)
-            self._cached_auth_token, _ = self.client.create_auth_token_with_expiry(self._auth_expiry_ts)
+        fn = self.client.create_auth_token_with_expiry
+        try:
+            relative = "timestamp" in inspect.signature(fn).parameters
+        except (TypeError, ValueError):
+            relative = False
+        token, err = fn(int(expiry_sec) if relative else now + int(expiry_sec))
+        if err:
+            raise RuntimeError(f"lighter auth token error: {err}")
+        return token, now + int(expiry_sec)
+
+    def get_auth(self, expiry_sec=None):
+        # 캐시가 유효하면 서명 없이 반환(핫패스). 만료 margin 이내면 재발급.
+        now = time.time()
+        if self._cached_auth_token is None or now >= self._auth_expiry_ts - self.auth_refresh_margin_sec:
+            self._cached_auth_token, self._auth_expiry_ts = self._sign_auth_token(expiry_sec or self.auth_ttl_sec)
+        self._start_auth_refresher()
         return self._cached_auth_token
-    
+
+    async def _auth_refresh_loop(self):
+        # 만료 margin 전에 미리 재발급해서 조회 경로에서는 서명이 일어나지 않게 함
+        while True:
+            try:
+                wait = self._auth_expiry_ts - self.auth_refresh_margin_sec - time.time()
+                if self._cached_auth_token is not None and wait > 0:
+                    await asyncio.sleep(wait)
+                self._cached_auth_token, self._auth_expiry_ts = self._sign_auth_token(self.auth_ttl_sec)
+            except asyncio.CancelledError:
+                return
+            except Exception as e:
+                logging.warning(f"[lighter] auth refresh failed: {e}")
+                await asyncio.sleep(5)
+
+    def _start_auth_refresher(self):
+        if self._auth_task is not None and not self._auth_task.done():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # 루프 밖(동기 호출)에서는 on-demand 발급만
+        self._auth_task = asyncio.create_task(self._auth_refresh_loop(), name="lighter-auth-refresh")
+
     # use initialize when using main account
     async def initialize(self):
         await self.client.set_account_index()
+        self._start_auth_refresher()
 
     async def initialize_market_info(self):
-        async with aiohttp.ClientSession() as session:
+        async with new_session("lighter") as session:
             async with session.get(f"{self.url}/api/v1/orderBooks") as resp:
                 data = await resp.json()
+                # [CHANGED] 새 dict 에 만든 뒤 한 번에 교체 → 정/역방향 인덱스가 항상 일치
+                market_info = {}
                 for m in data["order_books"]:
-                    self.market_info[m["symbol"].upper()] = {
+                    market_info[m["symbol"].upper()] = {
                         "market_id": m["market_id"],
                         "size_decimals": m["supported_size_decimals"],
                         "price_decimals": m["supported_price_decimals"]
                     }
+                self.market_info = market_info
+                self._market_id_to_symbol = {int(v["market_id"]): k for k, v in market_info.items()}
+        self._start_auth_refresher()
         return self
     
     async def close(self):
+        if self._auth_task is not None and not self._auth_task.done():
+            self._auth_task.cancel()
+        self._auth_task = None
+        # [ADDED] 배치 전송 flusher 정리 + 대기 중인 요청은 실패로 응답
+        if self._tx_flusher is not None and not self._tx_flusher.done():
+            self._tx_flusher.cancel()
+            try:
+                await self._tx_flusher
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._tx_flusher = None
+        for _, _, fut in self._tx_queue:
+            if not fut.done():
+                fut.set_result({"code": "FAILED", "message": "exchange closed", "tx_hash": None})
+        self._tx_queue = []
         await self.client.close()
     
     async def get_mark_price(self, symbol):
@@ -53,7 +133,7 @@ class LighterExchange(MultiPerpDexMixin, MultiPerpDex):
         price = res.to_dict()["order_book_details"][0]["last_trade_price"]
         return price
 
-    async def create_order(self, symbol, side, amount, price=None, order_type='market'):
+    def _build_order_params(self, symbol, side, amount, price=None, order_type='market'):
         if price is not None:
             order_type = 'limit'
         m_info = self.market_info[symbol]
@@ -88,33 +168,141 @@ class LighterExchange(MultiPerpDexMixin, MultiPerpDex):
             order_expiry = 0
         else:
             order_expiry = int((time.time() + 60 * 60 * 24) * 1000)
-            
-        resp = await self.client.create_order(
+
+        return dict(
             market_index=market_index,
             client_order_index=client_order_index,
             base_amount=amount,
             price=price,
             is_ask=is_ask,
-            order_type= order_type_code,
+            order_type=order_type_code,
             time_in_force=time_in_force,
+            reduce_only=False,
+            trigger_price=SignerClient.NIL_TRIGGER_PRICE,
             order_expiry=order_expiry,
         )
-        # been changed to tuple
-        resp = resp[1]
 
+    def _format_tx_result(self, code, message, tx_hash):
         try:
-            parsed = json.loads(resp.message)
-            return {
-                "code": resp.code,
-                "message": parsed,
-                "tx_hash": resp.tx_hash
-            }
+            parsed = json.loads(message)
+            return {"code": code, "message": parsed, "tx_hash": tx_hash}
         except Exception:
-            return {
-                "code": resp.code,
-                "message": resp.message,
-                "tx_hash": resp.tx_hash
-            }
+            return {"code": code, "message": message, "tx_hash": tx_hash}
+
+    # ---------------------- nonce + 배치 전송 ----------------------
+    # 동시 호출된 create/cancel 은 큐에 쌓이고, flusher 가 연속 nonce 로 한꺼번에 서명해
+    # send_tx_batch 한 번으로 보낸다(배치 전송 중 도착한 요청은 다음 배치로 합쳐짐).
+
+    async def _fetch_next_nonce(self):
+        res = await TransactionApi(self.client.api_client).next_nonce(
+            account_index=self.client.account_index, api_key_index=self.api_key_id
+        )
+        return res.nonce
+
+    def _sign_tx(self, kind, params, nonce):
+        if kind == "create":
+            tx_type, tx_info, err = call_signer(
+                self.client.sign_create_order, **params, nonce=nonce, api_key_index=self.api_key_id
+            )
+            return tx_type or getattr(SignerClient, "TX_TYPE_CREATE_ORDER", TX_TYPE_CREATE_ORDER), tx_info, err
+        tx_type, tx_info, err = call_signer(
+            self.client.sign_cancel_order, **params, nonce=nonce, api_key_index=self.api_key_id
+        )
+        return tx_type or getattr(SignerClient, "TX_TYPE_CANCEL_ORDER", TX_TYPE_CANCEL_ORDER), tx_info, err
+
+    async def _submit_txs(self, items):
+        """items: [(kind, params)] → [result dict] (순서 유지)"""
+        loop = asyncio.get_running_loop()
+        futs = []
+        for kind, params in items:
+            fut = loop.create_future()
+            self._tx_queue.append((kind, params, fut))
+            futs.append(fut)
+        if self._tx_flusher is None or self._tx_flusher.done():
+            self._tx_flusher = asyncio.create_task(self._flush_txs(), name="lighter-tx-flush")
+        return list(await asyncio.gather(*futs))
+
+    async def _flush_txs(self):
+        while self._tx_queue:
+            batch = self._tx_queue[:self.max_batch_size]
+            del self._tx_queue[:len(batch)]
+            try:
+                await self._send_batch(batch)
+            except asyncio.CancelledError:
+                # close() 로 취소된 경우: 전송 중이던 배치도 응답 없이 남지 않게 처리
+                for _, _, fut in batch:
+                    if not fut.done():
+                        fut.set_result({"code": "FAILED", "message": "cancelled", "tx_hash": None})
+                raise
+            except Exception as e:
+                for _, _, fut in batch:
+                    if not fut.done():
+                        fut.set_result({"code": "FAILED", "message": str(e), "tx_hash": None})
+
+    async def _send_batch(self, batch):
+        nonces = await self._nonces.take(len(batch))
+        tx_types, tx_infos, owners = [], [], []
+        failed_sign = False
+        for (kind, params, fut), nonce in zip(batch, nonces):
+            tx_type, tx_info, err = self._sign_tx(kind, params, nonce)
+            if err is not None or not tx_info:
+                failed_sign = True
+                fut.set_result({"code": "FAILED", "message": str(err), "tx_hash": None})
+                continue
+            tx_types.append(tx_type)
+            tx_infos.append(tx_info)
+            owners.append(fut)
+        if failed_sign:
+            # 예약한 nonce 중 일부가 비었으므로 서버 값으로 재동기화 후 나머지 재서명
+            await self._nonces.resync()
+            if owners:
+                retry = [(k, p, f) for (k, p, f) in batch if not f.done()]
+                return await self._send_batch(retry)
+            return
+
+        ok = False
+        try:
+            if len(tx_infos) > 1:
+                tx_api = TransactionApi(self.client.api_client)
+                send_batch = getattr(tx_api, "send_tx_batch", None)
+                if send_batch is None:
+                    raise RuntimeError("lighter SDK has no TransactionApi.send_tx_batch (upgrade lighter-sdk)")
+                # REST 스펙상 tx_types / tx_infos 는 JSON 배열 문자열
+                resp = await send_batch(tx_types=json.dumps(tx_types), tx_infos=json.dumps(tx_infos))
+                hashes = list(getattr(resp, "tx_hash", None) or [])
+                ok = getattr(resp, "code", None) == CODE_OK
+                for i, fut in enumerate(owners):
+                    fut.set_result(self._format_tx_result(resp.code, resp.message, hashes[i] if i < len(hashes) else None))
+            else:
+                ok = True
+                for tx_type, tx_info, fut in zip(tx_types, tx_infos, owners):
+                    resp = await self.client.send_tx(tx_type=tx_type, tx_info=tx_info)
+                    ok = ok and getattr(resp, "code", None) == CODE_OK
+                    fut.set_result(self._format_tx_result(resp.code, resp.message, resp.tx_hash))
+        except Exception as e:
+            for fut in owners:
+                if not fut.done():
+                    fut.set_result({"code": "FAILED", "message": str(e), "tx_hash": None})
+        finally:
+            if not ok:
+                await self._nonces.resync()
+
+    async def create_order(self, symbol, side, amount, price=None, order_type='market'):
+        params = self._build_order_params(symbol, side, amount, price, order_type)
+        return (await self._submit_txs([("create", params)]))[0]
+
+    async def create_orders(self, orders):
+        """
+        여러 주문을 한 번에 제출(연속 nonce + send_tx_batch).
+        orders: [{"symbol", "side", "amount", "price"(opt), "order_type"(opt)}, ...]
+        반환: 입력 순서대로 create_order 와 같은 형태의 결과 리스트
+        """
+        items = [
+            ("create", self._build_order_params(o["symbol"], o["side"], o["amount"],
+                                                o.get("price"), o.get("order_type", "market")))
+            for o in orders
+        ]
+        return await self._submit_txs(items) if items else []
     
     def parse_position(self, pos):
         entry_price = pos['avg_entry_price']
@@ -123,19 +311,20 @@ class LighterExchange(MultiPerpDexMixin, MultiPerpDex):
         size = pos['position']
         if float(size) == 0:
             return None
-        return {
-            "entry_price": entry_price,
-            "unrealized_pnl": unrealized_pnl,
-            "side": side,
-            "size": size
-        }
+        return Position(
+            entry_price=entry_price,
+            unrealized_pnl=unrealized_pnl,
+            side=side,
+            size=size,
+            raw=pos,
+        )
         
     async def get_position(self, symbol):
         l1_address = self.l1_address
         url = f"{self.url}/api/v1/account?by=l1_address&value={l1_address}"
         headers = {"accept": "application/json"}
 
-        async with aiohttp.ClientSession() as session:
+        async with new_session("lighter") as session:
             async with session.get(url, headers=headers) as resp:
                 data = await resp.json()
                 accounts = data['accounts']
@@ -157,7 +346,7 @@ class LighterExchange(MultiPerpDexMixin, MultiPerpDex):
         url = f"{self.url}/api/v1/account?by=l1_address&value={l1_address}"
         headers = {"accept": "application/json"}
 
-        async with aiohttp.ClientSession() as session:
+        async with new_session("lighter") as session:
             async with session.get(url, headers=headers) as resp:
                 data = await resp.json()
                 accounts = data['accounts']
@@ -173,10 +362,10 @@ class LighterExchange(MultiPerpDexMixin, MultiPerpDex):
                             
                         available_collateral = float(total_collateral)-margin_used
                         
-                return {
-            "available_collateral": round(float(available_collateral), 2),
-            "total_collateral": round(float(total_collateral), 2)
-        }
+                return Collateral(
+            available_collateral=round(float(available_collateral), 2),
+            total_collateral=round(float(total_collateral), 2),
+        )
     
     async def get_open_orders(self, symbol):
         market_id = self.market_info[symbol]["market_id"]
@@ -220,10 +409,11 @@ class LighterExchange(MultiPerpDexMixin, MultiPerpDex):
         return parsed
 
     def _get_symbol_from_market_index(self, market_index):
-        for symbol, info in self.market_info.items():
-            if info.get("market_id") == market_index:
-                return symbol
-        return f"MARKET_{market_index}"
+        try:
+            symbol = self._market_id_to_symbol.get(int(market_index))
+        except (TypeError, ValueError):
+            symbol = None
+        return symbol or f"MARKET_{market_index}"
 
     async def cancel_orders(self, symbol, open_orders = None):
         if open_orders is None:
@@ -235,26 +425,18 @@ class LighterExchange(MultiPerpDexMixin, MultiPerpDex):
 
         market_id = self.market_info[symbol]["market_id"]
 
+        # [CHANGED] 개별 전송 대신 연속 nonce 로 서명해 배치 전송
+        items = [("cancel", {"market_index": market_id, "order_index": order["id"]}) for order in open_orders]
+        try:
+            sent = await self._submit_txs(items)
+        except Exception as e:
+            sent = [{"code": "FAILED", "message": str(e), "tx_hash": None}] * len(items)
+
         results = []
-        for order in open_orders:
-            order_index = order["id"]
-            try:
-                resp = await self.client.cancel_order(
-                    market_index=market_id,
-                    order_index=order_index
-                )
-                resp = resp[1]
-                results.append({
-                    "id": order_index,
-                    "status": resp.code,
-                    "message": resp.message,
-                    "tx_hash": resp.tx_hash
-                })
-            except Exception as e:
-                results.append({
-                    "id": order_index,
-                    "status": "FAILED",
-                    "message": str(e)
-                })
+        for order, r in zip(open_orders, sent):
+            res = {"id": order["id"], "status": r.get("code"), "message": r.get("message")}
+            if r.get("tx_hash") is not None or r.get("code") != "FAILED":
+                res["tx_hash"] = r.get("tx_hash")
+            results.append(res)
 
         return results
@@ -6,6 +6,8 @@ import requests
 from solders.keypair import Keypair
 import aiohttp
 from aiohttp import TCPConnector
+from mpdex.utils.common_http import new_session
+from mpdex.utils.records import Collateral, Order, Position
 from typing import Optional, Dict, Any, List
 from decimal import Decimal, ROUND_HALF_UP, ROUND_DOWN, getcontext
 import json
@@ -43,6 +45,11 @@ class PacificaExchange(MultiPerpDexMixin, MultiPerpDex):
         self.agent_public_key = agent_public_key    # required
         self.agent_private_key = agent_private_key  # required
         self.agent_keypair = Keypair.from_base58_string(agent_private_key)
+        # [ADDED] 요청 바디의 고정 부분(account / agent_wallet) 사전 계산
+        self._static_request_header = {
+            "account": self.public_key,
+            "agent_wallet": self.agent_public_key,
+        }
         self._http: Optional[aiohttp.ClientSession] = None
 
         # { "BTC": {"tick_size": "1", "lot_size": "0.00001", ...}, ... }
@@ -56,12 +63,7 @@ class PacificaExchange(MultiPerpDexMixin, MultiPerpDex):
 
     def _session(self) -> aiohttp.ClientSession:
         if self._http is None or self._http.closed:
-            self._http = aiohttp.ClientSession(
-                connector=TCPConnector(
-                    force_close=True,             # 매 요청 후 소켓 닫기 → 종료 시 잔여 소켓 최소화
-                    enable_cleanup_closed=True,   # 종료 중인 SSL 소켓 정리 보조 (로그 억제)
-                )
-            )
+            self._http = new_session("pacifica", force_close=True)
         return self._http
     
     async def close(self):
@@ -213,8 +215,7 @@ class PacificaExchange(MultiPerpDexMixin, MultiPerpDex):
             signature_header, signature_payload, self.agent_keypair
         )
         request_header = {
-            "account": self.public_key,
-            "agent_wallet": self.agent_public_key,
+            **self._static_request_header,
             "signature": signature,
             "timestamp": signature_header["timestamp"],
             "expiry_window": signature_header["expiry_window"],
@@ -257,12 +258,15 @@ class PacificaExchange(MultiPerpDexMixin, MultiPerpDex):
         results = []
         for pos in data:
             if pos.get("symbol") == symbol:
-                return {
-                    "symbol": symbol,
-                    "side": "buy" if pos.get("side")=="bid" else "ask",
-                    "price": pos.get("entry_price"),
-                    "size":pos.get("amount"),
-                }
+                return Position(
+                    entry_price=pos.get("entry_price"),
+                    unrealized_pnl=pos.get("unrealized_pnl"),
+                    side="buy" if pos.get("side")=="bid" else "ask",  # 기존 값 유지(정규화 값은 direction)
+                    size=pos.get("amount"),
+                    symbol=symbol,
+                    price=pos.get("entry_price"),  # 기존 키 호환
+                    raw=pos,
+                )
     
     
     async def get_collateral(self):
@@ -279,15 +283,13 @@ class PacificaExchange(MultiPerpDexMixin, MultiPerpDex):
         data = data.get('data',{})
 
         try:        
-            return {
-                "total_collateral": data.get("account_equity"),
-                "available_collateral": data.get("available_to_spend"),
-            }
+            return Collateral(
+                total_collateral=data.get("account_equity"),
+                available_collateral=data.get("available_to_spend"),
+                raw=data,
+            )
         except:
-            return {
-                "total_collateral": None,
-                "available_collateral": None,
-            }
+            return Collateral(total_collateral=None, available_collateral=None)
     
     async def get_open_orders(self, symbol):
         """
@@ -306,15 +308,20 @@ class PacificaExchange(MultiPerpDexMixin, MultiPerpDex):
         results = []
         for pos in data:
             if pos.get("symbol") == symbol:
-                results.append({
-                    "id": pos.get("order_id"),
-                    "symbol": symbol,
-                    "side": "buy" if pos.get("side")=="bid" else "ask",
-                    "price": pos.get("price"),
-                    "quantity":pos.get("initial_amount"),
-                    "fileed_quantity":pos.get("filled_amount"),
-                    "order_type":pos.get("order_type")
-                })
+                results.append(Order(
+                    order_id=pos.get("order_id"),
+                    symbol=symbol,
+                    side="buy" if pos.get("side")=="bid" else "ask",  # 기존 값 유지(정규화 값은 direction)
+                    price=pos.get("price"),
+                    size=pos.get("initial_amount"),
+                    client_id=pos.get("client_order_id"),
+                    # 기존 키 호환
+                    id=pos.get("order_id"),
+                    quantity=pos.get("initial_amount"),
+                    fileed_quantity=pos.get("filled_amount"),
+                    order_type=pos.get("order_type"),
+                    raw=pos,
+                ))
         return results
 
     async def cancel_orders(self, symbol, open_orders = None):
@@ -336,8 +343,7 @@ class PacificaExchange(MultiPerpDexMixin, MultiPerpDex):
                 signature_header, signature_payload, self.agent_keypair
             )
             request_header = {
-                "account": self.public_key,
-                "agent_wallet": self.agent_public_key,
+                **self._static_request_header,
                 "signature": signature,
                 "timestamp": signature_header["timestamp"],
                 "expiry_window": signature_header["expiry_window"],
@@ -450,6 +456,20 @@ class PacificaExchange(MultiPerpDexMixin, MultiPerpDex):
         prices = await self.refresh_prices()
         return prices.get(symbol)
 
+    async def get_mark_prices(self, symbols, *, force_refresh: bool = True, fallback: str = "mark") -> Dict[str, Optional[float]]:
+        """
+        /info/prices 1회로 여러 심볼 가격 반환: {symbol: float|None}
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        if force_refresh or any(str(s).upper() not in self._price_cache for s in symbols):
+            await self.refresh_prices()
+        out: Dict[str, Optional[float]] = {}
+        for s in symbols:
+            out[s] = await self.get_mark_price(s, force_refresh=False, fallback=fallback) \
+                if str(s).upper() in self._price_cache else None
+        return out
+
     async def close_position(self, symbol, position, *, is_reduce_only=False):
         return await super().close_position(symbol, position, is_reduce_only=is_reduce_only)
         
\ No newline at end of file
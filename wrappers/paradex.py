@@ -1,4 +1,5 @@
 from multi_perp_dex import MultiPerpDex, MultiPerpDexMixin
+from mpdex.utils.records import Order, Position
 import ccxt.async_support as ccxt  # 비동기 CCXT 지원
 from starkware.crypto.signature.signature import ec_mult, ALPHA, FIELD_PRIME, EC_GEN
 import asyncio
@@ -35,12 +36,13 @@ class ParadexExchange(MultiPerpDexMixin, MultiPerpDex):
         if position.get("size") == '0' or position.get("size") == 0:
             return None
         
-        return {
-            "entry_price": float(position.get("average_entry_price", 0)),
-            "unrealized_pnl": float(position.get("unrealized_pnl", 0)),
-            "side": position.get("side", "").lower(),
-            "size": position.get("size").replace('-','')
-        }
+        return Position(
+            entry_price=float(position.get("average_entry_price", 0)),
+            unrealized_pnl=float(position.get("unrealized_pnl", 0)),
+            side=position.get("side", "").lower(),
+            size=position.get("size").replace('-',''),
+            raw=position,
+        )
     
     async def get_mark_price(self, symbol):
         res = await self.exchange.fetch_ticker(symbol)
@@ -65,14 +67,19 @@ class ParadexExchange(MultiPerpDexMixin, MultiPerpDex):
 
         parsed = []
         for order in orders:
-            parsed.append({
-                "id": order.get("id"),
-                "symbol": order.get("symbol"),
-                "type": order.get("type"),
-                "side": order.get("side"),
-                "amount": order.get("amount"),
-                "price": order.get("price")
-            })
+            parsed.append(Order(
+                order_id=order.get("id"),
+                symbol=order.get("symbol"),
+                side=order.get("side"),  # 기존 값 유지('BUY'/'SELL', 정규화 값은 direction)
+                price=order.get("price"),
+                size=order.get("amount"),
+                client_id=order.get("clientOrderId"),
+                # 기존 키 호환
+                id=order.get("id"),
+                type=order.get("type"),
+                amount=order.get("amount"),
+                raw=order,
+            ))
 
         return parsed
 
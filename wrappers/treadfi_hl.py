@@ -5,18 +5,30 @@ from importlib import resources
 import aiohttp
 from aiohttp import web
 from aiohttp import TCPConnector
+from mpdex.utils.common_http import new_session
+from mpdex.utils.common_session import SessionKeeper
+from mpdex.utils.records import Collateral, Order, Position
+from mpdex.utils.common_hyperliquid import INFO_FLIGHT, info_key
+from .hyperliquid_ws_client import HLWSClientRaw, WS_POOL
 import asyncio
 import json
+import logging
 import os
 import time
 from pathlib import Path
 from typing import Optional, Dict, Any
+from collections.abc import Mapping
 from eth_account import Account  
 from eth_account.messages import encode_defunct  
 
+logger = logging.getLogger(__name__)
+
 class TreadfiHlExchange(MultiPerpDexMixin, MultiPerpDex):
-	# To do: hyperliquid의 ws를 사용해서 position과 가격을 fetch하도록 수정할것
+	# position/collateral/open orders/가격은 HL WS_POOL(sub_wallet_address 키)에서 조회
 	# tread.fi는 자체 front api를 사용하여 주문을 넣기때문에 builder code와 fee를 따로 설정안해도댐.
+	HL_HTTP_BASE = "https://api.hyperliquid.xyz"
+	HL_WS_BASE = "wss://api.hyperliquid.xyz/ws"
+
 	def __init__(
         self,
         session_cookies: Optional[Dict[str, str]] = None,
@@ -25,6 +37,7 @@ class TreadfiHlExchange(MultiPerpDexMixin, MultiPerpDex):
         sub_wallet_address: str = None, # optional
         account_name: str = None, # required
 		options: Any = None, # options
+		ws_max_age: Optional[float] = None, # WS 캐시 허용 경과 시간(sec). 초과/미수신 시 HL /info REST 폴백
     ):
 		# used for signing
 		self.main_wallet_address = main_wallet_address
@@ -47,6 +60,16 @@ class TreadfiHlExchange(MultiPerpDexMixin, MultiPerpDex):
 
 		self.options = None # for purpose
 
+		# [ADDED] HL WS (WS_POOL 공유: 같은 주소의 HyperliquidExchange 가 있으면 같은 커넥션 사용)
+		self.ws_client: Optional[HLWSClientRaw] = None
+		self._ws_pool_key = None
+		self._ws_init_lock = asyncio.Lock()
+		self.dex_list = None
+		self.ws_max_age = ws_max_age
+
+		# [ADDED] 세션 keeper: 쿠키를 주기적으로 검증하고 만료 시 개인키로 재로그인(주문 경로에서 로그인 왕복 제거)
+		self._session_keeper = SessionKeeper("treadfi_hl", self._session_ttl, self._session_renew, interval=900.0)
+
 		self.login_html_path = os.environ.get(
             "TREADFI_LOGIN_HTML",
             os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "wrappers/", "treadfi_login.html")),
@@ -63,17 +86,23 @@ class TreadfiHlExchange(MultiPerpDexMixin, MultiPerpDex):
 	def _session(self) -> aiohttp.ClientSession:
 		if self._http is None or self._http.closed:
 			# [CHANGED] SSL 소켓 정리 강화 + keep-alive 강제 해제
-			self._http = aiohttp.ClientSession(
-				connector=TCPConnector(
-					force_close=True,             # 매 요청 후 소켓 닫기 → 종료 시 잔여 소켓 최소화
-					enable_cleanup_closed=True,   # 종료 중인 SSL 소켓 정리 보조 (로그 억제)
-				)
-			)
+			self._http = new_session("treadfi_hl", force_close=True)
 		return self._http
 	
 	async def aclose(self):  # [ADDED]
+		await self.stop_session_keeper()
 		if self._http and not self._http.closed:
 			await self._http.close()
+		# WS 풀 release: 이 인스턴스에서 acquire한 경우에만 해제
+		if self._ws_pool_key:
+			ws_url, addr = self._ws_pool_key
+			try:
+				await WS_POOL.release(ws_url=ws_url, address=addr)
+			except Exception:
+				pass
+			finally:
+				self._ws_pool_key = None
+				self.ws_client = None
 
 	# 4) 컨텍스트 매니저(선택) 추가: async with TreadfiHlExchange(...) as ex:
 	async def __aenter__(self):  # [ADDED]
@@ -177,6 +206,7 @@ alert('Signing/Submit failed: ' + e.message);
 				print("Login authenticated!")
 				self._logged_in = True
 				self._save_cached_cookies()
+				self.start_session_keeper()
 				return md
 			else:
 				print(f"Cache is outdated...{md}")
@@ -184,20 +214,9 @@ alert('Signing/Submit failed: ' + e.message);
 		
 		# 2) 프라이빗키로 서명
 		if self._pk:
-			if Account is None or encode_defunct is None:
-				raise RuntimeError("eth_account 미설치. pip install eth-account")
-			nonce = await self._get_nonce()
-			msg = f"Sign in to Tread with nonce: {nonce}"
-			acct = Account.from_key(self._pk)
-			sign = Account.sign_message(encode_defunct(text=msg), private_key=self._pk).signature.hex()
-			await self._wallet_auth(acct.address, sign, nonce)
-			md = await self._get_user_metadata()
-			if not md.get("is_authenticated"):
-				raise RuntimeError("login failed with private key")
-			else:
-				print("Login authenticated!")
-			self._logged_in = True
-			self._save_cached_cookies()
+			md = await self._login_with_pk()
+			print("Login authenticated!")
+			self.start_session_keeper()
 			return md
 
 		# 3) 브라우저 서명 (포트 6974)
@@ -259,6 +278,47 @@ alert('Signing/Submit failed: ' + e.message);
 		self._save_cached_cookies()
 		return md
 
+	async def _login_with_pk(self) -> dict:
+		if Account is None or encode_defunct is None:
+			raise RuntimeError("eth_account 미설치. pip install eth-account")
+		nonce = await self._get_nonce()
+		msg = f"Sign in to Tread with nonce: {nonce}"
+		acct = Account.from_key(self._pk)
+		sign = Account.sign_message(encode_defunct(text=msg), private_key=self._pk).signature.hex()
+		await self._wallet_auth(acct.address, sign, nonce)
+		md = await self._get_user_metadata()
+		if not md.get("is_authenticated"):
+			raise RuntimeError("login failed with private key")
+		self._logged_in = True
+		self._save_cached_cookies()
+		return md
+
+	# ----------------------------
+	# 세션 keeper (백그라운드 검증/재로그인)
+	# ----------------------------
+	async def _session_ttl(self) -> Optional[float]:
+		# django 세션 쿠키는 만료시각을 알 수 없으므로 user_metadata 로 원격 검증(유효=inf)
+		if not self._has_valid_cookies():
+			return None
+		try:
+			md = await self._get_user_metadata()
+		except Exception:
+			return float("inf")  # 일시적 네트워크 오류는 무효로 보지 않음
+		return float("inf") if md.get("is_authenticated") else None
+
+	async def _session_renew(self) -> None:
+		if not self._pk:
+			raise RuntimeError("session expired; private key required for background re-login")
+		await self._login_with_pk()
+
+	def start_session_keeper(self) -> None:
+		# 브라우저 서명은 백그라운드 재로그인이 불가하므로 개인키가 있을 때만 동작
+		if self._pk:
+			self._session_keeper.start()
+
+	async def stop_session_keeper(self) -> None:
+		await self._session_keeper.stop()
+
 	def _addr_lower(self, address: str) -> str:  
 		return "0x" + address[2:].lower()
 
@@ -568,23 +628,300 @@ alert('Signing/Submit failed: ' + e.message);
 				data = {"status": r.status, "text": txt}
 			return self.parse_orders(data)
 
-	async def get_position(self, symbol):
-		# to do, using ws
-		pass
-	
+	# ----------------------------
+	# 조회: HL WS (sub_wallet_address)
+	# ----------------------------
+	@staticmethod
+	def _hl_coin(symbol: str) -> str:
+		"""
+		'BTC:PERP-USDC' -> 'BTC', 'xyz_XYZ100:PERP-USDC' -> 'xyz:XYZ100' (HL 코인 표기)
+		"""
+		s = str(symbol).strip()
+		if s.upper().endswith(":PERP-USDC"):
+			s = s[: -len(":PERP-USDC")]
+		if "_" in s:
+			dex, coin = s.split("_", 1)
+			return f"{dex.lower()}:{coin.upper()}"
+		return s.upper()
+
+	async def _load_hl_dex_list(self) -> None:
+		# perpDexs 순서(webData3 clearinghouseStates 순서와 동일). 실패 시 HL 단독
+		order = ["hl"]
+		try:
+			s = self._session()
+			async with s.post(f"{self.HL_HTTP_BASE}/info", json={"type": "perpDexs"},
+							  headers={"Content-Type": "application/json"}) as r:
+				resp = await r.json()
+			for e in resp if isinstance(resp, list) else []:
+				n = e.get("name") if isinstance(e, dict) else None
+				k = str(n or "").lower().strip()
+				if k and k not in order:
+					order.append(k)
+		except Exception:
+			pass
+		self.dex_list = order
+
+	async def create_ws_client(self) -> HLWSClientRaw:
+		"""
+		WS_POOL 에서 (HL ws, sub_wallet_address) 클라이언트를 획득.
+		- 같은 주소의 HyperliquidExchange 가 이미 있으면 그 커넥션을 그대로 공유(추가 연결 없음)
+		- 공유 메타(dex 순서/스팟 메타)는 HL 인스턴스가 prime 하며, 없을 때만 dex 순서를 직접 설정
+		"""
+		async with self._ws_init_lock:
+			if self.ws_client is not None:
+				return self.ws_client
+			address = self.sub_wallet_address
+			client = await WS_POOL.acquire(
+				ws_url=self.HL_WS_BASE,
+				http_base=self.HL_HTTP_BASE,
+				address=address,
+				dex=None,
+			)
+			self.ws_client = client
+			self._ws_pool_key = (self.HL_WS_BASE, (address or "").lower())
+
+			if self.dex_list is None:
+				await self._load_hl_dex_list()
+			if not WS_POOL.shared_primed:
+				client.set_dex_order(self.dex_list)
+			for dex in self.dex_list:
+				if dex != "hl" and not client.selective:
+					await client.ensure_allmids_for(dex)
+			return client
+
+	# ---------------------- WS 신선도 / REST 폴백 ----------------------
+
+	def _ws_fresh(self, kind: str, max_age: Optional[float] = None) -> bool:
+		return self.ws_client.is_fresh(kind, None, self.ws_max_age if max_age is None else max_age)
+
+	async def _post_hl_info(self, payload: dict):
+		"""HL /info 조회(같은 payload 동시 요청은 1회로 합침). 비정상 응답은 RuntimeError"""
+		url = f"{self.HL_HTTP_BASE}/info"
+
+		async def _fetch():
+			s = self._session()
+			async with s.post(url, json=payload, headers={"Content-Type": "application/json"}) as r:
+				if r.status != 200:
+					raise RuntimeError(f"HL info {payload.get('type')} failed: {r.status} {await r.text()}")
+				return await r.json()
+
+		return await INFO_FLIGHT.do(info_key(self.HL_HTTP_BASE, payload), _fetch, ttl=0.0)
+
+	async def _clearinghouse_rest(self, dex: str) -> dict:
+		payload = {"type": "clearinghouseState", "user": self.sub_wallet_address, "dex": "" if dex == "hl" else dex}
+		data = await self._post_hl_info(payload)
+		if not isinstance(data, dict):
+			raise RuntimeError(f"invalid clearinghouseState response: {data}")
+		return data
+
+	async def _mark_price_rest(self, hl_coin: str) -> Optional[float]:
+		"""해당 dex 의 metaAndAssetCtxs(markPx) → 없으면 allMids(mid) 로 가격 조회"""
+		dex = hl_coin.split(":")[0] if ":" in hl_coin else ""
+		meta, ctxs = (await self._post_hl_info({"type": "metaAndAssetCtxs", "dex": dex}) or [None, None])[:2]
+		for u, ctx in zip((meta or {}).get("universe") or [], ctxs or []):
+			if str(u.get("name") or "").upper() == hl_coin.upper() and (ctx or {}).get("markPx") is not None:
+				return float(ctx["markPx"])
+		mids = await self._post_hl_info({"type": "allMids", "dex": dex}) or {}
+		for k, v in mids.items():
+			if str(k).upper() == hl_coin.upper():
+				return float(v)
+		return None
+
+	async def get_position(self, symbol, timeout: float = 2.0, *, max_age: Optional[float] = None):
+		"""
+		반환 스키마(HL 과 동일):
+		  {"entry_price": float|None, "unrealized_pnl": float|None, "side": "long"|"short", "size": float} | None
+		WS 스냅샷이 없거나(타임아웃/재연결 직후) max_age(기본 ws_max_age)보다 오래됐으면 HL /info REST 로 조회.
+		None 은 '포지션 없음'일 때만 반환(조회 실패는 예외).
+		"""
+		if not self.ws_client:
+			await self.create_ws_client()
+
+		coin = self._hl_coin(symbol)
+		dex = coin.split(":", 1)[0] if ":" in coin else "hl"
+
+		# 재연결 직후면 새 스냅샷까지 대기(이전 연결의 값은 무효)
+		if await self.ws_client.wait_account_ready(timeout=timeout) and self._ws_fresh("clearinghouse", max_age):
+			pos_map = (self.ws_client.positions_by_dex_norm or {}).get(dex) or {}
+			pos = pos_map.get(coin.upper()) or pos_map.get(coin)
+			if not pos:
+				return None
+			size = float(pos.get("size") or 0.0)
+			if not size or pos.get("side") == "flat":
+				return None
+			return Position(
+				entry_price=pos.get("entry_px"),
+				unrealized_pnl=pos.get("upnl") or 0.0,
+				side=pos.get("side"),
+				size=abs(size),
+				raw=getattr(pos, "raw", pos),
+			)
+
+		# REST 폴백
+		data = await self._clearinghouse_rest(dex)
+		for ap in data.get("assetPositions") or []:
+			pos = (ap or {}).get("position") or {}
+			if str(pos.get("coin") or "").upper() != coin.upper():
+				continue
+			try:
+				szi = float(pos.get("szi") or 0.0)
+			except Exception:
+				szi = 0.0
+			if not szi:
+				return None
+			try:
+				entry = float(pos.get("entryPx"))
+			except Exception:
+				entry = None
+			try:
+				upnl = float(pos.get("unrealizedPnl") or 0.0)
+			except Exception:
+				upnl = 0.0
+			return Position(
+				entry_price=entry,
+				unrealized_pnl=upnl,
+				side="long" if szi > 0 else "short",
+				size=abs(szi),
+				raw=pos,
+			)
+		return None
+
 	async def close_position(self, symbol, position):
 		return await super().close_position(symbol, position)
-	
-	async def get_collateral(self):
-		# to do, using ws
-		pass
-	
-	async def get_open_orders(self, symbol):
-		pass
-	
-	async def cancel_orders(self, symbol):
-		pass
 
-	async def get_mark_price(self,symbol):
-		# to do
-		pass
\ No newline at end of file
+	async def get_collateral(self, timeout: float = 2.0, *, max_age: Optional[float] = None):
+		"""WS(clearinghouse/spotState) 가 준비·신선하지 않으면 HL /info REST(dex별 clearinghouseState + spotClearinghouseState) 로 조회."""
+		if not self.ws_client:
+			await self.create_ws_client()
+
+		ready = await asyncio.gather(
+			self.ws_client.wait_account_ready(timeout=timeout),
+			self.ws_client.wait_spot_ready(timeout=timeout),
+		)
+
+		if all(ready) and self._ws_fresh("clearinghouse", max_age) and self._ws_fresh("spot", max_age):
+			margins = list((self.ws_client.margin_by_dex or {}).values())
+			try:
+				balances = self.ws_client.get_all_spot_balances()
+			except Exception:
+				balances = {}
+		else:
+			if self.dex_list is None:
+				await self._load_hl_dex_list()
+			states = await asyncio.gather(*[self._clearinghouse_rest(d) for d in self.dex_list])
+			margins = []
+			for st in states:
+				ms = st.get("marginSummary") or {}
+				margins.append({"accountValue": ms.get("accountValue"), "withdrawable": st.get("withdrawable")})
+			spot = await self._post_hl_info({"type": "spotClearinghouseState", "user": self.sub_wallet_address})
+			if not isinstance(spot, dict):
+				raise RuntimeError(f"invalid spotClearinghouseState response: {spot}")
+			balances = {}
+			for b in spot.get("balances") or []:
+				try:
+					balances[str(b.get("coin") or "").upper()] = float(b.get("total") or 0.0)
+				except Exception:
+					pass
+
+		av_sum = wd_sum = 0.0
+		for m in margins:
+			try:
+				av_sum += float((m or {}).get("accountValue") or 0.0)
+			except Exception:
+				pass
+			try:
+				wd_sum += float((m or {}).get("withdrawable") or 0.0)
+			except Exception:
+				pass
+
+		return Collateral(
+			available_collateral=wd_sum if wd_sum != 0.0 else None,
+			total_collateral=av_sum if av_sum != 0.0 else None,
+			spot={
+				"USDH": float(balances.get("USDH", 0.0)),
+				"USDC": float(balances.get("USDC", 0.0)),
+				"USDT": float(balances.get("USDT0", 0.0)),
+			},
+		)
+
+	async def get_open_orders(self, symbol, timeout: float = 2.0, *, max_age: Optional[float] = None):
+		"""
+		HL openOrders(tread.fi 엔진이 낸 자식 주문 포함)에서 심볼로 필터. 없으면 None.
+		WS 스냅샷이 준비·신선하지 않으면 HL /info openOrders REST 로 조회.
+		"""
+		if not self.ws_client:
+			await self.create_ws_client()
+
+		coin = self._hl_coin(symbol).upper()
+		if await self.ws_client.wait_open_orders_ready(timeout=timeout) and self._ws_fresh("open_orders", max_age):
+			return self.ws_client.get_open_orders(coin) or None
+
+		resp = await self._post_hl_info({"type": "openOrders", "user": self.sub_wallet_address, "dex": "ALL_DEXS"})
+		if isinstance(resp, dict) and isinstance(resp.get("orders"), list):
+			resp = resp["orders"]
+		if not isinstance(resp, list):
+			raise RuntimeError(f"invalid openOrders response: {resp}")
+		out = []
+		for o in resp:
+			if not isinstance(o, dict) or str(o.get("coin") or "").upper() != coin or o.get("oid") is None:
+				continue
+			try:
+				px, sz = float(o.get("limitPx")), float(o.get("sz"))
+			except Exception:
+				px = sz = None
+			out.append(Order(
+				order_id=o.get("oid"),
+				symbol=coin,
+				side="short" if o.get("side") == "A" else "long",
+				price=px,
+				size=sz,
+				client_id=str(o.get("cloid")) if o.get("cloid") else None,
+				raw=o,
+			))
+		return out or None
+
+	async def cancel_orders(self, symbol, open_orders=None):
+		"""
+		tread.fi 주문은 자체 엔진이 HL 주문을 관리(서명 키 없음) → 여기서는 취소 불가. tread.fi 앱에서 취소.
+		여러 거래소를 한 번에 취소하는 흐름이 끊기지 않도록 예외 대신, 남아 있는 주문마다 실패 결과를 반환
+		(성공처럼 보이는 빈 리스트는 실제로 미체결 주문이 없을 때만).
+		반환: List[{"order_id", "symbol", "ok": False, "error": str}]
+		"""
+		err = "cancel_orders is not supported for treadfi_hl (cancel from tread.fi app)"
+		if open_orders is None:
+			try:
+				open_orders = await self.get_open_orders(symbol)
+			except Exception as e:
+				return [{"order_id": None, "symbol": symbol, "ok": False, "error": f"{err}; open orders unknown: {e}"}]
+		if isinstance(open_orders, Mapping):
+			open_orders = [open_orders]
+		results = [
+			{"order_id": o.get("order_id"), "symbol": o.get("symbol") or symbol, "ok": False, "error": err}
+			for o in (open_orders or [])
+		]
+		if results:
+			logger.warning(f"[treadfi_hl] {err}: {len(results)} open order(s) on {symbol} left untouched")
+		return results
+
+	async def get_mark_price(self, symbol, timeout: float = 3.0):
+		if not self.ws_client:
+			await self.create_ws_client()
+		hl_coin = self._hl_coin(symbol)
+		coin = hl_coin.upper()
+		# 선택 구독 모드면 코인 1개만 구독, 못 받으면 해당 dex allMids 로 폴백
+		selective = await self.ws_client.ensure_price_sub(hl_coin, kind="perp")
+		try:
+			ready = await self.ws_client.wait_price_ready(coin, timeout=timeout, kind="perp")
+		except Exception:
+			ready = False
+		if not ready and selective:
+			await self.ws_client.ensure_allmids_for(hl_coin.split(":")[0] if ":" in hl_coin else None)
+			try:
+				await self.ws_client.wait_price_ready(coin, timeout=timeout, kind="perp")
+			except Exception:
+				pass
+		price = self.ws_client.get_price(coin)
+		if price is not None:
+			return price
+		# WS 가격이 timeout 안에 안 오면 다른 조회와 같이 HL /info REST 로 폴백
+		return await self._mark_price_rest(hl_coin)
@@ -7,6 +7,9 @@ from pathlib import Path
 from curl_cffi import requests as curl_requests
 from eth_utils import to_checksum_address
 from .variational_auth import VariationalAuth
+from mpdex.utils import metrics, ratelimit
+from mpdex.utils.common_session import SessionKeeper
+from mpdex.utils.records import Collateral, Order, Position
 import time
 
 BASE_URL = "https://omni.variational.io"
@@ -167,12 +170,17 @@ def _extract_position_for_coin(positions, coin: str) -> Optional[dict]:
                 continue
             qty = _fnum(info.get("qty"))
             side = "long" if (qty or 0) > 0 else ("short" if (qty or 0) < 0 else "flat")
-            return {
-                "coin": inst.get("underlying"),
-                "side": side,
-                "size": str(abs(qty)) if qty is not None else None,
-                "avg_entry_price": _fnum(info.get("avg_entry_price")),
-            }
+            return Position(
+                entry_price=_fnum(info.get("avg_entry_price")),
+                unrealized_pnl=_fnum(info.get("unrealized_pnl")),
+                side=side,
+                size=str(abs(qty)) if qty is not None else None,
+                symbol=inst.get("underlying"),
+                # 기존 키 호환
+                coin=inst.get("underlying"),
+                avg_entry_price=_fnum(info.get("avg_entry_price")),
+                raw=p,
+            )
         except Exception:
             continue
     return None
@@ -206,16 +214,20 @@ def _extract_open_orders_core(payload, coin: str = "all") -> List[dict]:
 
         if coin.lower() == "all" or (inst.get("underlying") or "").upper() == coin.upper():
             out.append(
-                {
-                    "order_id": o.get("order_id"),
-                    "coin": inst.get("underlying"),
-                    "side": (o.get("side") or "").lower() or None,
-                    "order_type": order_type or None,
-                    "status": (o.get("status") or "").lower() or None,
-                    "qty": _fnum(o.get("qty")),
-                    "price": price,
-                    "rfq_id": o.get("rfq_id"),
-                }
+                Order(
+                    order_id=o.get("order_id"),
+                    symbol=inst.get("underlying"),
+                    side=(o.get("side") or "").lower() or None,
+                    price=price,
+                    size=_fnum(o.get("qty")),
+                    # 기존 키 호환
+                    coin=inst.get("underlying"),
+                    order_type=order_type or None,
+                    status=(o.get("status") or "").lower() or None,
+                    qty=_fnum(o.get("qty")),
+                    rfq_id=o.get("rfq_id"),
+                    raw=o,
+                )
             )
     return out
 
@@ -263,6 +275,8 @@ class VariationalExchange(MultiPerpDexMixin, MultiPerpDex):
         self.options.setdefault("min_price_refresh_ms", 250)  # 최소 
         self.options.setdefault("auto_login_on_demand", True)  # 자동 로그인 허용 플래그
         self.options.setdefault("funding_interval_s", 3600) # 3600 으로 강제됨, 처음 받는 response와 달리 항시 3600
+        self.options.setdefault("session_keeper", True)  # [ADDED] vr-token 만료 전 백그라운드 재로그인(개인키 있을 때)
+        self.options.setdefault("quote_ttl_ms", 2000)  # [ADDED] warm quote 유효시간(이 안에 쓰면 시장가 1 round trip)
         self._impersonate = self.options.get("impersonate", "chrome")
         self._timeout = float(self.options.get("timeout", 10.0))
         self.session_cookies = session_cookies
@@ -284,6 +298,21 @@ class VariationalExchange(MultiPerpDexMixin, MultiPerpDex):
         self._session_ready: bool = False
         self._vr_token: Optional[str] = None  # 메모리 보관
 
+        # [ADDED] quote keeper: (coin, qty) → {"quote_id", "core", "at_ms"} (quote_id 는 1회용이므로 사용 시 pop)
+        self._warm_quotes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._quote_targets: Dict[str, List[str]] = {}
+        self._quote_task: Optional[asyncio.Task] = None
+
+        # [ADDED] fetch_prices: 진행 중 요청 공유(같은 bulk/probe 요청은 1번만)
+        self._inflight: Dict[Any, asyncio.Future] = {}
+
+        # [ADDED] 세션 keeper: 주문 경로에서 로그인 왕복이 생기지 않도록 미리 갱신
+        self._session_keeper = SessionKeeper(
+            "variational", self._session_ttl, self._session_renew,
+            interval=float(self.options.get("session_check_interval_s", 600)),
+            margin=float(self.options.get("session_refresh_margin_s", 1800)),
+        )
+
     async def _probe_cookie_valid(self, vr_token: str) -> bool:
         if not vr_token:
             return False
@@ -355,6 +384,51 @@ class VariationalExchange(MultiPerpDexMixin, MultiPerpDex):
             return {"ok": False, "error": "auto_login_failed"}
         return {"ok": False, "error": "no_valid_cookie_and_auto_disabled"}
 
+    async def _session_ttl(self) -> Optional[float]:
+        """vr-token 남은 유효시간(sec). JWT exp 가 없으면 원격 프로빙(유효=inf, 무효=None)."""
+        vr = self._vr_token or _load_vr_token_from_cache(self.address)
+        if not vr:
+            return None
+        exp = self._auth.token_expiry(vr)
+        if exp:
+            return exp - time.time()
+        return float("inf") if await self._probe_cookie_valid(vr) else None
+
+    async def _session_renew(self) -> None:
+        # 브라우저 서명은 백그라운드에서 불가 → 개인키가 있을 때만 갱신
+        if not self._pk:
+            raise RuntimeError("vr-token expiring; private key required for background re-login")
+        await self._auth.login(port=None, force=True)  # 캐시 파일 저장 포함
+        new_vr = _load_vr_token_from_cache(self.address)
+        if not new_vr:
+            raise RuntimeError("re-login did not produce a vr-token")
+        self.session_cookies = {"vr-token": new_vr}
+        self._vr_token = new_vr
+        self._session_ready = True
+
+    def start_session_keeper(self) -> None:
+        self._session_keeper.start()
+
+    async def stop_session_keeper(self) -> None:
+        await self._session_keeper.stop()
+
+    async def aclose(self) -> None:  # [ADDED] 백그라운드 태스크(session/quote keeper) 정리
+        await self.stop_quote_keeper()
+        await self.stop_session_keeper()
+        for fut in list(self._inflight.values()):
+            if not fut.done():
+                fut.cancel()
+        self._inflight.clear()
+
+    async def close(self) -> None:  # [ADDED] 다른 래퍼와 같은 이름
+        await self.aclose()
+
+    async def __aenter__(self):  # [ADDED]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):  # [ADDED]
+        await self.aclose()
+
     async def verify_session(self) -> bool:
         vr = self._vr_token or _extract_vr_token_from_cookies(self.session_cookies) or _load_vr_token_from_cache(self.address)
         return await self._probe_cookie_valid(vr) if vr else False
@@ -444,21 +518,35 @@ class VariationalExchange(MultiPerpDexMixin, MultiPerpDex):
     async def _request(self, method: str, path: str, *, params=None, json_body=None) -> Any:
         headers, cookies = await self._headers_and_cookies()
         url = BASE_URL + path
-        async with curl_requests.AsyncSession(impersonate=self._impersonate, timeout=self._timeout) as s:
-            if method.upper() == "GET":
-                r = await s.get(url, params=params, headers=headers, cookies=cookies)
-            elif method.upper() == "POST":
-                r = await s.post(url, json=json_body, headers=headers, cookies=cookies)
-            elif method.upper() == "PUT":
-                r = await s.put(url, json=json_body, headers=headers, cookies=cookies)
-            else:
-                r = await s.request(method.upper(), url, params=params, json=json_body, headers=headers, cookies=cookies)
-            r.raise_for_status()
-            ct = (r.headers or {}).get("content-type", "")
-            try:
-                return r.json() if "application/json" in ct else r.text
-            except Exception:
-                return r.text
+        # [ADDED] curl_cffi 는 aiohttp 세션 레이어 밖이므로 레이트리밋을 직접 대기
+        await ratelimit.acquire("variational", priority=ratelimit.infer_priority(method, path))
+        t0 = time.perf_counter()  # [ADDED] curl_cffi 는 aiohttp trace 가 없으므로 직접 계측
+        r = None
+        try:
+            async with curl_requests.AsyncSession(impersonate=self._impersonate, timeout=self._timeout) as s:
+                if method.upper() == "GET":
+                    r = await s.get(url, params=params, headers=headers, cookies=cookies)
+                elif method.upper() == "POST":
+                    r = await s.post(url, json=json_body, headers=headers, cookies=cookies)
+                elif method.upper() == "PUT":
+                    r = await s.put(url, json=json_body, headers=headers, cookies=cookies)
+                else:
+                    r = await s.request(method.upper(), url, params=params, json=json_body, headers=headers, cookies=cookies)
+        finally:
+            if metrics.is_enabled():
+                metrics.record(
+                    "variational", "http", f"{method.upper()} {path}", time.perf_counter() - t0,
+                    error=(r is None or int(r.status_code) >= 400),
+                    bytes_in=len(r.content or b"") if r is not None else 0,
+                )
+            if r is not None:
+                ratelimit.on_response_status("variational", int(r.status_code), r.headers)
+        r.raise_for_status()
+        ct = (r.headers or {}).get("content-type", "")
+        try:
+            return r.json() if "application/json" in ct else r.text
+        except Exception:
+            return r.text
     
     # ---------------------------
     # 내부: 런타임 캐시 유틸
@@ -481,6 +569,26 @@ class VariationalExchange(MultiPerpDexMixin, MultiPerpDex):
         }
         self._rt_cache[coin.upper()] = entry
 
+    def _seed_cache_entry(self, coin: str, price: Optional[float], now_ms: int) -> dict:
+        """supported_assets 기반 시드 캐시 엔트리(initialize / bulk 가격 갱신 공용)"""
+        # 현재는 3600으로 강제하고 있음
+        #funding_interval_s = int(it.get("funding_interval_s", 3600))
+        funding_interval_s = self.options.get("funding_interval_s")
+        instrument = {
+            "instrument_type": "perpetual_future",
+            "underlying": coin,
+            "funding_interval_s": funding_interval_s,
+            "settlement_asset": "USDC",
+        }
+        return {
+            "instrument": instrument,
+            "quote_id": None,
+            "mark_price": price,
+            "qty": None,
+            "funding_interval_s": funding_interval_s,
+            "last_price_at_ms": now_ms,
+        }
+
     def _get_cached_instrument(self, coin: str, funding_interval_s: Optional[int] = None) -> Optional[dict]:
         entry = self._rt_cache.get(coin.upper())
         if not entry:
@@ -532,31 +640,13 @@ class VariationalExchange(MultiPerpDexMixin, MultiPerpDex):
                 continue
 
             coin = str(it.get("asset") or sym).upper()
-            
-            # 현재는 3600으로 강제하고 있음
-            #funding_interval_s = int(it.get("funding_interval_s", 3600))
-            funding_interval_s = self.options.get("funding_interval_s")
-
-            price = _fnum(it.get("price"))
-
-            instrument = {
-                "instrument_type": "perpetual_future",
-                "underlying": coin,
-                "funding_interval_s": funding_interval_s,
-                "settlement_asset": "USDC",
-            }
-            self._rt_cache[coin] = {
-                "instrument": instrument,
-                "quote_id": None,
-                "mark_price": price,
-                "qty": None,
-                "funding_interval_s": funding_interval_s,
-                "last_price_at_ms": now_ms,
-            }
+            self._rt_cache[coin] = self._seed_cache_entry(coin, _fnum(it.get("price")), now_ms)
             self._asset_list.append(coin)
 
         self._asset_list.sort()
         self._initialized = True
+        if self.options.get("session_keeper", True) and self._pk:
+            self.start_session_keeper()
         return {"ok": True, "assets": list(self._asset_list), "seeded": len(self._rt_cache)}
     
     # ---------------------------
@@ -702,9 +792,183 @@ class VariationalExchange(MultiPerpDexMixin, MultiPerpDex):
         except Exception:
             return None
     
+    # ---------------------------
+    # Quote keeper (시장가 warm quote)
+    # ---------------------------
+    @staticmethod
+    def _qty_key(qty) -> str:
+        # "0.0010" / 0.001 / "1e-3" 를 같은 키로
+        try:
+            return format(float(qty), "f").rstrip("0").rstrip(".") or "0"
+        except Exception:
+            return str(qty)
+
+    async def _refresh_warm_quote(self, coin: str, qty: str) -> None:
+        funding = int((self._rt_cache.get(coin) or {}).get("funding_interval_s") or self.options.get("funding_interval_s", 3600))
+        try:
+            core = await self._fetch_indicative_quote(coin=coin, qty=qty, funding_interval_s=funding)
+        except Exception:
+            return
+        if core.get("quote_id"):
+            self._warm_quotes[(coin, self._qty_key(qty))] = {
+                "quote_id": core.get("quote_id"),
+                "core": core,
+                "at_ms": int(time.monotonic() * 1000),
+            }
+
+    def _take_warm_quote(self, coin: str, qty) -> Optional[Dict[str, Any]]:
+        """유효시간 내 warm quote 를 꺼냄(1회용). 없거나 만료면 None."""
+        q = self._warm_quotes.pop((coin, self._qty_key(qty)), None)
+        if not q:
+            return None
+        if int(time.monotonic() * 1000) - q["at_ms"] >= int(self.options.get("quote_ttl_ms", 2000)):
+            return None
+        return q
+
+    async def _quote_keeper_loop(self, refresh_ms: int) -> None:
+        while True:
+            try:
+                await asyncio.gather(*[
+                    self._refresh_warm_quote(coin, qty)
+                    for coin, qtys in list(self._quote_targets.items()) for qty in qtys
+                ])
+                await asyncio.sleep(refresh_ms / 1000.0)
+            except asyncio.CancelledError:
+                return
+            except Exception:
+                await asyncio.sleep(1.0)
+
+    async def start_quote_keeper(self, targets: Dict[str, List[Any]], *, refresh_ms: Optional[int] = None) -> None:
+        """
+        targets: {"BTC": [0.001, 0.01], "ETH": ["0.1"]} — 코인별로 미리 quote 를 받아둘 수량
+        refresh_ms: 갱신 주기(기본 quote_ttl_ms 의 절반). 갱신 시 _rt_cache 가격도 같이 갱신되므로
+                    fetch_price 는 min_price_refresh_ms 안에서 추가 요청 없이 캐시를 반환한다.
+        같은 수량의 시장가 주문은 warm quote_id 로 create_market_order 만 호출(1 round trip).
+        """
+        await self.initialize_if_needed()
+        self._quote_targets = {
+            str(c).upper(): list(dict.fromkeys(self._qty_key(q) for q in qtys))
+            for c, qtys in (targets or {}).items()
+        }
+        if refresh_ms is None:
+            refresh_ms = max(100, int(self.options.get("quote_ttl_ms", 2000)) // 2)
+        await self.stop_quote_keeper()
+        self._quote_task = asyncio.create_task(self._quote_keeper_loop(int(refresh_ms)), name="variational-quote-keeper")
+
+    async def stop_quote_keeper(self) -> None:
+        task, self._quote_task = self._quote_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._warm_quotes.clear()
+
+    async def _coalesced(self, key, factory):
+        """같은 key 의 요청이 진행 중이면 그 결과를 같이 기다림(single-flight)."""
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(factory())
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda _f, k=key: self._inflight.pop(k, None))
+        return await asyncio.shield(fut)
+
+    async def _refresh_prices_bulk(self) -> Dict[str, float]:
+        """
+        supported_assets 응답의 asset별 price 로 _rt_cache 를 한 번에 갱신.
+        캐시에 없는 거래 가능 코인(신규 상장 등)은 initialize 와 같은 형태로 시드 엔트리를 만든다.
+        반환: {coin: price}
+        """
+        raw = await self._supported_assets_raw()
+        data = raw if isinstance(raw, dict) else json.loads(str(raw))
+        now_ms = int(time.monotonic() * 1000)
+        out: Dict[str, float] = {}
+        for sym, items in (data or {}).items():
+            if not isinstance(items, list) or not items or not isinstance(items[0], dict):
+                continue
+            it = items[0]
+            coin = str(it.get("asset") or sym).upper()
+            price = _fnum(it.get("price"))
+            if price is None:
+                continue
+            out[coin] = price
+            entry = self._rt_cache.get(coin)
+            if entry is not None:
+                entry.update({"mark_price": price, "last_price_at_ms": now_ms})
+            elif it.get("has_perp", False) and not it.get("is_close_only_mode", False):
+                self._rt_cache[coin] = self._seed_cache_entry(coin, price, now_ms)
+                if coin not in self._asset_list:
+                    self._asset_list.append(coin)
+                    self._asset_list.sort()
+        return out
+
+    async def fetch_prices(
+        self,
+        symbols: List[str],
+        *,
+        min_refresh_ms: Optional[int] = None,
+        concurrency: int = 8,
+    ) -> Dict[str, Optional[float]]:
+        """
+        여러 코인 가격을 한 번에 조회.
+        1) min_refresh_ms 안에 갱신된 캐시는 그대로 사용
+        2) 나머지는 supported_assets(전 코인 price 포함) 1회로 _rt_cache 일괄 갱신
+        3) bulk 응답에 없는 코인만 probe quote 를 동시(concurrency 제한) 조회
+        동시에 들어온 같은 bulk/probe 요청은 하나로 합쳐진다.
+        """
+        await self.initialize_if_needed()
+        coins = list(dict.fromkeys(str(s).upper() for s in symbols))
+        now_ms = int(time.monotonic() * 1000)
+        thresh_ms = int(min_refresh_ms if min_refresh_ms is not None else self.options.get("min_price_refresh_ms", 250))
+
+        out: Dict[str, Optional[float]] = {}
+        stale = []
+        for coin in coins:
+            cached = self._rt_cache.get(coin) or {}
+            last_ms = int(cached.get("last_price_at_ms") or 0)
+            if last_ms and (now_ms - last_ms) < thresh_ms and cached.get("mark_price") is not None:
+                out[coin] = cached.get("mark_price")
+            else:
+                stale.append(coin)
+        if not stale:
+            return {c: out.get(c) for c in coins}
+
+        try:
+            bulk = await self._coalesced("bulk", self._refresh_prices_bulk)
+        except Exception:
+            bulk = {}
+        missing = []
+        for coin in stale:
+            if coin in bulk:
+                out[coin] = bulk[coin]
+            else:
+                missing.append(coin)
+
+        if missing:
+            sem = asyncio.Semaphore(max(1, int(concurrency)))
+            probe_qty = self.options.get("probe_qty", "0.0001")
+
+            async def _probe(coin):
+                async with sem:
+                    funding = int((self._rt_cache.get(coin) or {}).get("funding_interval_s") or self.options.get("funding_interval_s", 3600))
+                    try:
+                        core = await self._coalesced(
+                            ("probe", coin),
+                            lambda: self._fetch_indicative_quote(coin=coin, qty=probe_qty, funding_interval_s=funding),
+                        )
+                        return core.get("mark_price")
+                    except Exception:
+                        return (self._rt_cache.get(coin) or {}).get("mark_price")
+
+            prices = await asyncio.gather(*[_probe(c) for c in missing])
+            out.update(zip(missing, prices))
+        return {c: out.get(c) for c in coins}
+
     async def create_order(self, symbol, side, amount, price=None, order_type="market"):
         """
-        - market: indicative quote → quote_id 획득(캐시 갱신) → create_market_order(순차)
+        - market: warm quote(start_quote_keeper) 있으면 create_market_order 만,
+                  없으면 indicative quote → quote_id 획득(캐시 갱신) → create_market_order(순차)
         - limit: 캐시된 instrument 사용. 없으면 해당 시점에 indicative 호출로 instrument를 캐시 → create_limit_order
         """
         await self.initialize_if_needed()
@@ -732,6 +996,25 @@ class VariationalExchange(MultiPerpDexMixin, MultiPerpDex):
             )
             return res.get('rfq_id')
 
+        # [ADDED] market: keeper 의 warm quote 가 있으면 바로 주문(1 round trip)
+        warm = self._take_warm_quote(coin, amount)
+        if warm is not None:
+            if coin in self._quote_targets:
+                # 사용한 quote 는 다음 주문을 위해 백그라운드로 미리 다시 받아둠
+                asyncio.create_task(self._refresh_warm_quote(coin, self._qty_key(amount)))
+            try:
+                res = await self._create_market_order(
+                    coin=coin,
+                    side=side,
+                    quote_id=warm["quote_id"],
+                    max_slippage=float(self.options.get("max_slippage", 0.01)),
+                )
+                return res.get('rfq_id')
+            except Exception as e:
+                # 서버가 거절(quote 만료 등)한 경우만 순차 경로로 재시도. 타임아웃 등은 중복 주문 위험 → 그대로 raise
+                if getattr(e, "response", None) is None:
+                    raise
+
         # market: 최신 quote_id 필요
         cached = self._rt_cache.get(coin)
         funding = int((cached or {}).get("funding_interval_s") or self.options.get("funding_interval_s", 3600))
@@ -762,11 +1045,12 @@ class VariationalExchange(MultiPerpDexMixin, MultiPerpDex):
             try:
                 data = json.loads(data)
             except Exception:
-                return {"total_collateral": None, "available_collateral": None}
-        return {
-            "total_collateral": data.get("balance"),
-            "available_collateral": data.get("max_withdrawable_amount"),
-        }
+                return Collateral(total_collateral=None, available_collateral=None)
+        return Collateral(
+            total_collateral=data.get("balance"),
+            available_collateral=data.get("max_withdrawable_amount"),
+            raw=data,
+        )
     
     async def get_open_orders(self, symbol):
         return await self.fetch_open_orders(symbol)
@@ -794,6 +1078,12 @@ class VariationalExchange(MultiPerpDexMixin, MultiPerpDex):
     async def get_mark_price(self, symbol):
         return await self.fetch_price(symbol)
 
+    async def get_mark_prices(self, symbols):
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        prices = await self.fetch_prices(symbols)
+        return {s: prices.get(str(s).upper()) for s in symbols}
+
     async def supported_assets(self) -> List[str]:
         await self.initialize_if_needed()
         # initialize에서 이미 필터링/정렬된 리스트를 캐싱
@@ -65,15 +65,15 @@ class VariationalAuth:
     # ----------------------------
     # Public API
     # ----------------------------
-    async def login(self, port: Optional[int] = None, open_browser: bool = True) -> Dict[str, Any]:
+    async def login(self, port: Optional[int] = None, open_browser: bool = True, force: bool = False) -> Dict[str, Any]:
         """
-        1) 세션 캐시가 있고 토큰 유효 => 바로 OK
+        1) 세션 캐시가 있고 토큰 유효 => 바로 OK (force=True면 건너뜀: 만료 전 선갱신용)
         2) 개인키 제공 => generate_signing_data -> personal_sign -> login
         3) 아니면 로컬 서버(port) 띄우고 브라우저 지갑 서명
         """
         self.load_cached_session()
 
-        if self._token and self._is_token_valid(self._token):
+        if not force and self._token and self._is_token_valid(self._token):
             self._logged_in = True
             return {
                 "ok": True,
@@ -449,24 +449,31 @@ class VariationalAuth:
                 return seg.split("=", 1)[1].split(";", 1)[0]
         return None
 
-    def _is_token_valid(self, jwt_token: str, leeway_sec: int = 30) -> bool:
+    @staticmethod
+    def token_expiry(jwt_token: Optional[str]) -> Optional[int]:
         """
-        서명 검증 없이 JWT의 exp 클레임만 확인
+        서명 검증 없이 JWT의 exp(unix sec) 반환. JWT가 아니거나 exp 없으면 None
         """
         try:
-            parts = jwt_token.split(".")
+            parts = str(jwt_token or "").split(".")
             if len(parts) != 3:
-                return False
+                return None
             payload_b64 = parts[1]
             rem = len(payload_b64) % 4
             if rem:
                 payload_b64 += "=" * (4 - rem)
             payload = json.loads(base64.urlsafe_b64decode(payload_b64.encode("utf-8")))
             exp = int(payload.get("exp", 0))
-            now = int(time.time())
-            return exp > (now + leeway_sec)
+            return exp or None
         except Exception:
-            return False
+            return None
+
+    def _is_token_valid(self, jwt_token: str, leeway_sec: int = 30) -> bool:
+        """
+        서명 검증 없이 JWT의 exp 클레임만 확인
+        """
+        exp = self.token_expiry(jwt_token)
+        return bool(exp) and exp > (int(time.time()) + leeway_sec)
 
     # ----------------------------
     # HTML (브라우저 지갑 서명 UI)